@@ -4,21 +4,22 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from src.domains.tracks.track_name.models import TrackNameRegistry
-from src.domains.tracks.track_request.models import TrackRequest
+from src.domains.tracks.track_request.models import TrackRequest, TrackRequestArchive
 from src.domains.users.models import User
 from src.service.database.database import Base
-from src.service.settings.config import Settings
+from src.service.settings.config import get_settings
 
 __models__ = [
     User,
     TrackRequest,
+    TrackRequestArchive,
     TrackNameRegistry,
 ]
 
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
-settings = Settings()
+settings = get_settings()
 
 config = context.config
 
@@ -0,0 +1,65 @@
+"""history keyset indexes
+
+Revision ID: 3b9f1c2d7e41
+Revises: 66da485fd4ec
+Create Date: 2026-10-19 11:30:12.418203
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9f1c2d7e41"
+down_revision: str | Sequence[str] | None = "66da485fd4ec"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индексы строятся без блокировки записи (CONCURRENTLY), поэтому вне транзакции миграции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_track_requests_user_updated_at_id",
+            "track_requests",
+            ["user_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_track_name_registry_user_updated_at_id",
+            "track_name_registry",
+            ["user_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # Покрывается префиксом нового составного индекса
+        op.drop_index(
+            "ix_track_name_registry_user_id",
+            table_name="track_name_registry",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_track_name_registry_user_id",
+            "track_name_registry",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_track_name_registry_user_updated_at_id",
+            table_name="track_name_registry",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_track_requests_user_updated_at_id",
+            table_name="track_requests",
+            postgresql_concurrently=True,
+        )
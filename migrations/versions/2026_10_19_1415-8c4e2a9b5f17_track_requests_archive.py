@@ -0,0 +1,52 @@
+"""track requests archive
+
+Revision ID: 8c4e2a9b5f17
+Revises: 3b9f1c2d7e41
+Create Date: 2026-10-19 14:15:47.902611
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2a9b5f17"
+down_revision: str | Sequence[str] | None = "3b9f1c2d7e41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table("track_requests_archive",
+    sa.Column("id", sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column("user_id", sa.BigInteger(), nullable=False),
+    sa.Column("query_text", sa.Text(), nullable=False),
+    sa.Column("archived_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+    sa.Column("updated_at", sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_track_requests_archive_user_id"), "track_requests_archive", ["user_id"], unique=False)
+
+    # Индекс строится без блокировки записи (CONCURRENTLY), поэтому вне транзакции миграции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_track_requests_updated_at",
+            "track_requests",
+            ["updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_track_requests_updated_at",
+            table_name="track_requests",
+            postgresql_concurrently=True,
+        )
+    op.drop_index(op.f("ix_track_requests_archive_user_id"), table_name="track_requests_archive")
+    op.drop_table("track_requests_archive")
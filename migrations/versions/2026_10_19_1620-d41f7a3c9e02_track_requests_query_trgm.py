@@ -0,0 +1,42 @@
+"""track requests query trgm
+
+Revision ID: d41f7a3c9e02
+Revises: 8c4e2a9b5f17
+Create Date: 2026-10-19 16:20:47.903114
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a3c9e02"
+down_revision: str | Sequence[str] | None = "8c4e2a9b5f17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Индекс строится без блокировки записи (CONCURRENTLY), поэтому вне транзакции миграции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_track_requests_query_text_trgm",
+            "track_requests",
+            ["query_text"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"query_text": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_track_requests_query_text_trgm",
+            table_name="track_requests",
+            postgresql_concurrently=True,
+        )
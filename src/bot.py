@@ -1,18 +1,38 @@
 """Основной модуль бота."""
 
 import asyncio
+import signal
+from wsgiref.simple_server import WSGIServer
 
 from aiogram import Bot, Dispatcher
 from dishka.integrations.aiogram import setup_dishka
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.domains import routes
-from src.middleware.middleware import LoggingMiddleware, RateLimitMiddleware
+from src.domains.common.message_sweeper import StaleMessageSweeper
+from src.domains.tracks.track_request.retention import TrackRequestRetentionJob
+from src.domains.users.cache_repository import UserCacheRepository
+from src.domains.users.known_users import KnownUsersCache
+from src.domains.users.services import UserService
+from src.middleware.middleware import (
+    HandlerMetricsMiddleware,
+    LoggingMiddleware,
+    OutboundRateLimitMiddleware,
+    RateLimitMiddleware,
+    TracingMiddleware,
+)
 from src.service.di.containers import create_container
-from src.service.settings.config import Settings
+from src.service.downloader.circuit_breaker import CircuitBreakerRegistry
+from src.service.downloader.service import DownloaderService
+from src.service.loop_monitor import LoopLagMonitor
+from src.service.metrics import RuntimeCollector, start_metrics_server
+from src.service.profiler import STACK_SAMPLER
+from src.service.settings.config import get_settings
 from src.service.settings.logger.logger_setup import configure_logging
 from src.service.storage import get_storage
-
-settings = Settings()
+from src.service.tracing import configure_tracing, shutdown_tracing
+from src.service.warmup import warm_up_heavy_modules
 
 
 class TelegramBot:
@@ -24,16 +44,27 @@ class TelegramBot:
 
     def __init__(self):
         """Инициализация бота с использованием токена из настроек."""
+        settings = get_settings()
         self.bot = Bot(token=settings.bot.token.get_secret_value())
         self.storage = get_storage()
         self.dp = Dispatcher(storage=self.storage)
+        self._warm_up_task: asyncio.Task | None = None
+        self._sweeper_task: asyncio.Task | None = None
+        self._known_users_task: asyncio.Task | None = None
+        self._retention_task: asyncio.Task | None = None
+        self._probe_task: asyncio.Task | None = None
+        self._metrics_server: WSGIServer | None = None
+        self._loop_monitor_task: asyncio.Task | None = None
 
-        container = create_container()
+        self.container = create_container()
         configure_logging()
+        # До первого обращения к контейнеру: движок БД и клиенты создаются уже инструментированными
+        configure_tracing(settings.tracing)
         # Подключаем контейнер к диспетчеру
-        setup_dishka(container, self.dp)
+        setup_dishka(self.container, self.dp)
         self._register_routers()
         self._register_middleware()
+        self.dp.startup.register(self._on_startup)
 
     def _register_routers(self) -> None:
         """Регистрация всех роутеров, импортированных из src/domains."""
@@ -41,13 +72,85 @@ class TelegramBot:
             self.dp.include_router(router)
 
     def _register_middleware(self) -> None:
-        """Регистрация мидлварей: логгирования и ограничения частоты запросов."""
+        """Регистрация мидлварей: трассировки, логгирования, метрик и ограничения частоты запросов."""
+        self.dp.update.middleware(TracingMiddleware())
         self.dp.update.middleware(LoggingMiddleware())
         self.dp.update.middleware(RateLimitMiddleware())
+        handler_metrics = HandlerMetricsMiddleware()
+        self.dp.message.middleware(handler_metrics)
+        self.dp.callback_query.middleware(handler_metrics)
+        self.outbound_rate_limit = OutboundRateLimitMiddleware()
+        self.bot.session.middleware(self.outbound_rate_limit)
+
+    async def _on_startup(self) -> None:
+        """
+        Вызывается диспетчером перед началом поллинга.
+
+        Запускает фоновый прогрев тяжёлых модулей, чтобы не задерживать получение первых обновлений,
+        периодическую очистку брошенных временных сообщений, перенос старых запросов в архив,
+        заполнение кэша известных пользователей и проверку источников с разомкнутым выключателем.
+        Если метрики включены, запускает HTTP-сервер `/metrics`; если включён монитор
+        задержки цикла событий — его задачу и сторожевой поток. Сигнал `SIGUSR1` включает
+        и выключает профилировщик.
+        """
+        self._warm_up_task = asyncio.create_task(
+            warm_up_heavy_modules(html_parser=get_settings().search.html_parser),
+        )
+        user_service = await self.container.get(UserService)
+        self._known_users_task = asyncio.create_task(user_service.warm_up_known_users())
+        sweeper = await self.container.get(StaleMessageSweeper)
+        self._sweeper_task = asyncio.create_task(sweeper.run(self.bot))
+        retention_job = await self.container.get(TrackRequestRetentionJob)
+        self._retention_task = asyncio.create_task(retention_job.run())
+        circuit_breakers = await self.container.get(CircuitBreakerRegistry)
+        self._probe_task = asyncio.create_task(circuit_breakers.run())
+        settings = get_settings()
+        if settings.metrics.enabled:
+            collector = RuntimeCollector(
+                downloader_service=await self.container.get(DownloaderService),
+                user_cache=await self.container.get(UserCacheRepository),
+                known_users=await self.container.get(KnownUsersCache),
+                outbound_rate_limit=self.outbound_rate_limit,
+                engine=await self.container.get(AsyncEngine),
+                redis_client=await self.container.get(Redis),
+            )
+            self._metrics_server = start_metrics_server(settings.metrics, collector)
+        if settings.loop_monitor.enabled:
+            self._loop_monitor_task = asyncio.create_task(LoopLagMonitor(settings.loop_monitor).run())
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self._toggle_profiler)
+
+    @staticmethod
+    def _toggle_profiler() -> None:
+        """Включает профилировщик с настройками по умолчанию или досрочно завершает его (по `SIGUSR1`)."""
+        if STACK_SAMPLER.stop():
+            return
+        settings = get_settings().profiler
+        STACK_SAMPLER.start(settings.duration, settings.max_updates, settings.interval)
 
     async def on_shutdown(self) -> None:
         """Вызывается при завершении работы бота. Закрывает соединения и освобождает ресурсы."""
+        tasks = [
+            task
+            for task in (
+                self._warm_up_task,
+                self._known_users_task,
+                self._sweeper_task,
+                self._retention_task,
+                self._probe_task,
+                self._loop_monitor_task,
+            )
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        # Дожидаемся отмены, чтобы задачи не обращались к Redis и БД после закрытия контейнера
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
         await self.storage.close()
+        await self.container.close()
+        shutdown_tracing()
         self.dp.shutdown()
 
     async def start(self) -> None:
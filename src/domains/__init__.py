@@ -1,3 +1,4 @@
+from src.domains.admin.handlers import admin_router
 from src.domains.start.handlers import start_router
 from src.domains.tracks.handlers import track_router
 from src.domains.tracks.track_cliper.handlers import track_cliper_router
@@ -6,6 +7,7 @@ from src.domains.tracks.track_request.handlers import track_request_router
 from src.domains.tracks.track_search.handlers import track_search_router
 
 routes = [
+    admin_router,
     start_router,
     track_router,
     track_name_router,
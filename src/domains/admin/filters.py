@@ -0,0 +1,27 @@
+"""
+Модуль `filters.py` содержит фильтры служебных команд бота.
+
+Определяет фильтр, пропускающий только администраторов из настроек.
+"""
+
+from aiogram.filters import BaseFilter
+from aiogram.types import Message
+
+from src.service.settings.config import get_settings
+
+
+class AdminFilter(BaseFilter):
+    """
+    Фильтр для определения, является ли отправитель сообщения администратором бота.
+
+    Список администраторов задаётся переменной окружения `BOT_ADMIN_IDS`.
+    """
+
+    async def __call__(self, message: Message) -> bool:
+        """
+        Проверяет, входит ли отправитель сообщения в список администраторов.
+
+        :param message: Сообщение от пользователя.
+        :return: `True`, если отправитель — администратор, иначе `False`.
+        """
+        return message.from_user is not None and message.from_user.id in get_settings().bot.admin_ids
@@ -0,0 +1,110 @@
+"""
+Модуль `handlers.py` содержит обработчики служебных команд, доступных только администраторам.
+
+Отвечает за:
+- отображение состояния источников треков: выключателей и скользящей статистики поиска;
+- включение сэмплирующего профилировщика.
+"""
+
+from aiogram import Router
+from aiogram.enums import ParseMode
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+from dishka import FromDishka
+from dishka.integrations.aiogram import inject
+
+from src.domains.admin.filters import AdminFilter
+from src.service.downloader.circuit_breaker import CircuitBreakerRegistry
+from src.service.downloader.service import DownloaderService
+from src.service.downloader.source_router import SearchOutcome
+from src.service.profiler import PROFILES_DIR, STACK_SAMPLER
+from src.service.settings.config import get_settings
+
+admin_router = Router(name="admin_router")
+admin_router.message.filter(AdminFilter())
+
+
+def _format_latency(value: float | None) -> str:
+    """
+    Форматирует задержку для таблицы источников.
+
+    :param value: Задержка в секундах или `None`.
+    :return: Строка с задержкой.
+    """
+    return "—" if value is None else f"{value:.2f}s"
+
+
+@admin_router.message(Command("sources"))
+@inject
+async def sources_command(
+    message: Message,
+    downloader_service: FromDishka[DownloaderService],
+    circuit_breakers: FromDishka[CircuitBreakerRegistry],
+) -> None:
+    """
+    Обработчик команды /sources.
+
+    Показывает для каждого источника состояние выключателя, перцентили задержки,
+    доли исходов поиска и оценку ожидаемого времени до полезного ответа, а также долю дублированных поисков.
+    """
+    source_router = downloader_service.source_router
+    lines = []
+    for repo in source_router.plan(downloader_service.search_repositories):
+        breaker = circuit_breakers.get(repo.alias)
+        stats = source_router.stats.get(repo.alias)
+        lines.append(
+            f"{repo.alias}: {breaker.state}, ошибок подряд {breaker.consecutive_failures}",
+        )
+        if stats:
+            lines.append(
+                f"  p50 {_format_latency(stats.latency_percentile(50))}, "
+                f"p90 {_format_latency(stats.latency_percentile(90))}, "
+                f"замеров {len(stats)}",
+            )
+            lines.append(
+                f"  found {stats.rate(SearchOutcome.FOUND):.0%}, "
+                f"empty {stats.rate(SearchOutcome.EMPTY):.0%}, "
+                f"error {stats.rate(SearchOutcome.ERROR):.0%}, "
+                f"cancelled {stats.rate(SearchOutcome.CANCELLED):.0%}",
+            )
+        lines.append(f"  ожидаемое время {source_router.expected_time(repo.alias):.2f}s")
+
+    hedge_budget = downloader_service.hedge_budget
+    lines.append(f"дублировано {hedge_budget.hedges} из {hedge_budget.searches} ({hedge_budget.hedge_rate:.0%})")
+
+    text = "\n".join(lines)
+    await message.answer(
+        f"<pre>{text}</pre>",
+        parse_mode=ParseMode.HTML,
+    )
+
+
+@admin_router.message(Command("profile"))
+async def profile_command(message: Message, command: CommandObject) -> None:
+    """
+    Обработчик команды /profile.
+
+    `/profile [секунды] [апдейты]` запускает профилировщик до истечения времени
+    или обработки указанного числа апдейтов, `/profile stop` завершает его досрочно.
+    Результаты записываются в `logs/profiles/`.
+    """
+    args = (command.args or "").split()
+    if args == ["stop"]:
+        text = "Профилирование завершается" if STACK_SAMPLER.stop() else "Профилирование не запущено"
+        await message.answer(text)
+        return
+
+    settings = get_settings().profiler
+    try:
+        duration = float(args[0]) if args else settings.duration
+        max_updates = int(args[1]) if len(args) > 1 else settings.max_updates
+    except ValueError:
+        await message.answer("Использование: /profile [секунды] [апдейты] или /profile stop")
+        return
+
+    if not STACK_SAMPLER.start(duration, max_updates, settings.interval):
+        await message.answer("Профилирование уже запущено")
+        return
+    await message.answer(
+        f"Профилирование запущено на {duration:.0f} с или {max_updates} апдейтов, результаты: {PROFILES_DIR}",
+    )
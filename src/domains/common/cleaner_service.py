@@ -3,19 +3,42 @@
 связанных с обработкой аудио-клипов в Telegram-боте.
 
 Сервис использует кэш-репозиторий для хранения идентификаторов сообщений,
-которые подлежат удалению, и обеспечивает их асинхронное удаление через бот.
+которые подлежат удалению, и обеспечивает их пакетное удаление через бот
+(метод Bot API `deleteMessages`, до 100 сообщений за запрос).
 """
 
 import logging
-from asyncio import gather
 from dataclasses import dataclass
+from itertools import batched
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
 
 from src.service.cache.base_cache_repository import BaseMsgCleanerRepository
 
 logger = logging.getLogger(__name__)
 
+# Максимальное количество сообщений в одном запросе deleteMessages
+DELETE_MESSAGES_CHUNK_SIZE = 100
+
+
+async def delete_messages_in_chunks(bot: Bot, chat_id: int, message_ids: list[int]) -> None:
+    """
+    Удаляет сообщения из чата пачками через `deleteMessages`.
+
+    Сообщения, которые уже удалены или недоступны, Telegram пропускает; ошибка одной пачки
+    логгируется и не мешает удалению остальных.
+
+    :param bot: Экземпляр бота для выполнения операции удаления.
+    :param chat_id: ID чата, из которого будут удалены сообщения.
+    :param message_ids: ID сообщений для удаления.
+    """
+    for chunk in batched(sorted(set(message_ids)), DELETE_MESSAGES_CHUNK_SIZE):
+        try:
+            await bot.delete_messages(chat_id=chat_id, message_ids=list(chunk))
+        except TelegramAPIError as error:
+            logger.warning(f"Не удалось удалить сообщения {chunk} в чате {chat_id}: {error}")
+
 
 @dataclass
 class ClipMsgCleanerService:
@@ -43,26 +66,15 @@ class ClipMsgCleanerService:
         """
         Удаляет все сохранённые сообщения для указанного пользователя из чата.
 
-        Сначала получает список сообщений из кэша, затем удаляет их через API Telegram,
-        после чего очищает кэш.
+        Атомарно забирает список сообщений из кэша и удаляет их пачками через `deleteMessages`.
 
         :param bot: Экземпляр бота для выполнения операции удаления.
         :param chat_id: ID чата, из которого будут удалены сообщения.
         :param user_id: ID пользователя, чьи сообщения будут удалены.
         """
-        cliper_messages_to_delete = set(
-            await self.cache_repository.get_messages_to_delete(user_id),
-        )
+        cliper_messages_to_delete = await self.cache_repository.pop_messages_to_delete(user_id)
         if not cliper_messages_to_delete:
             return
 
         logger.debug(f"Dropping {cliper_messages_to_delete}")
-
-        delete_result = await gather(
-            *[bot.delete_message(chat_id=chat_id, message_id=message_id) for message_id in cliper_messages_to_delete],
-        )
-        logger.debug(
-            f"Deleted {dict(zip(cliper_messages_to_delete, delete_result, strict=False))}",
-        )
-
-        await self.cache_repository.delete_messages_to_delete(user_id)
+        await delete_messages_in_chunks(bot, chat_id, cliper_messages_to_delete)
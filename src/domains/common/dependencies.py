@@ -0,0 +1,41 @@
+"""
+Модуль `dependencies.py` содержит DI-провайдер для общих компонентов доменов.
+
+Регистрирует фоновую задачу очистки брошенных списков временных сообщений.
+"""
+
+from dishka import FromDishka, Provider, Scope, provide
+
+from src.domains.common.message_sweeper import StaleMessageSweeper
+from src.domains.tracks.track_cliper.cache_repository import ClipMsgCleanerRepository
+from src.domains.tracks.track_name.cache_repository import TrackNameMsgCleanerRepository
+from src.service.settings.config import Settings
+
+
+class CommonProvider(Provider):
+    """
+    Класс-провайдер для внедрения общих зависимостей.
+
+    Регистрирует:
+    - `StaleMessageSweeper` — для фоновой очистки временных сообщений.
+    """
+
+    @provide(scope=Scope.APP)
+    async def get_message_sweeper(
+        self,
+        clip_repository: FromDishka[ClipMsgCleanerRepository],
+        track_name_repository: FromDishka[TrackNameMsgCleanerRepository],
+        settings: FromDishka[Settings],
+    ) -> StaleMessageSweeper:
+        """
+        Возвращает экземпляр фоновой задачи очистки временных сообщений.
+
+        :param clip_repository: Репозиторий сообщений аудиообрезки.
+        :param track_name_repository: Репозиторий сообщений выбора названия трека.
+        :param settings: Объект настроек (параметры очистки).
+        :return: Экземпляр `StaleMessageSweeper`.
+        """
+        return StaleMessageSweeper(
+            repositories=[clip_repository, track_name_repository],
+            settings=settings.cleaner,
+        )
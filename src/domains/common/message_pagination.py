@@ -6,6 +6,10 @@
 - "Вперед"
 - "В начало списка"
 
+Страницы выбираются из БД по одной (keyset-пагинация, см. `src.service.database.pagination`),
+а в callback_data кнопок навигации передаётся курсор соседней страницы:
+`<prefix>:n:<updated_at>:<id>`, `<prefix>:p:<updated_at>:<id>` или `<prefix>:1` для первой страницы.
+
 Также поддерживает передачу пользовательских кнопок внизу интерфейса.
 """
 
@@ -15,36 +19,42 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMar
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.domains.tracks.track_name.message_cleanup import TrackNameMsgCleanerService
+from src.service.database.pagination import KeysetPage, PageCursor
 
 ITEM_PER_PAGE = 4
 
 
-async def show_msg_pagination(  # noqa: PLR0913
+def parse_page_cursor(callback_data: str) -> PageCursor | None:
+    """
+    Извлекает курсор страницы из callback_data кнопки навигации.
+
+    :param callback_data: Данные вида `<prefix>:<курсор>` или `<prefix>:1`.
+    :return: Курсор или `None` для первой страницы.
+    """
+    _, _, packed_cursor = callback_data.partition(":")
+    return PageCursor.unpack(packed_cursor)
+
+
+async def show_msg_pagination(
     callback: CallbackQuery,
     message_text: str,
-    data: Sequence,
-    keyboard: Callable[[list, int, int], Awaitable[InlineKeyboardMarkup]],
+    page: KeysetPage,
+    keyboard: Callable[[KeysetPage], Awaitable[InlineKeyboardMarkup]],
     cleaner_service: TrackNameMsgCleanerService | None = None,
-    page: int | None = None,
 ) -> None:
     """
     Отображает пагинированное сообщение с указанным текстом и клавиатурой.
 
     :param callback: Объект CallbackQuery, полученный от нажатия кнопки.
     :param message_text: Текст сообщения, которое будет отображаться.
-    :param data: Список данных, который будет разделён на страницы.
+    :param page: Текущая страница данных.
     :param keyboard: Функция, которая генерирует InlineKeyboardMarkup для текущей страницы.
     :param cleaner_service: Сервис для управления сообщениями, которые нужно удалить позже (опционально).
-    :param page: Номер текущей страницы (опционально).
     """
-    total_pages = (len(data) + ITEM_PER_PAGE - 1) // ITEM_PER_PAGE
-    start_idx = (page - 1) * ITEM_PER_PAGE
-    end_idx = start_idx + ITEM_PER_PAGE
-    current_page: Sequence = data[start_idx:end_idx]
     send_msg = await callback.message.edit_text(
         message_text,
         parse_mode="html",
-        reply_markup=await keyboard(current_page, page, total_pages),
+        reply_markup=await keyboard(page),
     )
     if cleaner_service:
         await cleaner_service.collect_cliper_messages_to_delete(
@@ -53,11 +63,9 @@ async def show_msg_pagination(  # noqa: PLR0913
         )
 
 
-async def create_paginated_keyboard(  # noqa: PLR0913
-    items: Sequence,
+async def create_paginated_keyboard(
+    page: KeysetPage,
     item_params: str,
-    page: int,
-    total_pages: int,
     bt_prefix: str,
     bt_pagin_prefix: str,
     bottom_buttons: Sequence[InlineKeyboardButton] | None = None,
@@ -65,10 +73,8 @@ async def create_paginated_keyboard(  # noqa: PLR0913
     """
     Создаёт клавиатуру с пагинацией для отображения элементов на странице.
 
-    :param items: Элементы текущей страницы.
+    :param page: Текущая страница с элементами и курсорами соседних страниц.
     :param item_params: Имя атрибута объекта, который будет отображаться как текст кнопки.
-    :param page: Текущий номер страницы.
-    :param total_pages: Общее количество страниц.
     :param bt_prefix: Префикс для callback_data кнопок элементов.
     :param bt_pagin_prefix: Префикс для callback_data кнопок пагинации.
     :param bottom_buttons: Дополнительные кнопки, которые будут отображаться внизу (опционально).
@@ -76,7 +82,7 @@ async def create_paginated_keyboard(  # noqa: PLR0913
     """
     builder = InlineKeyboardBuilder()
 
-    for item in items:
+    for item in page.items:
         attr = getattr(item, item_params)
         builder.row(
             InlineKeyboardButton(
@@ -88,18 +94,18 @@ async def create_paginated_keyboard(  # noqa: PLR0913
     builder.adjust(2)
 
     pagination_buttons = []
-    if page > 1:
+    if prev_cursor := page.prev_cursor:
         pagination_buttons.append(
             InlineKeyboardButton(
                 text="⬅️ Назад",
-                callback_data=f"{bt_pagin_prefix}:{page - 1}",
+                callback_data=f"{bt_pagin_prefix}:{prev_cursor.pack()}",
             ),
         )
-    if page < total_pages:
+    if next_cursor := page.next_cursor:
         pagination_buttons.append(
             InlineKeyboardButton(
                 text="Вперед ➡️",
-                callback_data=f"{bt_pagin_prefix}:{page + 1}",
+                callback_data=f"{bt_pagin_prefix}:{next_cursor.pack()}",
             ),
         )
 
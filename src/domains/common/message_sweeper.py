@@ -0,0 +1,72 @@
+"""
+Модуль `message_sweeper.py` содержит фоновую задачу очистки брошенных списков временных сообщений.
+
+Если пользователь не дошёл до шага, на котором временные сообщения удаляются, их ID остаются в Redis.
+Задача периодически находит такие списки по индексу времени активности, забирает их
+и (опционально) удаляет сами сообщения из чата, не нагружая обработчики следующих апдейтов.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from aiogram import Bot
+
+from src.domains.common.cleaner_service import delete_messages_in_chunks
+from src.service.cache.base_cache_repository import BaseMsgCleanerRepository
+from src.service.settings.config import CleanerSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StaleMessageSweeper:
+    """
+    Периодическая очистка списков временных сообщений, которые давно не обновлялись.
+
+    Бот работает в личных чатах, поэтому ID чата совпадает с ID пользователя.
+
+    :ivar repositories: Репозитории временных сообщений, которые нужно обходить.
+    :ivar settings: Настройки очистки (интервал, порог устаревания, удаление сообщений).
+    """
+
+    repositories: list[BaseMsgCleanerRepository]
+    settings: CleanerSettings
+
+    async def sweep_once(self, bot: Bot) -> int:
+        """
+        Выполняет один проход очистки по всем репозиториям.
+
+        :param bot: Экземпляр бота для удаления сообщений.
+        :return: Количество очищенных списков.
+        """
+        older_than = time.time() - self.settings.stale_after
+        swept = 0
+        for repository in self.repositories:
+            for user_id in await repository.get_stale_users(older_than):
+                message_ids = await repository.pop_stale_messages_to_delete(user_id, older_than)
+                if message_ids is None:
+                    continue
+                swept += 1
+                if message_ids and self.settings.delete_stale_messages:
+                    await delete_messages_in_chunks(bot, user_id, message_ids)
+        return swept
+
+    async def run(self, bot: Bot) -> None:
+        """
+        Запускает бесконечный цикл очистки с интервалом `sweep_interval`.
+
+        Ошибка одного прохода логгируется и не останавливает цикл.
+
+        :param bot: Экземпляр бота для удаления сообщений.
+        """
+        while True:
+            await asyncio.sleep(self.settings.sweep_interval)
+            try:
+                swept = await self.sweep_once(bot)
+            except Exception:
+                logger.exception("Ошибка очистки временных сообщений")
+                continue
+            if swept:
+                logger.info(f"Очищено брошенных списков временных сообщений: {swept}")
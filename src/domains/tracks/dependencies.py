@@ -2,10 +2,12 @@
 
 from dishka import FromDishka, Provider, Scope, provide
 
+from src.domains.tracks.query_normalizer import QueryNormalizer
 from src.domains.tracks.service import TrackService
 from src.domains.tracks.track_cliper.message_cleanup import TrackClipMsgCleanerService
 from src.domains.tracks.track_cliper.service import TrackCliperService
 from src.service.downloader.service import DownloaderService
+from src.service.settings.config import Settings
 
 
 class TrackProvider(Provider):
@@ -13,10 +15,24 @@ class TrackProvider(Provider):
     Класс-провайдер для внедрения зависимостей модуля треков.
 
     Регистрирует:
-    - `TrackService` — для работы с треками (загрузка, обработка, отправка).
+    - `TrackService` — для работы с треками (загрузка, обработка, отправка);
+    - `QueryNormalizer` — для нормализации поисковых запросов в ключах кэшей.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
+    async def get_query_normalizer(
+        self,
+        settings: FromDishka[Settings],
+    ) -> QueryNormalizer:
+        """
+        Возвращает нормализатор поисковых запросов.
+
+        :param settings: Объект настроек (транслитерация запросов).
+        :return: Экземпляр `QueryNormalizer`.
+        """
+        return QueryNormalizer(transliterate=settings.search.transliterate_queries)
+
+    @provide(scope=Scope.APP)
     async def get_service(
         self,
         downloader_service: FromDishka[DownloaderService],
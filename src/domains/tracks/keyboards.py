@@ -9,6 +9,9 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from src.domains.common.buttons import bt_return_main_page
 from src.domains.tracks.schemas import DownloadTrackParams, RepoTracks
 
+# Ограничение Telegram на размер callback_data
+CALLBACK_DATA_MAX_BYTES = 64
+
 
 def get_retry_search_button(text: str) -> InlineKeyboardBuilder:
     """
@@ -22,6 +25,25 @@ def get_retry_search_button(text: str) -> InlineKeyboardBuilder:
     return builder
 
 
+def get_query_suggestions_buttons(suggestions: list[str] | None) -> InlineKeyboardBuilder:
+    """
+    Создаёт кнопки с подсказками по похожим запросам.
+
+    Кнопка ведёт в тот же обработчик `t_r:`, что и история запросов. Подсказки, которые не помещаются
+    в `callback_data` или содержат разделитель `:`, пропускаются.
+
+    :param suggestions: Тексты подсказок.
+    :return: Объект `InlineKeyboardBuilder`.
+    """
+    builder = InlineKeyboardBuilder()
+    for query_text in suggestions or []:
+        callback_data = f"t_r:{query_text}"
+        if ":" in query_text or len(callback_data.encode()) > CALLBACK_DATA_MAX_BYTES:
+            continue
+        builder.row(InlineKeyboardButton(text=f"💡 {query_text}", callback_data=callback_data))
+    return builder
+
+
 async def break_processing() -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру для отмены текущего процесса и возврата на главную страницу.
@@ -60,12 +82,22 @@ async def kb_track_list(repo_result: RepoTracks) -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text="⏭️ Следующий источник",
-            callback_data=f"skip_repo:{repo_result.repo_alias}",
+            callback_data=f"skip_repo:{','.join([*repo_result.skipped, repo_result.repo_alias])}",
         ),
     )
     return builder.as_markup()
 
 
+async def get_query_suggestions_kb(suggestions: list[str]) -> InlineKeyboardMarkup:
+    """
+    Создаёт клавиатуру с подсказками по похожим запросам, показываемую во время поиска.
+
+    :param suggestions: Тексты подсказок по похожим запросам.
+    :return: Объект `InlineKeyboardMarkup`.
+    """
+    return get_query_suggestions_buttons(suggestions).as_markup()
+
+
 async def get_search_kb() -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру для повторного поиска трека.
@@ -76,13 +108,15 @@ async def get_search_kb() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-async def get_retry_search_kb() -> InlineKeyboardMarkup:
+async def get_retry_search_kb(suggestions: list[str] | None = None) -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру для поиска другого трека.
 
+    :param suggestions: Тексты подсказок по похожим запросам.
     :return: Объект `InlineKeyboardMarkup`.
     """
-    builder = get_retry_search_button("🔁 Найти другой трек")
+    builder = get_query_suggestions_buttons(suggestions)
+    builder.attach(get_retry_search_button("🔁 Найти другой трек"))
     return builder.as_markup()
 
 
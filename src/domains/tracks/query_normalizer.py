@@ -0,0 +1,86 @@
+"""
+Модуль `query_normalizer.py` содержит нормализацию поисковых запросов.
+
+Нормализованный текст используется только как ключ кэшей (результаты поиска, рейтинг
+популярных запросов, схлопывание повторов), чтобы запросы `«Queen - Believer»`,
+`queen believer ` и `QUEEN — believer` попадали в один ключ. Пользователю и источникам
+по-прежнему передаётся исходный текст.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# Все виды тире и дефисов приводятся к обычному дефису
+DASHES = str.maketrans(dict.fromkeys("‐‑‒–—―−﹘﹣－", "-"))
+# Кавычки не влияют на смысл запроса и удаляются
+QUOTES = str.maketrans(dict.fromkeys("\"'`«»„“”‟‘’‚‛‹›′″", ""))
+# Дефис, отделённый пробелом хотя бы с одной стороны, — разделитель «исполнитель - название»
+SEPARATOR_DASH = re.compile(r"(?:^|\s)-+|-+(?:\s|$)")
+WHITESPACE = re.compile(r"\s+")
+
+CYRILLIC_TO_LATIN = str.maketrans(
+    {
+        "а": "a",
+        "б": "b",
+        "в": "v",
+        "г": "g",
+        "д": "d",
+        "е": "e",
+        "ж": "zh",
+        "з": "z",
+        "и": "i",
+        "й": "i",
+        "к": "k",
+        "л": "l",
+        "м": "m",
+        "н": "n",
+        "о": "o",
+        "п": "p",
+        "р": "r",
+        "с": "s",
+        "т": "t",
+        "у": "u",
+        "ф": "f",
+        "х": "kh",
+        "ц": "ts",
+        "ч": "ch",
+        "ш": "sh",
+        "щ": "shch",
+        "ъ": "",
+        "ы": "y",
+        "ь": "",
+        "э": "e",
+        "ю": "iu",
+        "я": "ia",
+    },
+)
+
+
+@dataclass(frozen=True)
+class QueryNormalizer:
+    """
+    Приводит поисковые запросы к каноническому виду для ключей кэша.
+
+    :ivar transliterate: Транслитерировать кириллицу в латиницу, чтобы `кино` и `kino`
+        попадали в один ключ.
+    """
+
+    transliterate: bool = False
+
+    def normalize(self, query_text: str) -> str:
+        """
+        Возвращает нормализованный текст запроса.
+
+        Выполняет Unicode-нормализацию NFKC, приведение регистра, замену `ё` на `е`,
+        унификацию тире, удаление кавычек, удаление дефисов-разделителей и схлопывание пробелов.
+
+        :param query_text: Исходный текст запроса.
+        :return: Нормализованный текст.
+        """
+        text = unicodedata.normalize("NFKC", query_text).casefold().replace("ё", "е")
+        text = text.translate(DASHES).translate(QUOTES)
+        text = SEPARATOR_DASH.sub(" ", text)
+        if self.transliterate:
+            text = text.translate(CYRILLIC_TO_LATIN)
+        return WHITESPACE.sub(" ", text).strip()
@@ -47,10 +47,12 @@ class RepoTracks(BaseModel):
 
     :param tracks: Список объектов `Track`.
     :param repo_alias: Алиас репозитория (например, 'yt' для YouTube).
+    :param skipped: Алиасы репозиториев, уже опрошенных по этому запросу без результата.
     """
 
     tracks: list[Track]
     repo_alias: str
+    skipped: list[str] = []
 
 
 class DownloadTrackParams(BaseModel):
@@ -26,6 +26,7 @@ from src.domains.tracks.track_cliper.message_cleanup import TrackClipMsgCleanerS
 from src.domains.tracks.track_cliper.schemas import ClipPeriodSchema
 from src.domains.tracks.track_cliper.service import TrackCliperService
 from src.service.downloader.service import DownloaderService
+from src.service.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,7 @@ class TrackService:
     cleaner_service: TrackClipMsgCleanerService
 
     @staticmethod
+    @traced("telegram.send_track")
     async def __send_track(  # noqa: PLR0913
         path: Path,
         bot: Bot,
@@ -74,6 +76,7 @@ class TrackService:
                 reply_markup=keyboard,
             )
 
+    @traced("tracks.download_full_track")
     async def download_full_track(
         self,
         message: Message,
@@ -114,6 +117,7 @@ class TrackService:
 
         return track_path
 
+    @traced("tracks.download_clipped_track")
     async def download_clipped_track(  # noqa: PLR0913
         self,
         track_path: Path,
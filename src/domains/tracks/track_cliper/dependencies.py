@@ -14,6 +14,7 @@ from src.domains.tracks.track_cliper.cache_repository import ClipMsgCleanerRepos
 from src.domains.tracks.track_cliper.message_cleanup import TrackClipMsgCleanerService
 from src.domains.tracks.track_cliper.service import TrackCliperService
 from src.service.cliper.repository import TrackCliperRepo
+from src.service.settings.config import Settings
 
 
 class TrackCliperProvider(Provider):
@@ -27,7 +28,7 @@ class TrackCliperProvider(Provider):
     - `TrackClipMsgCleanerService` — для реализации логики очистки временных данных.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_service(
         self,
         cliper_repo: FromDishka[TrackCliperRepo],
@@ -40,20 +41,27 @@ class TrackCliperProvider(Provider):
         """
         return TrackCliperService(cliper_repo=cliper_repo)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_cache_cleaner_repo(
         self,
         redis_client: FromDishka[Redis],
+        settings: FromDishka[Settings],
     ) -> ClipMsgCleanerRepository:
         """
         Возвращает экземпляр репозитория для хранения временных сообщений в Redis.
 
         :param redis_client: Асинхронный клиент Redis для хранения данных.
+        :param settings: Объект настроек (режим автопайплайнинга Redis, лимиты списков сообщений).
         :return: Экземпляр `ClipMsgCleanerRepository`.
         """
-        return ClipMsgCleanerRepository(redis_client=redis_client)
+        return ClipMsgCleanerRepository(
+            redis_client=redis_client,
+            auto_pipeline=settings.redis.auto_pipeline,
+            max_messages=settings.cleaner.max_messages,
+            messages_ttl=settings.cleaner.messages_ttl,
+        )
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_cleaner_service(
         self,
         cache_repository: FromDishka[ClipMsgCleanerRepository],
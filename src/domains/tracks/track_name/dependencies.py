@@ -12,6 +12,7 @@ from redis.asyncio import Redis
 
 from src.domains.tracks.track_name.cache_repository import TrackNameMsgCleanerRepository
 from src.domains.tracks.track_name.message_cleanup import TrackNameMsgCleanerService
+from src.service.settings.config import Settings
 
 
 class TrackNameProvider(Provider):
@@ -23,20 +24,27 @@ class TrackNameProvider(Provider):
     - `TrackNameMsgCleanerService` — для реализации логики очистки сообщений.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_cache_cleaner_repo(
         self,
         redis_client: FromDishka[Redis],
+        settings: FromDishka[Settings],
     ) -> TrackNameMsgCleanerRepository:
         """
         Возвращает экземпляр репозитория для работы с кэшем временных сообщений.
 
         :param redis_client: Асинхронный клиент Redis для хранения данных.
+        :param settings: Объект настроек (режим автопайплайнинга Redis, лимиты списков сообщений).
         :return: Экземпляр `TrackNameMsgCleanerRepository`.
         """
-        return TrackNameMsgCleanerRepository(redis_client=redis_client)
-
-    @provide(scope=Scope.REQUEST)
+        return TrackNameMsgCleanerRepository(
+            redis_client=redis_client,
+            auto_pipeline=settings.redis.auto_pipeline,
+            max_messages=settings.cleaner.max_messages,
+            messages_ttl=settings.cleaner.messages_ttl,
+        )
+
+    @provide(scope=Scope.APP)
     async def get_cleaner_service(
         self,
         cache_repository: FromDishka[TrackNameMsgCleanerRepository],
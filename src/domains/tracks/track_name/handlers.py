@@ -21,7 +21,7 @@ from aiogram.types import CallbackQuery, Message
 from dishka import FromDishka
 from dishka.integrations.aiogram import inject
 
-from src.domains.common.message_pagination import show_msg_pagination
+from src.domains.common.message_pagination import ITEM_PER_PAGE, parse_page_cursor, show_msg_pagination
 from src.domains.tracks.schemas import DownloadTrackParams
 from src.domains.tracks.service import TrackService
 from src.domains.tracks.track_name.keyboards import (
@@ -35,6 +35,7 @@ from src.domains.tracks.track_name.message_cleanup import TrackNameMsgCleanerSer
 from src.domains.tracks.track_request.service import TrackRequestService
 from src.domains.tracks.track_search.service import TrackSearchService
 from src.domains.users.services import UserService
+from src.service.database.pagination import PageCursor
 from src.service.downloader.service import DownloaderService
 
 track_name_router = Router(name="track_name_router")
@@ -80,7 +81,6 @@ async def try_choose_track_name(
         callback=callback,
         user_service=user_service,
         cleaner_service=cleaner_service,
-        page=1,
     )
 
 
@@ -90,25 +90,21 @@ async def handle_search_tracks(
     callback: CallbackQuery,
     user_service: FromDishka[UserService],
     cleaner_service: FromDishka[TrackNameMsgCleanerService],
-    page: int | None = None,
 ) -> None:
     """
     Обработчик для навигации по страницам истории названий треков.
 
-    Извлекает данные о ранее введённых частях названий и отображает их с пагинацией.
+    Извлекает одну страницу ранее введённых частей названий по курсору из callback.data и отображает её.
 
-    :param callback: CallbackQuery с данными о номере страницы.
+    :param callback: CallbackQuery с курсором страницы.
     :param user_service: Сервис для работы с пользователями.
     :param cleaner_service: Сервис для управления временными сообщениями.
-    :param page: Номер текущей страницы.
     """
-    if page is None:
-        page = int(callback.data.split(":")[-1])
     await _handle_search_tracks(
         callback=callback,
         user_service=user_service,
         cleaner_service=cleaner_service,
-        page=page,
+        cursor=parse_page_cursor(callback.data),
     )
 
 
@@ -116,24 +112,34 @@ async def _handle_search_tracks(
     callback: CallbackQuery,
     user_service: UserService,
     cleaner_service: TrackNameMsgCleanerService,
-    page: int | None = None,
+    cursor: PageCursor | None = None,
 ) -> None:
     """
     Вспомогательная функция для отображения истории введённых названий.
 
-    Получает список частей названий пользователя и формирует клавиатуру с пагинацией.
+    Получает страницу частей названий пользователя и формирует клавиатуру с пагинацией.
+    Если страница по курсору оказалась пустой (записи устарели), показывается первая страница.
 
     :param callback: CallbackQuery от пользователя.
     :param user_service: Сервис для работы с пользователями.
     :param cleaner_service: Сервис для управления временными сообщениями.
-    :param page: Номер страницы для отображения.
+    :param cursor: Курсор страницы или `None` для первой страницы.
     """
     await callback.answer("Сейчас посмотрим, что вы вводили ранее...")
 
-    user_track_names = await user_service.get_user_track_names(callback.from_user.id)
+    user_track_names = await user_service.get_user_track_names_page(
+        callback.from_user.id,
+        cursor,
+        page_size=ITEM_PER_PAGE,
+    )
+    if not user_track_names.items and cursor is not None:
+        user_track_names = await user_service.get_user_track_names_page(
+            callback.from_user.id,
+            page_size=ITEM_PER_PAGE,
+        )
     keyboard = kb_track_name_pagination
 
-    if not user_track_names:
+    if not user_track_names.items:
         await callback.message.edit_text(
             """📂 История пуста.\n\n
 Ты ещё не вводил имена спортсменов.\n
@@ -145,10 +151,9 @@ async def _handle_search_tracks(
     await show_msg_pagination(
         callback=callback,
         cleaner_service=cleaner_service,
-        page=page,
+        page=user_track_names,
         keyboard=keyboard,
         message_text="📂 Ранее ты вводил имена:\n\nВыбери одно из них или задай новое 🎯",
-        data=user_track_names,
     )
 
 
@@ -8,14 +8,13 @@
 - подтверждения или изменения введённых данных.
 """
 
-from collections.abc import Sequence
-
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.domains.common.buttons import bt_set_track_name
 from src.domains.common.message_pagination import create_paginated_keyboard
 from src.domains.tracks.track_name.buttons import bt_confirm_input, bt_prompt_track_name
+from src.service.database.pagination import KeysetPage
 
 
 def kb_back_track_name_prompt_item(
@@ -83,29 +82,21 @@ async def kb_discipline() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-async def kb_track_name_pagination(
-    user_track_parts: Sequence,
-    page: int,
-    total_pages: int,
-) -> InlineKeyboardMarkup:
+async def kb_track_name_pagination(user_track_parts: KeysetPage) -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру с пагинацией для отображения сохранённых
      частей названий треков пользователя.
 
     Использует общую функцию `create_paginated_keyboard` для генерации кнопок
-     с учётом текущей страницы и общего количества страниц.
+     с учётом наличия соседних страниц.
     Добавляет нижнюю кнопку для возврата к вводу нового названия.
 
-    :param user_track_parts: Список частей названий треков пользователя.
-    :param page: Текущий номер страницы.
-    :param total_pages: Общее количество страниц.
+    :param user_track_parts: Страница частей названий треков пользователя.
     :return: Объект `InlineKeyboardMarkup`.
     """
     return await create_paginated_keyboard(
-        items=user_track_parts,
+        page=user_track_parts,
         item_params="track_part",
-        page=page,
-        total_pages=total_pages,
         bt_prefix="t_p",
         bt_pagin_prefix="track_name_page",
         bottom_buttons=[await bt_prompt_track_name()],
@@ -7,7 +7,7 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.service.database.database import Base
@@ -36,7 +36,6 @@ class TrackNameRegistry(Base):
         BigInteger(),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     track_part: Mapped[str] = mapped_column(
         String(255),
@@ -47,7 +46,6 @@ class TrackNameRegistry(Base):
     user: Mapped["User"] = relationship(
         "User",
         back_populates="track_names",
-        lazy="joined",
     )
 
     __table_args__ = (
@@ -56,4 +54,11 @@ class TrackNameRegistry(Base):
             "track_part",
             name="uix_user_track_part",
         ),  # Уникальность пары (пользователь, часть названия)
+        # Keyset-пагинация истории пользователя по (updated_at, id) от новых к старым
+        Index(
+            "ix_track_name_registry_user_updated_at_id",
+            "user_id",
+            text("updated_at DESC"),
+            text("id DESC"),
+        ),
     )
@@ -4,6 +4,8 @@
 Определяет структуру данных, используемую для хранения и передачи частей названий треков, связанных с пользователями.
 """
 
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -18,11 +20,13 @@ class TrackNamePartSchema(BaseModel):
     Attributes:
         id: Уникальный идентификатор записи.
         track_part: Часть названия трека (например, "Иванов_ИО_1990").
+        updated_at: Дата последнего использования (ключ пагинации).
 
     """
 
     id: int
     track_part: str
+    updated_at: datetime | None = None
 
     class Config:
         """Включает поддержку создания модели из ORM-объектов."""
@@ -0,0 +1,34 @@
+"""
+Модуль `backfill_leaderboard.py` — разовая пересборка рейтинга популярных запросов.
+
+Подсчитывает запросы по существующим данным таблицы `track_requests` и записывает
+рейтинг за всё время в Redis. Суточный и недельный рейтинги не восстанавливаются:
+история отдельных поисков в БД не хранится.
+
+Запуск: `make leaderboard-backfill` или `python -m src.domains.tracks.track_request.backfill_leaderboard`.
+"""
+
+import asyncio
+import logging
+
+from src.domains.tracks.track_request.service import TrackRequestService
+from src.service.di.containers import create_container
+from src.service.settings.logger.logger_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_leaderboard() -> None:
+    """Пересобирает рейтинг популярных запросов за всё время."""
+    container = create_container()
+    try:
+        track_request_service = await container.get(TrackRequestService)
+        total = await track_request_service.backfill_leaderboard()
+        logger.info(f"Рейтинг популярных запросов пересобран: {total} запросов")
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(backfill_leaderboard())
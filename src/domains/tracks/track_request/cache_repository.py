@@ -0,0 +1,227 @@
+"""
+Модуль `cache_repository.py` содержит репозиторий рейтинга популярных поисковых запросов.
+
+Рейтинг хранится в Redis в виде упорядоченных множеств (sorted sets) и обновляется
+инкрементально после каждой записи запросов в БД, поэтому чтение топа стоит O(log n)
+вместо `GROUP BY` по всей таблице `track_requests`.
+
+Члены множеств — нормализованные тексты запросов, поэтому варианты написания одного запроса
+суммируются. Для показа хранится первый встреченный исходный текст.
+
+Ключи:
+- `popular_queries:all` — количество пользователей, искавших запрос (как `COUNT(*)` по таблице);
+- `popular_queries:day:<YYYY-MM-DD>` — количество поисков за сутки (UTC);
+- `popular_queries:week:<YYYY>-W<WW>` — количество поисков за ISO-неделю (UTC);
+- `popular_queries:display` — хэш «нормализованный текст → исходный текст для показа».
+
+Рейтинг за всё время периодически обрезается до `max_all_time` самых популярных запросов
+(`trim_all_time`) — только когда он вырос в `all_time_slack` раз. Обрезка после каждого обновления
+удаляла бы новый запрос сразу, пока его счётчик равен 1, и рейтинг переставал бы принимать новые
+популярные запросы. Поля хэша для показа, чьих запросов не осталось ни в одном рейтинге,
+удаляются так же периодически (`prune_display`), поэтому ни один ключ не растёт без ограничений.
+"""
+
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from enum import StrEnum
+
+from redis.asyncio import Redis
+
+from src.domains.tracks.query_normalizer import QueryNormalizer
+from src.service.cache.base_cache_repository import RedisClientWrapper
+
+# Удаляет поля хэша для показа, чьих запросов нет ни в одном рейтинге.
+# KEYS[1] — хэш для показа, KEYS[2..] — рейтинги; ARGV — проверяемые поля.
+PRUNE_DISPLAY_SCRIPT = """
+local removed = 0
+for _, query_key in ipairs(ARGV) do
+    local ranked = false
+    for i = 2, #KEYS do
+        if redis.call('ZSCORE', KEYS[i], query_key) then
+            ranked = true
+            break
+        end
+    end
+    if not ranked then
+        removed = removed + redis.call('HDEL', KEYS[1], query_key)
+    end
+end
+return removed
+"""
+
+
+class LeaderboardPeriod(StrEnum):
+    """Период, за который строится рейтинг запросов."""
+
+    ALL = "all"
+    DAY = "day"
+    WEEK = "week"
+
+
+@dataclass
+class TrackRequestLeaderboardRepository(RedisClientWrapper):
+    """
+    Репозиторий рейтинга популярных поисковых запросов в Redis.
+
+    Суточные и недельные множества живут ограниченное время и удаляются сами,
+    рейтинг за всё время периодически обрезается до `max_all_time` запросов.
+    """
+
+    redis_client: Redis
+    auto_pipeline: bool = False
+    normalizer: QueryNormalizer = field(default_factory=QueryNormalizer)
+    leaderboard_key: str = "popular_queries:{period}"
+    display_key: str = "popular_queries:display"
+    day_ttl: int = 2 * 24 * 60 * 60
+    week_ttl: int = 14 * 24 * 60 * 60
+    backfill_chunk_size: int = 1000
+    max_all_time: int = 10_000
+    all_time_slack: float = 1.2
+
+    def __post_init__(self):
+        """Выполняет инициализацию родительского класса `RedisClientWrapper`."""
+        super().__init__(self.redis_client, auto_pipeline=self.auto_pipeline)
+        self._prune_display_script = self.redis_client.register_script(PRUNE_DISPLAY_SCRIPT)
+
+    def _key(self, period: LeaderboardPeriod, now: datetime | None = None) -> str:
+        """
+        Формирует ключ множества для периода.
+
+        :param period: Период рейтинга.
+        :param now: Момент времени, к которому относится период (по умолчанию — текущий).
+        :return: Ключ Redis.
+        """
+        now = now or datetime.now(UTC)
+        match period:
+            case LeaderboardPeriod.DAY:
+                suffix = f"day:{now:%Y-%m-%d}"
+            case LeaderboardPeriod.WEEK:
+                iso_year, iso_week, _ = now.isocalendar()
+                suffix = f"week:{iso_year}-W{iso_week:02d}"
+            case _:
+                suffix = "all"
+        return self.leaderboard_key.format(period=suffix)
+
+    async def record(self, new_queries: Iterable[str], searched_queries: Iterable[str]) -> None:
+        """
+        Обновляет рейтинги одной транзакцией.
+
+        :param new_queries: Запросы, впервые сохранённые для пользователя (рейтинг за всё время).
+        :param searched_queries: Все выполненные поиски (суточный и недельный рейтинги).
+        """
+        now = datetime.now(UTC)
+        all_key = self._key(LeaderboardPeriod.ALL, now)
+        day_key = self._key(LeaderboardPeriod.DAY, now)
+        week_key = self._key(LeaderboardPeriod.WEEK, now)
+
+        async with self.pipeline() as pipe:
+            for query_text in new_queries:
+                pipe.zincrby(all_key, 1, self.normalizer.normalize(query_text))
+            for query_text in searched_queries:
+                query_key = self.normalizer.normalize(query_text)
+                pipe.zincrby(day_key, 1, query_key)
+                pipe.zincrby(week_key, 1, query_key)
+                pipe.hsetnx(self.display_key, query_key, query_text)
+            pipe.expire(day_key, self.day_ttl)
+            pipe.expire(week_key, self.week_ttl)
+            await pipe.execute()
+
+    async def top(self, period: LeaderboardPeriod = LeaderboardPeriod.ALL, limit: int = 12) -> list[tuple[str, int]]:
+        """
+        Возвращает самые популярные запросы за период.
+
+        :param period: Период рейтинга.
+        :param limit: Количество запросов.
+        :return: Список пар (исходный текст запроса, количество), от большего к меньшему.
+        """
+        raw_items = await self._execute("zrevrange", self._key(period), 0, limit - 1, withscores=True)
+        if not raw_items:
+            return []
+        display_texts = await self._execute("hmget", self.display_key, [query_key for query_key, _ in raw_items])
+        return [
+            ((display_text or query_key).decode("utf-8"), int(score))
+            for (query_key, score), display_text in zip(raw_items, display_texts, strict=True)
+        ]
+
+    async def replace_all_time(self, counts: AsyncIterable[tuple[str, int]]) -> int:
+        """
+        Полностью пересобирает рейтинг за всё время.
+
+        Данные пишутся во временный ключ, который затем атомарно подменяет основной (`RENAME`).
+        Инкременты, пришедшие во время пересборки, будут перезаписаны. Счётчики запросов,
+        совпадающих после нормализации, суммируются; сохраняются `max_all_time` самых популярных.
+
+        :param counts: Пары (текст запроса, количество).
+        :return: Количество запросов в рейтинге.
+        """
+        all_key = self._key(LeaderboardPeriod.ALL)
+        tmp_key = f"{all_key}:backfill"
+        await self.delete(tmp_key)
+
+        chunk: list[tuple[str, int]] = []
+        async for query_text, count in counts:
+            chunk.append((query_text, count))
+            if len(chunk) >= self.backfill_chunk_size:
+                await self._backfill_chunk(tmp_key, chunk)
+                chunk = []
+        if chunk:
+            await self._backfill_chunk(tmp_key, chunk)
+
+        await self._execute("zremrangebyrank", tmp_key, 0, -(self.max_all_time + 1))
+        total = await self._execute("zcard", tmp_key)
+        if total:
+            await self._execute("rename", tmp_key, all_key)
+        else:
+            await self.delete(all_key)
+        return total
+
+    async def _backfill_chunk(self, tmp_key: str, chunk: list[tuple[str, int]]) -> None:
+        """
+        Добавляет пачку счётчиков во временный ключ пересборки.
+
+        :param tmp_key: Временный ключ рейтинга.
+        :param chunk: Пары (текст запроса, количество).
+        """
+        async with self.pipeline(transaction=False) as pipe:
+            for query_text, count in chunk:
+                query_key = self.normalizer.normalize(query_text)
+                pipe.zincrby(tmp_key, count, query_key)
+                pipe.hsetnx(self.display_key, query_key, query_text)
+            await pipe.execute()
+
+    async def trim_all_time(self) -> int:
+        """
+        Обрезает рейтинг за всё время до `max_all_time` самых популярных запросов.
+
+        Рейтинг обрезается, только если в нём больше `max_all_time * all_time_slack` запросов:
+        новые запросы успевают набрать счётчик до следующей обрезки.
+
+        :return: Количество удалённых запросов.
+        """
+        all_key = self._key(LeaderboardPeriod.ALL)
+        if await self._execute("zcard", all_key) <= self.max_all_time * self.all_time_slack:
+            return 0
+        return await self._execute("zremrangebyrank", all_key, 0, -(self.max_all_time + 1))
+
+    async def prune_display(self) -> int:
+        """
+        Удаляет из хэша для показа поля запросов, которых нет ни в одном из текущих рейтингов.
+
+        Хэш обходится `HSCAN`-ом пачками по `backfill_chunk_size` полей; проверка и удаление
+        каждой пачки выполняются одним Lua-скриптом.
+
+        :return: Количество удалённых полей.
+        """
+        now = datetime.now(UTC)
+        keys = [self.display_key, *(self._key(period, now) for period in LeaderboardPeriod)]
+        removed = 0
+        chunk: list[bytes] = []
+        async for query_key, _ in self.redis_client.hscan_iter(self.display_key, count=self.backfill_chunk_size):
+            chunk.append(query_key)
+            if len(chunk) >= self.backfill_chunk_size:
+                removed += await self._prune_display_script(keys=keys, args=chunk)
+                chunk = []
+        if chunk:
+            removed += await self._prune_display_script(keys=keys, args=chunk)
+        return removed
@@ -3,18 +3,29 @@
 
 Регистрирует зависимости, связанные с:
 - репозиторием для работы с историей поисковых запросов;
+- рейтингом популярных запросов в Redis;
+- буфером отложенной пакетной записи запросов;
+- фоновой задачей переноса старых запросов в архив;
 - сервисом для обработки логики взаимодействия с данными о запросах;
 """
 
+from collections.abc import AsyncIterable
+
 from dishka import FromDishka, Provider, Scope, provide
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from src.domains.tracks.query_normalizer import QueryNormalizer
+from src.domains.tracks.track_request.cache_repository import TrackRequestLeaderboardRepository
 from src.domains.tracks.track_request.repository import (
     TrackRequestRepository,
 )
+from src.domains.tracks.track_request.retention import TrackRequestRetentionJob
 from src.domains.tracks.track_request.service import (
     TrackRequestService,
 )
+from src.domains.tracks.track_request.write_buffer import TrackRequestWriteBuffer
+from src.service.settings.config import Settings
 
 
 class TrackRequestProvider(Provider):
@@ -23,10 +34,13 @@ class TrackRequestProvider(Provider):
 
     Регистрирует:
     - `TrackRequestRepository` — для работы с базой данных;
+    - `TrackRequestLeaderboardRepository` — для рейтинга популярных запросов;
+    - `TrackRequestWriteBuffer` — для пакетной записи запросов в фоне;
+    - `TrackRequestRetentionJob` — для переноса старых запросов в архив;
     - `TrackRequestService` — для реализации бизнес-логики обработки запросов.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_repo(
         self,
         session_factory: FromDishka[async_sessionmaker],
@@ -39,15 +53,78 @@ class TrackRequestProvider(Provider):
         """
         return TrackRequestRepository(session_factory=session_factory)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
+    async def get_leaderboard_repo(
+        self,
+        redis_client: FromDishka[Redis],
+        settings: FromDishka[Settings],
+        normalizer: FromDishka[QueryNormalizer],
+    ) -> TrackRequestLeaderboardRepository:
+        """
+        Возвращает экземпляр репозитория рейтинга популярных запросов.
+
+        :param redis_client: Асинхронный клиент Redis.
+        :param settings: Объект настроек (режим автопайплайнинга Redis).
+        :param normalizer: Нормализатор поисковых запросов для членов рейтинга.
+        :return: Экземпляр `TrackRequestLeaderboardRepository`.
+        """
+        return TrackRequestLeaderboardRepository(
+            redis_client=redis_client,
+            auto_pipeline=settings.redis.auto_pipeline,
+            normalizer=normalizer,
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_write_buffer(
+        self,
+        repo: FromDishka[TrackRequestRepository],
+        leaderboard_repo: FromDishka[TrackRequestLeaderboardRepository],
+    ) -> AsyncIterable[TrackRequestWriteBuffer]:
+        """
+        Создаёт и запускает буфер отложенной записи запросов.
+
+        При закрытии контейнера все накопленные записи сбрасываются в БД
+        до того, как будет закрыт движок SQLAlchemy.
+
+        :param repo: Репозиторий для работы с базой данных.
+        :param leaderboard_repo: Репозиторий рейтинга популярных запросов.
+        :return: Экземпляр `TrackRequestWriteBuffer`.
+        """
+        write_buffer = TrackRequestWriteBuffer(repository=repo, leaderboard=leaderboard_repo)
+        write_buffer.start()
+        yield write_buffer
+        await write_buffer.close()
+
+    @provide(scope=Scope.APP)
+    async def get_retention_job(
+        self,
+        repo: FromDishka[TrackRequestRepository],
+        leaderboard_repo: FromDishka[TrackRequestLeaderboardRepository],
+        settings: FromDishka[Settings],
+    ) -> TrackRequestRetentionJob:
+        """
+        Возвращает экземпляр фоновой задачи переноса старых запросов в архив.
+
+        :param repo: Репозиторий для работы с базой данных.
+        :param leaderboard_repo: Репозиторий рейтинга популярных запросов.
+        :param settings: Объект настроек (срок хранения и размер пачки).
+        :return: Экземпляр `TrackRequestRetentionJob`.
+        """
+        return TrackRequestRetentionJob(repository=repo, settings=settings.retention, leaderboard=leaderboard_repo)
+
+    @provide(scope=Scope.APP)
     async def get_service(
         self,
         repo: FromDishka[TrackRequestRepository],
+        write_buffer: FromDishka[TrackRequestWriteBuffer],
+        leaderboard_repo: FromDishka[TrackRequestLeaderboardRepository],
     ) -> TrackRequestService:
         """
         Возвращает экземпляр сервиса для обработки запросов на треки.
 
         :param repo: Репозиторий для работы с базой данных.
+        :param write_buffer: Буфер отложенной записи запросов.
+        :param leaderboard_repo: Репозиторий рейтинга популярных запросов.
         :return: Экземпляр `TrackRequestService`.
         """
-        return TrackRequestService(repo)
+        return TrackRequestService(repo, write_buffer, leaderboard_repo)
@@ -13,7 +13,7 @@ from aiogram.types import CallbackQuery
 from dishka import FromDishka
 from dishka.integrations.aiogram import inject
 
-from src.domains.common.message_pagination import show_msg_pagination
+from src.domains.common.message_pagination import ITEM_PER_PAGE, parse_page_cursor, show_msg_pagination
 from src.domains.tracks.track_request.keyboards import (
     kb_confirm_track_request,
     kb_no_track_request,
@@ -21,6 +21,7 @@ from src.domains.tracks.track_request.keyboards import (
 )
 from src.domains.tracks.track_request.service import TrackRequestService
 from src.domains.users.services import UserService
+from src.service.database.pagination import PageCursor
 
 track_request_router = Router(name="track_request_router")
 
@@ -40,7 +41,7 @@ async def try_choose_track_name(
     :param track_request_service: Сервис для работы с запросами на поиск треков.
     """
     await callback.answer()
-    await _handle_request_tracks(callback, track_request_service, page=1)
+    await _handle_request_tracks(callback, track_request_service)
 
 
 @track_request_router.callback_query(F.data.startswith("track_request_page:"))
@@ -48,43 +49,47 @@ async def try_choose_track_name(
 async def handle_request_tracks(
     callback: CallbackQuery,
     track_request_service: FromDishka[TrackRequestService],
-    page: int | None = None,
 ) -> None:
     """
     Обработчик для навигации по страницам истории запросов.
 
-    Извлекает данные о запросах пользователя и отображает их с пагинацией.
+    Извлекает одну страницу запросов пользователя по курсору из callback.data и отображает её.
 
-    :param callback: CallbackQuery с данными о номере страницы.
+    :param callback: CallbackQuery с курсором страницы.
     :param track_request_service: Сервис для работы с запросами на поиск треков.
-    :param page: Номер текущей страницы (определяется из callback.data).
     """
-    if page is None:
-        page = int(callback.data.split(":")[-1])
-    await _handle_request_tracks(callback, track_request_service, page)
+    await _handle_request_tracks(callback, track_request_service, parse_page_cursor(callback.data))
 
 
 async def _handle_request_tracks(
     callback: CallbackQuery,
     track_request_service: TrackRequestService,
-    page: int | None = None,
+    cursor: PageCursor | None = None,
 ) -> None:
     """
     Вспомогательная функция для отображения истории запросов пользователя.
 
-    Получает список запросов, формирует клавиатуру с пагинацией и отправляет сообщение с результатами.
+    Получает страницу запросов, формирует клавиатуру с пагинацией и отправляет сообщение с результатами.
+    Если страница по курсору оказалась пустой (записи устарели), показывается первая страница.
 
     :param callback: CallbackQuery от пользователя.
     :param track_request_service: Сервис для работы с запросами на поиск треков.
-    :param page: Номер страницы для отображения.
+    :param cursor: Курсор страницы или `None` для первой страницы.
     """
     await callback.answer("Сейчас посмотрим, что вы искали ранее...")
 
     user_track_requests = await track_request_service.get_track_user_request(
         callback.from_user.id,
+        cursor,
+        page_size=ITEM_PER_PAGE,
     )
+    if not user_track_requests.items and cursor is not None:
+        user_track_requests = await track_request_service.get_track_user_request(
+            callback.from_user.id,
+            page_size=ITEM_PER_PAGE,
+        )
 
-    if not user_track_requests:
+    if not user_track_requests.items:
         await callback.message.edit_text(
             """📂 История пуста.\n\n
 Ты ещё не искал треки.\n
@@ -97,10 +102,9 @@ async def _handle_request_tracks(
 
     await show_msg_pagination(
         callback=callback,
-        page=page,
+        page=user_track_requests,
         keyboard=keyboard,
         message_text="<b>📂 Твои прошлые запросы:</b>\n\nВыбери один из них или задай новый 🎵",
-        data=user_track_requests,
     )
 
 
@@ -16,7 +16,7 @@ from src.domains.common.message_pagination import create_paginated_keyboard
 from src.domains.tracks.track_request.buttons import (
     bt_track_request_page1,
 )
-from src.domains.tracks.track_request.schemas import TrackRequestSchema
+from src.service.database.pagination import KeysetPage
 
 
 async def kb_confirm_track_request() -> InlineKeyboardMarkup:
@@ -39,28 +39,20 @@ async def kb_confirm_track_request() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-async def kb_user_track_request(
-    user_request_parts: list[TrackRequestSchema],
-    page: int,
-    total_pages: int,
-) -> InlineKeyboardMarkup:
+async def kb_user_track_request(user_request_parts: KeysetPage) -> InlineKeyboardMarkup:
     """
     Создаёт клавиатуру с пагинацией для отображения истории запросов пользователя.
 
     Использует общую функцию `create_paginated_keyboard` для генерации кнопок
-     с учётом текущей страницы и общего количества страниц.
+     с учётом наличия соседних страниц.
     Добавляет нижние кнопки для перехода на главную страницу и запуска нового поиска.
 
-    :param user_request_parts: Список объектов `TrackRequestSchema` — история запросов пользователя.
-    :param page: Текущий номер страницы.
-    :param total_pages: Общее количество страниц.
+    :param user_request_parts: Страница объектов `TrackRequestSchema` — история запросов пользователя.
     :return: Объект `InlineKeyboardMarkup`.
     """
     return await create_paginated_keyboard(
-        items=user_request_parts,
+        page=user_request_parts,
         item_params="query_text",
-        page=page,
-        total_pages=total_pages,
         bt_prefix="t_r",
         bt_pagin_prefix="track_request_page",
         bottom_buttons=[
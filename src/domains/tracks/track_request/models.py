@@ -1,12 +1,14 @@
 """
-Модуль `models.py` содержит определение SQLAlchemy-модели для сущности `TrackRequest`.
+Модуль `models.py` содержит определение SQLAlchemy-моделей для сущности `TrackRequest`.
 
-Описывает структуру таблицы `track_requests`, хранящей историю поисковых запросов пользователей на треки.
+Описывает структуру таблицы `track_requests`, хранящей историю поисковых запросов пользователей на треки,
+и таблицы `track_requests_archive`, куда фоновая задача переносит давно не повторявшиеся запросы.
 """
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Text, UniqueConstraint, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.service.database.database import Base
@@ -41,7 +43,7 @@ class TrackRequest(Base):
     )
 
     # Связь с моделью пользователя
-    user: Mapped["User"] = relationship(back_populates="track_requests", lazy="joined")
+    user: Mapped["User"] = relationship(back_populates="track_requests")
 
     __table_args__ = (
         UniqueConstraint(
@@ -49,4 +51,52 @@ class TrackRequest(Base):
             "query_text",
             name="uq_user_query",
         ),  # Уникальность пары (пользователь, запрос)
+        # Keyset-пагинация истории пользователя по (updated_at, id) от новых к старым
+        Index(
+            "ix_track_requests_user_updated_at_id",
+            "user_id",
+            text("updated_at DESC"),
+            text("id DESC"),
+        ),
+        # Поиск записей для переноса в архив
+        Index("ix_track_requests_updated_at", "updated_at"),
+        # Подсказки по похожим запросам (pg_trgm): оператор `%` и префиксный ILIKE
+        Index(
+            "ix_track_requests_query_text_trgm",
+            "query_text",
+            postgresql_using="gin",
+            postgresql_ops={"query_text": "gin_trgm_ops"},
+        ),
+    )
+
+
+class TrackRequestArchive(Base):
+    """
+    Модель архива поисковых запросов.
+
+    Хранит строки `track_requests`, которые не повторялись дольше срока хранения.
+    Уникальности пары (пользователь, запрос) нет: один и тот же запрос может
+    попасть в архив несколько раз, если пользователь повторял его с большими перерывами.
+    """
+
+    __tablename__ = "track_requests_archive"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        index=True,
+    )
+    query_text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(),
+        server_default=func.now(),
+        nullable=False,
     )
@@ -0,0 +1,77 @@
+"""
+Модуль `query_hit_rate.py` — оценка доли попаданий в кэш при нормализации запросов.
+
+Сравнивает количество уникальных ключей кэша при использовании исходного текста запроса
+и нормализованного (`QueryNormalizer`). Доля попаданий оценивается как `1 - ключи / поиски`:
+каждый уникальный ключ промахивается один раз, остальные обращения к нему — попадания.
+
+Источник запросов — файл с записанной выборкой (один запрос на строку) или таблица `track_requests`.
+
+Запуск: `make query-hit-rate [файл]` или `python -m src.domains.tracks.track_request.query_hit_rate [файл]`.
+"""
+
+import asyncio
+import logging
+import sys
+from collections import Counter
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from src.domains.tracks.query_normalizer import QueryNormalizer
+from src.domains.tracks.track_request.repository import TrackRequestRepository
+from src.service.di.containers import create_container
+from src.service.settings.logger.logger_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+async def _iter_sample(sample_path: Path) -> AsyncIterator[tuple[str, int]]:
+    """
+    Читает записанную выборку запросов.
+
+    :param sample_path: Путь к файлу, по одному запросу на строку.
+    :return: Асинхронный итератор пар (текст запроса, количество).
+    """
+    lines = await asyncio.to_thread(sample_path.read_text, encoding="utf-8")
+    for query_text, count in Counter(x for x in lines.splitlines() if x.strip()).items():
+        yield query_text, count
+
+
+async def estimate_hit_rate(sample_path: Path | None = None) -> None:
+    """
+    Выводит в лог оценку доли попаданий в кэш для исходных и нормализованных ключей.
+
+    :param sample_path: (Опционально) Путь к файлу с выборкой; по умолчанию — данные `track_requests`.
+    """
+    container = create_container()
+    try:
+        normalizer = await container.get(QueryNormalizer)
+        if sample_path is None:
+            repository = await container.get(TrackRequestRepository)
+            counts = repository.iter_query_counts()
+        else:
+            counts = _iter_sample(sample_path)
+
+        total = 0
+        raw_keys: set[str] = set()
+        normalized_keys: set[str] = set()
+        async for query_text, count in counts:
+            total += count
+            raw_keys.add(query_text)
+            normalized_keys.add(normalizer.normalize(query_text))
+    finally:
+        await container.close()
+
+    if not total:
+        logger.info("Нет запросов для оценки")
+        return
+    logger.info(f"Поисков: {total}")
+    logger.info(f"Исходный текст: {len(raw_keys)} ключей, доля попаданий {1 - len(raw_keys) / total:.1%}")
+    logger.info(
+        f"Нормализованный текст: {len(normalized_keys)} ключей, доля попаданий {1 - len(normalized_keys) / total:.1%}",
+    )
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(estimate_hit_rate(Path(sys.argv[1]) if len(sys.argv) > 1 else None))
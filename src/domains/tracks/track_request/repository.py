@@ -4,20 +4,24 @@
 Обеспечивает операции:
 - вставки новых поисковых запросов пользователей;
 - получения истории запросов конкретного пользователя;
-- получения топ-запросов из всей системы.
+- подсчёта запросов для пересборки рейтинга популярных запросов;
+- подбора подсказок по похожим запросам (триграммный индекс `pg_trgm`);
+- переноса давно не повторявшихся запросов в архив.
 """
 
-from collections.abc import Callable, Sequence
+from collections.abc import AsyncIterator, Callable, Sequence
 from dataclasses import dataclass
+from datetime import datetime
 
-from sqlalchemy import Result, desc, func, select
+from sqlalchemy import Result, delete, func, literal_column, or_, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domains.tracks.track_request.models import TrackRequest
+from src.domains.tracks.track_request.models import TrackRequest, TrackRequestArchive
 from src.domains.tracks.track_request.schemas import (
     TrackRequestSchema,
 )
+from src.service.database.pagination import KeysetPage, PageCursor, apply_keyset, build_page
 
 
 @dataclass
@@ -28,7 +32,8 @@ class TrackRequestRepository:
     Предоставляет методы для:
     - вставки новых запросов на треки;
     - получения истории запросов пользователя;
-    - получения популярных запросов из всей системы.
+    - подсчёта запросов по тексту для рейтинга популярных запросов;
+    - подбора подсказок по похожим запросам.
     """
 
     session_factory: Callable[[], AsyncSession]
@@ -47,18 +52,15 @@ class TrackRequestRepository:
         :raises Exception: При ошибке выполнения запроса откатывает транзакцию и выбрасывает исключение.
         """
         async with self.session_factory() as session:
-            stmt = (
-                insert(TrackRequest)
-                .values(
-                    user_id=track_request_data.user_id,
-                    query_text=track_request_data.query_text,
-                )
-                .on_conflict_do_update(
-                    index_elements=["user_id", "query_text"],
-                    set_={"updated_at": func.now()},
-                )
-                .returning(TrackRequest.id)
+            stmt = insert(TrackRequest).values(
+                user_id=track_request_data.user_id,
+                query_text=track_request_data.query_text,
             )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "query_text"],
+                # Время приложения, как и при вставке (default `Base.updated_at`)
+                set_={"updated_at": stmt.excluded.updated_at},
+            ).returning(TrackRequest.id)
             try:
                 result = await session.execute(stmt)
             except Exception:
@@ -68,27 +70,77 @@ class TrackRequestRepository:
                 await session.commit()
                 return result
 
-    async def get_track_user_request(self, user_id: int) -> Sequence[TrackRequest]:
+    async def insert_track_requests(
+        self,
+        track_requests: Sequence[TrackRequestSchema],
+    ) -> list[str]:
+        """
+        Вставляет пачку запросов на треки одним многострочным upsert-ом.
+
+        Повторы внутри пачки схлопываются: `ON CONFLICT DO UPDATE` не может затронуть одну строку дважды.
+
+        :param track_requests: Данные запросов (ID пользователя и текст запроса).
+        :return: Тексты запросов, для которых была создана новая строка (а не обновлена существующая).
+        :raises Exception: При ошибке выполнения запроса откатывает транзакцию и выбрасывает исключение.
+        """
+        unique_requests = {(x.user_id, x.query_text): x for x in track_requests}
+        if not unique_requests:
+            return []
+
+        async with self.session_factory() as session:
+            stmt = insert(TrackRequest).values([x.model_dump() for x in unique_requests.values()])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "query_text"],
+                set_={"updated_at": stmt.excluded.updated_at},
+            )
+            # xmax = 0 только у строк, вставленных этой командой
+            stmt = stmt.returning(TrackRequest.query_text, literal_column("(xmax = 0)").label("inserted"))
+            try:
+                result = await session.execute(stmt)
+                rows = result.all()
+            except Exception:
+                await session.rollback()
+                raise
+            else:
+                await session.commit()
+                return [row.query_text for row in rows if row.inserted]
+
+    async def get_track_user_request_page(
+        self,
+        user_id: int,
+        cursor: PageCursor | None,
+        page_size: int,
+    ) -> KeysetPage[TrackRequestSchema]:
         """
-        Получает последние 12 запросов на треки, связанных с указанным пользователем.
+        Получает одну страницу запросов на треки пользователя (keyset по `(updated_at, id)`).
 
         :param user_id: ID пользователя.
-        :return: Список объектов `TrackRequest`, отсортированных по дате (самые новые первыми).
+        :param cursor: Курсор страницы или `None` для первой страницы.
+        :param page_size: Размер страницы.
+        :return: Страница объектов `TrackRequestSchema`, самые свежие первыми.
         """
         async with self.session_factory() as session:
-            stmt = select(TrackRequest).where(TrackRequest.user_id == user_id).order_by(desc(TrackRequest.id)).limit(12)
+            stmt = select(
+                TrackRequest.id,
+                TrackRequest.user_id,
+                TrackRequest.query_text,
+                TrackRequest.updated_at,
+            ).where(TrackRequest.user_id == user_id)
+            stmt = apply_keyset(stmt, TrackRequest.updated_at, TrackRequest.id, cursor, page_size)
             query_result = await session.execute(stmt)
-            return query_result.scalars().all()
+            return build_page(query_result.all(), cursor, page_size).map(
+                lambda x: TrackRequestSchema(user_id=x.user_id, query_text=x.query_text),
+            )
 
-    async def get_track_request(
-        self,
-    ) -> Sequence[tuple[str, int]]:
+    async def iter_query_counts(self, batch_size: int = 1000) -> AsyncIterator[tuple[str, int]]:
         """
-        Получает 12 самых популярных запросов на треки в системе.
+        Потоково подсчитывает количество запросов по каждому тексту.
 
-        Группирует запросы по тексту и сортирует их по количеству повторений (от большего к меньшему).
+        Используется только для разовой пересборки рейтинга популярных запросов:
+        при обычной работе рейтинг обновляется инкрементально.
 
-        :return: Список кортежей (текст_запроса, количество_повторений).
+        :param batch_size: Количество строк, забираемых с сервера за раз.
+        :return: Асинхронный итератор пар (текст запроса, количество).
         """
         async with self.session_factory() as session:
             stmt = (
@@ -97,8 +149,99 @@ class TrackRequestRepository:
                     func.count(TrackRequest.id).label("count"),
                 )
                 .group_by(TrackRequest.query_text)
-                .order_by(desc("count"))
-                .limit(12)
+                .execution_options(yield_per=batch_size)
+            )
+            query_result = await session.stream(stmt)
+            async for query_text, count in query_result:
+                yield query_text, count
+
+    async def suggest_queries(
+        self,
+        query_text: str,
+        limit: int,
+        min_users: int,
+        statement_timeout_ms: int = 50,
+    ) -> list[str]:
+        """
+        Подбирает ранее искавшиеся запросы, похожие на введённый текст.
+
+        Кандидаты — запросы, начинающиеся с введённого текста, или похожие на него по триграммам
+        (оператор `%`). Оба условия обслуживаются GIN-индексом `ix_track_requests_query_text_trgm`.
+        Предлагаются только запросы, которые искали не меньше `min_users` пользователей: так в подсказки
+        не попадают случайные и личные тексты отдельных пользователей.
+        Сортировка — по степени сходства, затем по количеству пользователей, искавших запрос.
+        Время выполнения ограничено `statement_timeout` на уровне транзакции.
+
+        :param query_text: Введённый пользователем текст.
+        :param limit: Максимальное количество подсказок.
+        :param min_users: Минимальное количество пользователей, искавших запрос.
+        :param statement_timeout_ms: Ограничение времени выполнения запроса в миллисекундах.
+        :return: Тексты подсказок, без самого введённого текста.
+        """
+        escaped = query_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        similarity = func.similarity(TrackRequest.query_text, query_text)
+        stmt = (
+            select(TrackRequest.query_text)
+            .where(
+                or_(
+                    TrackRequest.query_text.op("%")(query_text),
+                    TrackRequest.query_text.ilike(f"{escaped}%", escape="\\"),
+                ),
+                func.lower(TrackRequest.query_text) != query_text.lower(),
+            )
+            .group_by(TrackRequest.query_text)
+            # Пара (user_id, query_text) уникальна, поэтому число строк равно числу пользователей
+            .having(func.count(TrackRequest.id) >= min_users)
+            .order_by(similarity.desc(), func.count(TrackRequest.id).desc())
+            .limit(limit)
+        )
+        async with self.session_factory() as session:
+            await session.execute(
+                select(func.set_config("statement_timeout", f"{statement_timeout_ms}ms", True)),  # noqa: FBT003
             )
             query_result = await session.execute(stmt)
-            return query_result.scalars().all()
+            return list(query_result.scalars().all())
+
+    async def archive_stale_requests(self, older_than: datetime, batch_size: int) -> int:
+        """
+        Переносит в архив одну пачку запросов, не обновлявшихся с указанного момента.
+
+        Выполняется одной короткой транзакцией: `DELETE ... RETURNING` внутри CTE и `INSERT ... SELECT`
+        в архив. Строки выбираются с `FOR UPDATE SKIP LOCKED`, поэтому конкурентные upsert-ы
+        не ждут задачу переноса, а заблокированные ими строки переносятся в следующий раз.
+
+        :param older_than: Граница: переносятся строки с `updated_at` раньше неё.
+        :param batch_size: Максимальное количество строк в пачке.
+        :return: Количество перенесённых строк.
+        """
+        async with self.session_factory() as session:
+            stale_ids = (
+                select(TrackRequest.id)
+                .where(TrackRequest.updated_at < older_than)
+                .order_by(TrackRequest.updated_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            moved = (
+                delete(TrackRequest)
+                .where(TrackRequest.id.in_(stale_ids.scalar_subquery()))
+                .returning(
+                    TrackRequest.id,
+                    TrackRequest.user_id,
+                    TrackRequest.query_text,
+                    TrackRequest.updated_at,
+                )
+                .cte("moved")
+            )
+            stmt = insert(TrackRequestArchive).from_select(
+                ["id", "user_id", "query_text", "updated_at"],
+                select(moved.c.id, moved.c.user_id, moved.c.query_text, moved.c.updated_at),
+            )
+            try:
+                result = await session.execute(stmt)
+            except Exception:
+                await session.rollback()
+                raise
+            else:
+                await session.commit()
+                return result.rowcount
@@ -0,0 +1,82 @@
+"""
+Модуль `retention.py` содержит фоновую задачу переноса старых поисковых запросов в архив.
+
+Таблица `track_requests` — журнал с upsert-ом по `(user_id, query_text)`, который без ограничений
+растёт вместе с уникальным индексом. Запросы, не повторявшиеся дольше срока хранения, переносятся
+в `track_requests_archive` небольшими пачками — каждая в своей короткой транзакции, — поэтому
+история и upsert-ы работают только с актуальной частью данных.
+
+После переноса рейтинг популярных запросов за всё время обрезается до заданного размера,
+а из хэша для показа удаляются тексты запросов, выпавших из всех рейтингов.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.domains.tracks.track_request.cache_repository import TrackRequestLeaderboardRepository
+from src.domains.tracks.track_request.repository import TrackRequestRepository
+from src.service.settings.config import RetentionSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackRequestRetentionJob:
+    """
+    Периодический перенос старых поисковых запросов в архив.
+
+    :ivar repository: Репозиторий поисковых запросов.
+    :ivar settings: Настройки срока хранения, размера пачки и интервала запуска.
+    :ivar leaderboard: (Опционально) Рейтинг популярных запросов, который обрезается вместе с хэшем для показа.
+    :ivar batch_pause: Пауза между пачками (сек), чтобы не занимать БД подряд.
+    """
+
+    repository: TrackRequestRepository
+    settings: RetentionSettings
+    leaderboard: TrackRequestLeaderboardRepository | None = None
+    batch_pause: float = 0.1
+
+    async def run_once(self) -> int:
+        """
+        Переносит в архив все устаревшие запросы пачками по `batch_size`.
+
+        :return: Общее количество перенесённых строк.
+        """
+        # updated_at хранится без часового пояса в локальном времени сервера
+        older_than = datetime.now() - timedelta(days=self.settings.track_requests_days)  # noqa: DTZ005
+        total = 0
+        while True:
+            moved = await self.repository.archive_stale_requests(older_than, self.settings.batch_size)
+            total += moved
+            if moved < self.settings.batch_size:
+                return total
+            await asyncio.sleep(self.batch_pause)
+
+    async def run(self) -> None:
+        """
+        Запускает бесконечный цикл переноса с интервалом `interval`.
+
+        После каждого прохода обрезается рейтинг популярных запросов за всё время и очищается
+        его хэш для показа.
+        Ошибка одного прохода логгируется и не останавливает цикл.
+        """
+        while True:
+            try:
+                total = await self.run_once()
+            except Exception:
+                logger.exception("Ошибка переноса поисковых запросов в архив")
+            else:
+                if total:
+                    logger.info(f"Перенесено в архив поисковых запросов: {total}")
+            if self.leaderboard is not None:
+                try:
+                    trimmed = await self.leaderboard.trim_all_time()
+                    pruned = await self.leaderboard.prune_display()
+                except Exception:
+                    logger.exception("Ошибка обрезки рейтинга популярных запросов")
+                else:
+                    if trimmed or pruned:
+                        logger.info(f"Удалено из рейтинга за всё время: {trimmed}, текстов запросов: {pruned}")
+            await asyncio.sleep(self.settings.interval)
@@ -21,3 +21,14 @@ class TrackRequestSchema(BaseModel):
 
     user_id: int
     query_text: str
+
+
+class PopularQuerySchema(BaseModel):
+    """
+    Модель данных популярного поискового запроса.
+
+    Используется для отображения рейтинга запросов за всё время, день или неделю.
+    """
+
+    query_text: str
+    count: int
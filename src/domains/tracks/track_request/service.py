@@ -4,21 +4,36 @@
 Обеспечивает функциональность:
 - сохранения истории поисковых запросов пользователей;
 - получения списка запросов конкретного пользователя;
-- получения топ-запросов из всей системы.
+- получения топ-запросов из всей системы (рейтинг в Redis);
+- подсказок по похожим ранее искавшимся запросам.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 
+from src.domains.tracks.track_request.cache_repository import (
+    LeaderboardPeriod,
+    TrackRequestLeaderboardRepository,
+)
 from src.domains.tracks.track_request.repository import (
     TrackRequestRepository,
 )
 from src.domains.tracks.track_request.schemas import (
+    PopularQuerySchema,
     TrackRequestSchema,
 )
+from src.domains.tracks.track_request.write_buffer import TrackRequestWriteBuffer
+from src.service.database.pagination import KeysetPage, PageCursor
 
 logger = logging.getLogger(__name__)
 
+# Подсказки не должны задерживать поиск: при превышении бюджета поиск идёт без них
+SUGGESTIONS_TIMEOUT = 0.1
+SUGGESTIONS_MIN_QUERY_LENGTH = 3
+# Запросы, которые искали меньше пользователей, в подсказки других пользователей не попадают
+SUGGESTIONS_MIN_USERS = 3
+
 
 @dataclass
 class TrackRequestService:
@@ -28,59 +43,110 @@ class TrackRequestService:
     Обеспечивает операции:
     - вставки нового запроса пользователя;
     - получения всех запросов конкретного пользователя;
-    - получения топ-запросов из всей системы.
+    - получения топ-запросов из всей системы;
+    - подсказок по похожим запросам.
     """
 
     track_request_repository: TrackRequestRepository
+    write_buffer: TrackRequestWriteBuffer
+    leaderboard_repository: TrackRequestLeaderboardRepository
 
     async def insert_track_request(self, user_id: int, query_text: str) -> None:
         """
-        Сохраняет новый запрос пользователя в базу данных.
+        Ставит новый запрос пользователя в очередь на сохранение в базу данных.
+
+        Запись выполняется фоновым буфером пачками и не задерживает поиск.
 
         :param user_id: ID пользователя, отправившего запрос.
         :param query_text: Текст поискового запроса.
-        :raises Exception: Передаёт ошибки из репозитория при неудачной вставке.
         """
         logger.info(f"Inserting track request {query_text}")
-        try:
-            await self.track_request_repository.insert_track_request(
-                TrackRequestSchema(user_id=user_id, query_text=query_text),
-            )
-        except Exception as e:
-            logger.exception(f"Failed to insert track request {query_text}: {e}")  # noqa: TRY401
-            raise
+        self.write_buffer.put(TrackRequestSchema(user_id=user_id, query_text=query_text))
 
-    async def get_track_user_request(self, user_id: int) -> list[TrackRequestSchema]:
+    async def get_track_user_request(
+        self,
+        user_id: int,
+        cursor: PageCursor | None = None,
+        page_size: int = 4,
+    ) -> KeysetPage[TrackRequestSchema]:
         """
-        Получает список всех поисковых запросов конкретного пользователя.
+        Получает одну страницу поисковых запросов конкретного пользователя.
 
         :param user_id: ID пользователя.
-        :return: Список объектов `TrackRequestSchema`.
+        :param cursor: Курсор страницы или `None` для первой страницы.
+        :param page_size: Размер страницы.
+        :return: Страница объектов `TrackRequestSchema`.
         :raises Exception: Передаёт ошибки из репозитория при неудачном получении.
         """
         logger.info(f"Getting track request {user_id}")
         try:
-            track_requests = await self.track_request_repository.get_track_user_request(
+            return await self.track_request_repository.get_track_user_request_page(
                 user_id,
+                cursor,
+                page_size,
             )
         except Exception as e:
             logger.exception(f"Failed to get track request {user_id}: {e}")  # noqa: TRY401
             raise
-        else:
-            return [TrackRequestSchema(user_id=x.user_id, query_text=x.query_text) for x in track_requests]
 
-    async def get_track_request(self) -> list[TrackRequestSchema]:
+    async def get_track_request(
+        self,
+        period: LeaderboardPeriod = LeaderboardPeriod.ALL,
+        limit: int = 12,
+    ) -> list[PopularQuerySchema]:
         """
         Получает топ-запросы поиска из всей системы.
 
-        :return: Список объектов `TrackRequestSchema`.
+        :param period: Период рейтинга: за всё время, за сегодня или за неделю.
+        :param limit: Количество запросов.
+        :return: Список объектов `PopularQuerySchema`.
         :raises Exception: Передаёт ошибки из репозитория при неудачном получении.
         """
-        logger.info("Getting top track request")
+        logger.info(f"Getting top track request for {period}")
         try:
-            track_requests = await self.track_request_repository.get_track_request()
+            track_requests = await self.leaderboard_repository.top(period, limit)
         except Exception as e:
             logger.exception(f"Failed to get top track request: {e}")  # noqa: TRY401
             raise
         else:
-            return [TrackRequestSchema.model_validate(x[0]) for x in track_requests]
+            return [PopularQuerySchema(query_text=query_text, count=count) for query_text, count in track_requests]
+
+    async def suggest_queries(self, query_text: str, limit: int = 3) -> list[str]:
+        """
+        Подбирает похожие запросы, которые уже искали другие пользователи.
+
+        Предлагаются только запросы, которые искали не меньше `SUGGESTIONS_MIN_USERS` пользователей.
+        Подсказки необязательны: при слишком коротком тексте, ошибке или превышении
+        `SUGGESTIONS_TIMEOUT` возвращается пустой список, а поиск продолжается без них.
+
+        :param query_text: Введённый пользователем текст.
+        :param limit: Максимальное количество подсказок.
+        :return: Тексты подсказок.
+        """
+        query_text = query_text.strip()
+        if len(query_text) < SUGGESTIONS_MIN_QUERY_LENGTH:
+            return []
+
+        try:
+            async with asyncio.timeout(SUGGESTIONS_TIMEOUT):
+                return await self.track_request_repository.suggest_queries(
+                    query_text,
+                    limit,
+                    min_users=SUGGESTIONS_MIN_USERS,
+                )
+        except TimeoutError:
+            logger.warning(f"Query suggestions for '{query_text}' timed out")
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Failed to get query suggestions for '{query_text}': {e}")
+        return []
+
+    async def backfill_leaderboard(self) -> int:
+        """
+        Пересобирает рейтинг за всё время по данным таблицы `track_requests`.
+
+        :return: Количество запросов в рейтинге.
+        """
+        logger.info("Backfilling popular queries leaderboard")
+        return await self.leaderboard_repository.replace_all_time(
+            self.track_request_repository.iter_query_counts(),
+        )
@@ -0,0 +1,155 @@
+"""
+Модуль `write_buffer.py` содержит буфер отложенной записи поисковых запросов (write-behind).
+
+Запросы пользователей складываются в ограниченную очередь в памяти процесса, а фоновая задача
+сбрасывает их в БД пачками — одним многострочным upsert-ом каждые `flush_interval` секунд
+или по накоплении `batch_size` записей. Поиск трека больше не ждёт транзакцию Postgres.
+После успешной записи пачки обновляется рейтинг популярных запросов в Redis.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+
+from src.domains.tracks.track_request.cache_repository import TrackRequestLeaderboardRepository
+from src.domains.tracks.track_request.repository import TrackRequestRepository
+from src.domains.tracks.track_request.schemas import TrackRequestSchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackRequestWriteBuffer:
+    """
+    Буфер отложенной пакетной записи поисковых запросов.
+
+    При переполнении очереди новые записи отбрасываются (история запросов не критична),
+    а счётчик `dropped` увеличивается.
+
+    :ivar repository: Репозиторий для записи запросов в БД.
+    :ivar leaderboard: (Опционально) Рейтинг популярных запросов, обновляемый после записи.
+    :ivar max_size: Максимальное количество записей, ожидающих сброса.
+    :ivar batch_size: Максимальное количество записей в одном upsert-е.
+    :ivar flush_interval: Максимальное время (сек) ожидания накопления пачки.
+    :ivar dropped: Количество записей, отброшенных из-за переполнения.
+    :ivar failed: Количество записей, которые не удалось сохранить.
+    :ivar flushed: Количество записей, сохранённых в БД.
+    :ivar last_flush_latency: Длительность последнего сброса (сек).
+    """
+
+    repository: TrackRequestRepository
+    leaderboard: TrackRequestLeaderboardRepository | None = None
+    max_size: int = 10_000
+    batch_size: int = 200
+    flush_interval: float = 0.5
+    dropped: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+    flushed: int = field(default=0, init=False)
+    last_flush_latency: float = field(default=0.0, init=False)
+    _queue: asyncio.Queue[TrackRequestSchema] = field(init=False, repr=False)
+    _batch: list[TrackRequestSchema] = field(default_factory=list, init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _stopping: bool = field(default=False, init=False, repr=False)
+    _flushing: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self):
+        """Создаёт ограниченную очередь записей."""
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+
+    @property
+    def depth(self) -> int:
+        """Количество записей, ожидающих сброса в БД."""
+        return self._queue.qsize() + len(self._batch)
+
+    def start(self) -> None:
+        """Запускает фоновую задачу сброса буфера."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def put(self, track_request: TrackRequestSchema) -> bool:
+        """
+        Добавляет запрос в буфер без ожидания.
+
+        :param track_request: Данные поискового запроса.
+        :return: `True`, если запись принята, `False`, если буфер переполнен.
+        """
+        try:
+            self._queue.put_nowait(track_request)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Буфер поисковых запросов переполнен, запись отброшена: {track_request}")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        """Собирает пачки записей из очереди и сбрасывает их в БД, пока буфер не закрывается."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            self._flushing = True
+            try:
+                await self._flush(self._batch)
+            finally:
+                self._flushing = False
+            self._batch = []
+
+    async def _flush(self, batch: list[TrackRequestSchema]) -> None:
+        """
+        Сохраняет пачку записей одним многострочным upsert-ом.
+
+        :param batch: Записи для сохранения.
+        """
+        started = time.perf_counter()
+        try:
+            new_queries = await self.repository.insert_track_requests(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception(f"Не удалось сохранить {len(batch)} поисковых запросов")
+            return
+        finally:
+            self.last_flush_latency = time.perf_counter() - started
+
+        self.flushed += len(batch)
+        logger.debug(
+            f"Сохранено {len(batch)} поисковых запросов за {self.last_flush_latency:.3f} сек, в буфере {self.depth}",
+        )
+
+        if self.leaderboard is not None:
+            try:
+                await self.leaderboard.record(new_queries, [x.query_text for x in batch])
+            except Exception:
+                logger.exception("Не удалось обновить рейтинг популярных запросов")
+
+    async def close(self) -> None:
+        """
+        Останавливает фоновую задачу и сбрасывает в БД все накопленные записи.
+
+        Идущий сброс пачки не прерывается: иначе отмена после успешного upsert-а, но до обновления
+        рейтинга, привела бы к повторной записи и повторному учёту той же пачки. Задача, ожидающая
+        записи в очереди, отменяется — собранные ею записи остаются в `_batch` и сбрасываются ниже.
+        """
+        self._stopping = True
+        if self._task is not None:
+            if not self._flushing:
+                self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        pending, self._batch = self._batch, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+
+        for start in range(0, len(pending), self.batch_size):
+            await self._flush(pending[start : start + self.batch_size])
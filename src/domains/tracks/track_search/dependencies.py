@@ -17,7 +17,7 @@ class TrackSearchProvider(Provider):
     - `TrackSearchService` — для работы с поиском и обработкой треков.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_service(
         self,
     ) -> TrackSearchService:
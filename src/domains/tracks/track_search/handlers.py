@@ -129,7 +129,7 @@ async def request_skip_repo(  # noqa: PLR0913
     """
     Обработчик для пропуска текущего источника поиска.
 
-    Извлекает алиас репозитория из данных callback и продолжает поиск, исключая этот источник.
+    Извлекает алиасы уже опрошенных репозиториев из данных callback и продолжает поиск, исключая их.
 
     :param callback: CallbackQuery от нажатия кнопки "Следующий источник".
     :param bot: Экземпляр бота Aiogram.
@@ -139,7 +139,7 @@ async def request_skip_repo(  # noqa: PLR0913
     :param user_service: Сервис для работы с пользователями.
     """
     await callback.answer()
-    skip_repo = callback.data.split(":")[-1]
+    skip_repo_aliases = callback.data.split(":")[-1].split(",")
     query_text = await user_service.get_session_query_text(callback.from_user.id)
     await track_search_service.handle_search_results(
         bot=bot,
@@ -149,5 +149,5 @@ async def request_skip_repo(  # noqa: PLR0913
         query_text=query_text,
         user_id=callback.from_user.id,
         chat_id=callback.message.chat.id,
-        skip_repo_alias=skip_repo,
+        skip_repo_aliases=skip_repo_aliases,
     )
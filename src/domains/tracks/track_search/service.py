@@ -8,16 +8,20 @@
 - взаимодействия с сервисами загрузки и сохранения запросов.
 """
 
+import asyncio
 import logging
+from collections.abc import Collection
 from dataclasses import dataclass
 
 from aiogram import Bot
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramAPIError
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
 from src.domains.tracks.keyboards import (
     break_processing,
+    get_query_suggestions_kb,
     get_retry_search_kb,
     kb_track_list,
 )
@@ -109,11 +113,18 @@ class TrackSearchService:
         query_text: str,
         user_id: int,
         chat_id: int,
-        skip_repo_alias: str | None = None,
+        skip_repo_aliases: Collection[str] = (),
     ) -> None:
         """
         Обрабатывает результаты поиска треков и отображает их пользователю.
 
+        Параллельно с поиском подбираются похожие запросы других пользователей. Они отправляются
+        отдельным сообщением, как только найдены, — ещё во время поиска в источниках, — чтобы можно
+        было сразу выбрать уже искавшийся (и, скорее всего, закэшированный) запрос. Когда показаны
+        результаты или экран «ничего не найдено», это сообщение удаляется. При переходе
+        к следующему источнику подсказки повторно не отправляются, а остаются только на экране
+        «ничего не найдено».
+
         :param bot: Экземпляр бота Aiogram.
         :param event: Событие (CallbackQuery или Message).
         :param downloader_service: Сервис для загрузки треков.
@@ -121,8 +132,19 @@ class TrackSearchService:
         :param query_text: Текст запроса пользователя.
         :param user_id: ID пользователя.
         :param chat_id: ID чата.
-        :param skip_repo_alias: Алиас репозитория, который нужно пропустить при поиске.
+        :param skip_repo_aliases: Алиасы репозиториев, которые нужно пропустить при поиске.
         """
+        search_done = asyncio.Event()
+        suggestions_task = asyncio.create_task(
+            self.show_suggestions(
+                bot=bot,
+                track_request_service=track_request_service,
+                query_text=query_text,
+                chat_id=chat_id,
+                send=not skip_repo_aliases,
+                search_done=search_done,
+            ),
+        )
         try:
             await track_request_service.insert_track_request(
                 user_id=user_id,
@@ -133,11 +155,13 @@ class TrackSearchService:
                 phrase=query_text,
                 bot=bot,
                 chat_id=chat_id,
-                skip_repo_alias=skip_repo_alias,
+                skip_repo_aliases=skip_repo_aliases,
             )
 
             if not find_tracks:
-                await self.show_no_tracks_found(event)
+                search_done.set()
+                suggestions, _ = await suggestions_task
+                await self.show_no_tracks_found(event, suggestions)
                 return
 
             message_text = f"""
@@ -162,20 +186,83 @@ class TrackSearchService:
         except Exception as e:
             logger.exception(f"Ошибка при обработке результатов поиска: {e}")  # noqa: TRY401
             await self.show_error_message(event)
+        finally:
+            search_done.set()
+            await self.drop_suggestions_message(suggestions_task)
+
+    @staticmethod
+    async def show_suggestions(  # noqa: PLR0913
+        bot: Bot,
+        track_request_service: TrackRequestService,
+        query_text: str,
+        chat_id: int,
+        *,
+        send: bool,
+        search_done: asyncio.Event,
+    ) -> tuple[list[str], Message | None]:
+        """
+        Подбирает похожие запросы и отправляет их кнопками, не дожидаясь результатов поиска.
+
+        Сообщение отправляется, только если поиск ещё идёт и хотя бы одна подсказка поместилась
+        в кнопку. Ошибка отправки не прерывает поиск: подсказки необязательны.
+
+        :param bot: Экземпляр бота Aiogram.
+        :param track_request_service: Сервис для работы с запросами на поиск.
+        :param query_text: Текст запроса пользователя.
+        :param chat_id: ID чата.
+        :param send: Отправлять ли сообщение с подсказками.
+        :param search_done: Событие завершения поиска; после него сообщение уже не отправляется.
+        :return: Тексты подсказок и отправленное сообщение (или `None`).
+        """
+        suggestions = await track_request_service.suggest_queries(query_text)
+        keyboard = await get_query_suggestions_kb(suggestions)
+        if not send or not keyboard.inline_keyboard or search_done.is_set():
+            return suggestions, None
+        try:
+            message = await bot.send_message(
+                chat_id=chat_id,
+                text="💡 Пока идёт поиск, можно выбрать похожий запрос, который уже искали:",
+                reply_markup=keyboard,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Не удалось отправить подсказки в чат {chat_id}: {e}")
+            return suggestions, None
+        return suggestions, message
+
+    @staticmethod
+    async def drop_suggestions_message(suggestions_task: asyncio.Task) -> None:
+        """
+        Дожидается подбора подсказок и удаляет сообщение с ними, если оно было отправлено.
+
+        :param suggestions_task: Задача `show_suggestions`.
+        """
+        try:
+            _, message = await suggestions_task
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Не удалось подобрать подсказки: {e}")
+            return
+        if message is None:
+            return
+        try:
+            await message.delete()
+        except TelegramAPIError as e:
+            logger.warning(f"Не удалось удалить подсказки в чате {message.chat.id}: {e}")
 
     @staticmethod
     async def show_no_tracks_found(
         event: CallbackQuery | Message,
+        suggestions: list[str] | None = None,
     ) -> None:
         """
         Отправляет сообщение о том, что треки не найдены.
 
         :param event: Событие (CallbackQuery или Message).
+        :param suggestions: Тексты подсказок по похожим запросам.
         """
         message = event.message if isinstance(event, CallbackQuery) else event
         await message.edit_text(
             "😔 Песни не найдены.\nПопробуйте что-то другое или уточните поисковой запрос.",
-            reply_markup=await get_retry_search_kb(),
+            reply_markup=await get_retry_search_kb(suggestions),
         )
 
     @staticmethod
@@ -2,27 +2,58 @@
 Модуль `cache_repository.py` содержит реализацию кэширующего репозитория для пользователей.
 
 Работает с Redis и предоставляет функциональность хранения и получения данных о частях названий треков,
-связанных с конкретным пользователем.
+связанных с конкретным пользователем, а также сессионных данных пользователя.
+
+Список частей названий треков кэшируется по принципу write-through: новые записи переносятся
+в начало закэшированного списка сразу после вставки в БД, а TTL продлевается при каждом чтении.
+
+Все сессионные поля пользователя (название трека, текст запроса) хранятся в одном хэше
+`session:{user_id}` с общим TTL, который продлевается при каждой записи.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from redis.asyncio import Redis
 
 from src.domains.tracks.track_name.schemas import TrackNamePartSchema
 from src.service.cache.base_cache_repository import RedisClientWrapper
 
+# Поднимает часть названия трека в начало закэшированного списка, удаляя прежние записи с тем же ID.
+# KEYS[1] — список; ARGV[1] — новая запись (JSON), ARGV[2] — её ID, ARGV[3] — длина списка, ARGV[4] — TTL.
+PUSH_TRACK_NAME_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for _, item in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    if cjson.decode(item)['id'] == tonumber(ARGV[2]) then
+        redis.call('LREM', KEYS[1], 0, item)
+    end
+end
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('LTRIM', KEYS[1], 0, tonumber(ARGV[3]) - 1)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
 
 @dataclass
 class UserCacheRepository(RedisClientWrapper):
     """
     Класс-репозиторий для кэширования данных о пользователях в Redis.
 
-    Реализует операции хранения и получения списка частей названий треков, связанных с пользователем.
+    Реализует операции хранения и получения списка частей названий треков, связанных с пользователем,
+    и работу с хэшем сессии пользователя.
     """
 
     redis_client: Redis
+    auto_pipeline: bool = False
     user_track_names_key: str = "track_names:{user_id}"
+    user_session_key: str = "session:{user_id}"
+    session_ttl: int = 180
+    track_names_ttl: int = 6 * 60 * 60
+    max_track_names: int = 50
+    track_names_hits: int = field(default=0, init=False)
+    track_names_misses: int = field(default=0, init=False)
 
     def __post_init__(self):
         """
@@ -30,7 +61,14 @@ class UserCacheRepository(RedisClientWrapper):
 
         Обеспечивает корректное наследование функциональности работы с Redis.
         """
-        super().__init__(self.redis_client)
+        super().__init__(self.redis_client, auto_pipeline=self.auto_pipeline)
+        self._push_track_name_script = self.redis_client.register_script(PUSH_TRACK_NAME_SCRIPT)
+
+    @property
+    def track_names_hit_rate(self) -> float:
+        """Доля чтений списка частей названий треков, обслуженных из кэша."""
+        total = self.track_names_hits + self.track_names_misses
+        return self.track_names_hits / total if total else 0.0
 
     async def set_user_track_names(
         self,
@@ -40,32 +78,107 @@ class UserCacheRepository(RedisClientWrapper):
         """
         Сохраняет список частей названий треков пользователя в Redis.
 
+        Порядок элементов сохраняется (`RPUSH`): первым в списке остаётся самое свежее название.
+
         :param user_id: ID пользователя.
         :param track_names: Список объектов `TrackNamePartSchema`.
         """
-        track_names_json = [x.model_dump_json() for x in track_names]
-        async with self.redis_client.pipeline() as pipe:
+        track_names_json = [x.model_dump_json() for x in track_names[: self.max_track_names]]
+        async with self.pipeline() as pipe:
             key = self.user_track_names_key.format(user_id=user_id)
-            await pipe.delete(key)
-            await pipe.lpush(key, *track_names_json)
-            await pipe.expire(key, 30)
+            pipe.delete(key)
+            pipe.rpush(key, *track_names_json)
+            pipe.expire(key, self.track_names_ttl)
             await pipe.execute()
 
+    async def push_user_track_name(self, user_id: int, track_name: TrackNamePartSchema) -> None:
+        """
+        Поднимает часть названия трека в начало закэшированного списка.
+
+        Прежняя запись с тем же ID (с устаревшей датой использования) удаляется из списка.
+        Поиск прежней записи, вставка, обрезка списка и продление TTL выполняются одним Lua-скриптом,
+        поэтому конкурентные сохранения не теряют записи и не возвращают устаревшие.
+        Если список ещё не закэширован, он будет загружен из БД при следующем чтении —
+        уже вместе с новой записью.
+
+        :param user_id: ID пользователя.
+        :param track_name: Сохранённая в БД часть названия трека.
+        """
+        await self._push_track_name_script(
+            keys=[self.user_track_names_key.format(user_id=user_id)],
+            args=[track_name.model_dump_json(), track_name.id, self.max_track_names, self.track_names_ttl],
+        )
+
     async def get_user_track_names(
         self,
         user_id: int,
     ) -> list[TrackNamePartSchema] | None:
         """
-        Получает список частей названий треков пользователя из Redis.
+        Получает список частей названий треков пользователя из Redis и продлевает его TTL.
 
         :param user_id: ID пользователя.
         :return: Список объектов `TrackNamePartSchema` или `None`, если ключ не существует.
         """
         key = self.user_track_names_key.format(user_id=user_id)
-        if not await self.redis_client.exists(key):
+        async with self.pipeline() as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.expire(key, self.track_names_ttl)
+            track_names_json, _ = await pipe.execute()
+
+        # Пустой список в кэш не пишется, поэтому пустой ответ LRANGE означает отсутствие ключа
+        if not track_names_json:
+            self.track_names_misses += 1
             return None
 
-        async with self.redis_client.pipeline() as pipe:
-            await pipe.lrange(key, 0, -1)
-            response = await pipe.execute()
-            return [TrackNamePartSchema.model_validate_json(x.decode("utf8")) for x in response[0]]
+        self.track_names_hits += 1
+        return [TrackNamePartSchema.model_validate_json(x) for x in track_names_json]
+
+    async def set_session_fields(self, user_id: int, fields: dict[str, str]) -> None:
+        """
+        Записывает поля в хэш сессии пользователя и продлевает его TTL.
+
+        `HSET` и `EXPIRE` выполняются в одной транзакции — за один round trip.
+
+        :param user_id: ID пользователя.
+        :param fields: Поля сессии и их значения.
+        """
+        key = self.user_session_key.format(user_id=user_id)
+        async with self.pipeline() as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.session_ttl)
+            await pipe.execute()
+
+    async def get_session_field(self, user_id: int, field: str) -> str | None:
+        """
+        Получает поле из хэша сессии пользователя.
+
+        :param user_id: ID пользователя.
+        :param field: Имя поля.
+        :return: Значение поля или `None`, если сессия или поле отсутствуют.
+        """
+        return await self.hget(self.user_session_key.format(user_id=user_id), field)
+
+    async def del_session_fields(self, user_id: int, *fields: str) -> int:
+        """
+        Удаляет поля из хэша сессии пользователя.
+
+        :param user_id: ID пользователя.
+        :param fields: Имена удаляемых полей.
+        :return: Количество удалённых полей.
+        """
+        return await self.hdel(self.user_session_key.format(user_id=user_id), *fields)
+
+    async def pop_session_field(self, user_id: int, field: str) -> str | None:
+        """
+        Атомарно получает и удаляет поле из хэша сессии пользователя (`HGET` + `HDEL` в `MULTI`).
+
+        :param user_id: ID пользователя.
+        :param field: Имя поля.
+        :return: Значение поля или `None`, если сессия или поле отсутствуют.
+        """
+        key = self.user_session_key.format(user_id=user_id)
+        async with self.pipeline() as pipe:
+            pipe.hget(key, field)
+            pipe.hdel(key, field)
+            value, _ = await pipe.execute()
+        return self._decode(value)
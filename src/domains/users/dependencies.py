@@ -12,8 +12,10 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.domains.users.cache_repository import UserCacheRepository
+from src.domains.users.known_users import KnownUsersCache
 from src.domains.users.repository import UserRepository
 from src.domains.users.services import UserService
+from src.service.settings.config import Settings
 
 
 class UserProvider(Provider):
@@ -23,10 +25,11 @@ class UserProvider(Provider):
     Регистрирует:
     - `UserRepository` — для работы с базой данных;
     - `UserCacheRepository` — для хранения и получения данных в Redis;
+    - `KnownUsersCache` — для пропуска повторной регистрации известных пользователей;
     - `UserService` — для реализации бизнес-логики.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_user_repo(
         self,
         session_factory: FromDishka[async_sessionmaker],
@@ -39,33 +42,50 @@ class UserProvider(Provider):
         """
         return UserRepository(session_factory)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_user_cache_repo(
         self,
         redis_client: FromDishka[Redis],
+        settings: FromDishka[Settings],
     ) -> UserCacheRepository:
         """
         Возвращает экземпляр кэширующего репозитория для пользователей.
 
         :param redis_client: Асинхронный клиент Redis.
+        :param settings: Объект настроек (режим автопайплайнинга Redis).
         :return: Экземпляр `UserCacheRepository`.
         """
-        return UserCacheRepository(redis_client=redis_client)
+        return UserCacheRepository(
+            redis_client=redis_client,
+            auto_pipeline=settings.redis.auto_pipeline,
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_known_users(self) -> KnownUsersCache:
+        """
+        Возвращает единственный на процесс кэш известных пользователей.
+
+        :return: Экземпляр `KnownUsersCache`.
+        """
+        return KnownUsersCache()
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_service(
         self,
         user_repo: FromDishka[UserRepository],
         user_cache_repository: FromDishka[UserCacheRepository],
+        known_users: FromDishka[KnownUsersCache],
     ) -> UserService:
         """
         Возвращает экземпляр сервиса для работы с пользователями.
 
         :param user_repo: Репозиторий для работы с базой данных.
         :param user_cache_repository: Кэширующий репозиторий.
+        :param known_users: Кэш известных пользователей.
         :return: Экземпляр `UserService`.
         """
         return UserService(
             user_repository=user_repo,
             user_cache_repository=user_cache_repository,
+            known_users=known_users,
         )
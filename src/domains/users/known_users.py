@@ -0,0 +1,76 @@
+"""
+Модуль `known_users.py` содержит in-process кэш уже зарегистрированных пользователей.
+
+Кэш хранит для каждого ID последние известные никнейм, имя и фамилию. Если пользователь
+повторно вызывает `/start` с теми же данными, обращение к базе данных не требуется.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from src.domains.users.schemas import UsersSchema
+
+UserProfile = tuple[str | None, str | None, str | None]
+
+
+@dataclass
+class KnownUsersCache:
+    """
+    LRU-кэш профилей пользователей, уже сохранённых в базе данных.
+
+    Вместо фильтра Блума используется LRU: он хранит сами значения профиля
+    и позволяет заметить смену никнейма или имени.
+
+    :ivar maxsize: Максимальное количество пользователей в кэше.
+    :ivar hits: Количество проверок, для которых запись в БД не потребовалась.
+    :ivar misses: Количество проверок неизвестных или изменившихся пользователей.
+    """
+
+    maxsize: int = 100_000
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _profiles: OrderedDict[int, UserProfile] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def __len__(self) -> int:
+        """Возвращает количество пользователей в кэше."""
+        return len(self._profiles)
+
+    @property
+    def is_full(self) -> bool:
+        """Заполнен ли кэш до `maxsize`."""
+        return len(self._profiles) >= self.maxsize
+
+    @staticmethod
+    def _profile(user_data: UsersSchema) -> UserProfile:
+        """Формирует кортеж сравниваемых полей профиля."""
+        return user_data.username, user_data.first_name, user_data.last_name
+
+    def is_known(self, user_data: UsersSchema) -> bool:
+        """
+        Проверяет, что пользователь уже сохранён в БД с такими же данными.
+
+        :param user_data: Данные пользователя.
+        :return: `True`, если запись в БД не требует обновления.
+        """
+        profile = self._profiles.get(user_data.id)
+        if profile is None:
+            self.misses += 1
+            return False
+        self._profiles.move_to_end(user_data.id)
+        known = profile == self._profile(user_data)
+        if known:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return known
+
+    def remember(self, user_data: UsersSchema) -> None:
+        """
+        Запоминает актуальные данные пользователя, вытесняя самые давние записи при переполнении.
+
+        :param user_data: Данные пользователя.
+        """
+        self._profiles[user_data.id] = self._profile(user_data)
+        self._profiles.move_to_end(user_data.id)
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
@@ -5,16 +5,18 @@
 """
 
 import logging
-from collections.abc import Callable, Sequence
+from collections.abc import AsyncIterator, Callable, Sequence
 from dataclasses import dataclass
-from typing import Any
 
-from sqlalchemy import insert, select
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domains.tracks.track_name.models import TrackNameRegistry
+from src.domains.tracks.track_name.schemas import TrackNamePartSchema
 from src.domains.users.models import User
 from src.domains.users.schemas import UsersSchema
+from src.service.database.pagination import KeysetPage, PageCursor, apply_keyset, build_page
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +34,37 @@ class UserRepository:
 
     session_factory: Callable[[], AsyncSession]
 
-    async def insert_new_user(self, user_data: UsersSchema) -> None:
+    async def upsert_user(self, user_data: UsersSchema) -> None:
         """
-        Регистрация нового пользователя в базе данных.
+        Регистрирует пользователя или обновляет его никнейм и имя одним запросом.
+
+        Выполняется `INSERT ... ON CONFLICT (id) DO UPDATE`; строка перезаписывается,
+        только если данные действительно изменились.
 
         :param user_data: Данные пользователя.
         """
         async with self.session_factory() as session:
-            stmt = insert(User).values(
+            stmt = pg_insert(User).values(
                 id=user_data.id,
                 username=user_data.username,
                 first_name=user_data.first_name,
                 last_name=user_data.last_name,
             )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.id],
+                set_={
+                    "username": stmt.excluded.username,
+                    "first_name": stmt.excluded.first_name,
+                    "last_name": stmt.excluded.last_name,
+                    # Время приложения, как и при вставке (default `Base.updated_at`)
+                    "updated_at": stmt.excluded.updated_at,
+                },
+                where=or_(
+                    User.username.is_distinct_from(stmt.excluded.username),
+                    User.first_name.is_distinct_from(stmt.excluded.first_name),
+                    User.last_name.is_distinct_from(stmt.excluded.last_name),
+                ),
+            )
             try:
                 await session.execute(stmt)
             except Exception:
@@ -53,6 +73,28 @@ class UserRepository:
             else:
                 await session.commit()
 
+    async def iter_users(self, page_size: int = 1000) -> AsyncIterator[list[UsersSchema]]:
+        """
+        Постранично отдаёт пользователей, начиная с самых новых.
+
+        Страницы выбираются по ключу (`id < последний ID`), без `OFFSET`,
+        каждая страница — в отдельной короткой сессии.
+
+        :param page_size: Количество пользователей на странице.
+        :return: Асинхронный итератор страниц с данными пользователей.
+        """
+        last_id: int | None = None
+        while True:
+            stmt = select(User.id, User.username, User.first_name, User.last_name).order_by(User.id.desc())
+            if last_id is not None:
+                stmt = stmt.where(User.id < last_id)
+            async with self.session_factory() as session:
+                rows = (await session.execute(stmt.limit(page_size))).all()
+            if not rows:
+                return
+            yield [UsersSchema.model_validate(row) for row in rows]
+            last_id = rows[-1].id
+
     async def get_users(self) -> Sequence[User]:
         """
         Получает всех зарегистрированных пользователей.
@@ -92,43 +134,86 @@ class UserRepository:
     async def get_user_track_names(
         self,
         user_id: int,
-    ) -> Sequence[TrackNameRegistry] | list[Any]:
+        limit: int | None = None,
+    ) -> list[TrackNamePartSchema]:
         """
         Получает список частей названий треков, связанных с пользователем.
 
+        Выбираются только нужные колонки, без загрузки ORM-объектов и связанного пользователя.
+
         :param user_id: ID пользователя.
-        :return: Список объектов модели `TrackNameRegistry` или пустой список.
+        :param limit: (Опционально) Максимальное количество записей, самые свежие первыми.
+        :return: Список объектов `TrackNamePartSchema` или пустой список.
         """
         async with self.session_factory() as session:
             stmt = (
-                select(TrackNameRegistry)
+                select(
+                    TrackNameRegistry.id,
+                    TrackNameRegistry.track_part,
+                    TrackNameRegistry.updated_at,
+                )
                 .where(TrackNameRegistry.user_id == user_id)
-                .order_by(TrackNameRegistry.updated_at.desc())
+                .order_by(TrackNameRegistry.updated_at.desc(), TrackNameRegistry.id.desc())
+                .limit(limit)
             )
             result = await session.execute(stmt)
-            if result:
-                return result.scalars().all()
-            return []
+            return [TrackNamePartSchema.model_validate(row) for row in result.all()]
+
+    async def get_user_track_names_page(
+        self,
+        user_id: int,
+        cursor: PageCursor | None,
+        page_size: int,
+    ) -> KeysetPage[TrackNamePartSchema]:
+        """
+        Получает одну страницу частей названий треков пользователя (keyset по `(updated_at, id)`).
+
+        :param user_id: ID пользователя.
+        :param cursor: Курсор страницы или `None` для первой страницы.
+        :param page_size: Размер страницы.
+        :return: Страница объектов `TrackNamePartSchema`, самые свежие первыми.
+        """
+        async with self.session_factory() as session:
+            stmt = select(
+                TrackNameRegistry.id,
+                TrackNameRegistry.track_part,
+                TrackNameRegistry.updated_at,
+            ).where(TrackNameRegistry.user_id == user_id)
+            stmt = apply_keyset(stmt, TrackNameRegistry.updated_at, TrackNameRegistry.id, cursor, page_size)
+            result = await session.execute(stmt)
+            return build_page(result.all(), cursor, page_size).map(TrackNamePartSchema.model_validate)
 
     async def set_user_track_names(
         self,
         user_id: int,
         track_part_name: str,
-    ) -> None:
+    ) -> TrackNamePartSchema | None:
         """
         Сохраняет часть названия трека, связанную с пользователем.
 
+        Повторное сохранение той же части названия обновляет дату её использования.
+
         :param user_id: ID пользователя.
         :param track_part_name: Часть названия трека.
+        :return: Сохранённая запись или `None`, если сохранить не удалось.
         """
         async with self.session_factory() as session:
-            stmt = insert(TrackNameRegistry).values(
+            stmt = pg_insert(TrackNameRegistry).values(
                 user_id=user_id,
                 track_part=track_part_name,
             )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uix_user_track_part",
+                # Время приложения, как и при вставке (default `Base.updated_at`)
+                set_={"updated_at": stmt.excluded.updated_at},
+            ).returning(TrackNameRegistry.id, TrackNameRegistry.track_part, TrackNameRegistry.updated_at)
             try:
-                await session.execute(stmt)
-            except Exception:  # noqa: BLE001
+                result = await session.execute(stmt)
+                row = result.one()
+            except Exception:
+                logger.exception(f"Не удалось сохранить часть названия трека для пользователя {user_id}")
                 await session.rollback()
+                return None
             else:
                 await session.commit()
+                return TrackNamePartSchema.model_validate(row)
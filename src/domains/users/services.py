@@ -2,7 +2,7 @@
 Модуль `services.py` содержит реализацию сервиса для работы с пользователями.
 
 Сервис предоставляет функциональность:
-- регистрации новых пользователей;
+- регистрации новых пользователей и обновления данных существующих;
 - хранения и получения информации о пользователях;
 - управления сессионными данными (имена треков, тексты запросов);
 - кэширования часто запрашиваемых данных.
@@ -16,8 +16,10 @@ from aiogram import types
 
 from src.domains.tracks.track_name.schemas import TrackNamePartSchema
 from src.domains.users.cache_repository import UserCacheRepository
+from src.domains.users.known_users import KnownUsersCache
 from src.domains.users.repository import UserRepository
 from src.domains.users.schemas import UsersSchema
+from src.service.database.pagination import KeysetPage, PageCursor
 
 logger = logging.getLogger(__name__)
 
@@ -56,8 +58,9 @@ class UserService:
 
     user_repository: UserRepository
     user_cache_repository: UserCacheRepository
-    user_session_track_name: str = "session_track_name:{user_id}"
-    user_session_query_text: str = "session_query_text:{user_id}"
+    known_users: KnownUsersCache
+    session_track_name_field: str = "track_name"
+    session_query_text_field: str = "query_text"
 
     @extract_user_data
     async def register_user(
@@ -66,20 +69,40 @@ class UserService:
         user_data: UsersSchema,
     ) -> None:
         """
-        Регистрация нового пользователя.
+        Регистрация нового пользователя или обновление данных существующего.
 
-        Если пользователь уже существует, операция пропускается.
+        Если пользователь уже известен с теми же данными, обращение к БД пропускается.
 
         :param _event: Событие Telegram.
         :param user_data: Данные пользователя.
         """
-        if await self.user_repository.get_user_by_id(user_data.id):
-            logger.info(f"User {user_data.id} already exists")
+        if self.known_users.is_known(user_data):
+            logger.debug(f"User {user_data.id} already exists")
             return
 
-        logger.info("Registering new user")
-        await self.user_repository.insert_new_user(user_data)
-        logger.info(f"New user registered: {user_data}")
+        await self.user_repository.upsert_user(user_data)
+        self.known_users.remember(user_data)
+        logger.info(f"User registered or updated: {user_data}")
+
+    async def warm_up_known_users(self, page_size: int = 1000) -> None:
+        """
+        Заполняет кэш известных пользователей из БД постранично.
+
+        Загрузка прекращается, когда кэш заполнен до `maxsize`.
+
+        :param page_size: Количество пользователей, загружаемых за один запрос.
+        """
+        try:
+            async for users in self.user_repository.iter_users(page_size):
+                for user_data in users:
+                    self.known_users.remember(user_data)
+                if self.known_users.is_full:
+                    break
+        except Exception:
+            # Без прогрева кэш заполнится по мере обращений пользователей
+            logger.exception("Не удалось заполнить кэш известных пользователей")
+            return
+        logger.info(f"Кэш известных пользователей заполнен: {len(self.known_users)}")
 
     async def get_user_by_id(self, user_id: int) -> UsersSchema | None:
         """
@@ -110,15 +133,53 @@ class UserService:
         ):
             pass
         else:
-            user_tracks = await self.user_repository.get_user_track_names(user_id)
+            logger.debug(
+                f"Track names cache miss for {user_id}, hit rate {self.user_cache_repository.track_names_hit_rate:.2%}",
+            )
+            user_tracks = await self.user_repository.get_user_track_names(
+                user_id,
+                limit=self.user_cache_repository.max_track_names,
+            )
             if user_tracks:
-                user_tracks = [TrackNamePartSchema.model_validate(x) for x in user_tracks]
                 await self.user_cache_repository.set_user_track_names(
                     user_id=user_id,
                     track_names=user_tracks,
                 )
         return user_tracks
 
+    async def get_user_track_names_page(
+        self,
+        user_id: int,
+        cursor: PageCursor | None = None,
+        page_size: int = 4,
+    ) -> KeysetPage[TrackNamePartSchema]:
+        """
+        Получает одну страницу частей названий треков пользователя.
+
+        Первая страница берётся из кэша (при промахе кэш заполняется из БД),
+        последующие — keyset-запросом к БД.
+
+        :param user_id: ID пользователя.
+        :param cursor: Курсор страницы или `None` для первой страницы.
+        :param page_size: Размер страницы.
+        :return: Страница частей названий треков.
+        """
+        if cursor is None:
+            user_tracks = await self.get_user_track_names(user_id) or []
+            # Записи, закэшированные до появления даты использования, не годятся для курсора
+            if all(x.updated_at is not None for x in user_tracks):
+                page_items = user_tracks[:page_size]
+                if not page_items:
+                    return KeysetPage(items=[])
+                return KeysetPage(
+                    items=page_items,
+                    has_next=len(user_tracks) > page_size,
+                    first_key=(page_items[0].updated_at, page_items[0].id),
+                    last_key=(page_items[-1].updated_at, page_items[-1].id),
+                )
+
+        return await self.user_repository.get_user_track_names_page(user_id, cursor, page_size)
+
     async def set_user_track_names(
         self,
         user_id: int,
@@ -129,13 +190,17 @@ class UserService:
         """
         Устанавливает часть названия трека для пользователя.
 
+        После записи в БД закэшированный список обновляется на месте (write-through).
+
         :param user_id: ID пользователя.
         :param second_name: Фамилия.
         :param first_name: Инициалы ИО.
         :param year_of_birth: Год рождения.
         """
         track_part_name = f"{second_name}_{first_name}_{year_of_birth}"
-        await self.user_repository.set_user_track_names(user_id, track_part_name)
+        track_name = await self.user_repository.set_user_track_names(user_id, track_part_name)
+        if track_name is not None:
+            await self.user_cache_repository.push_user_track_name(user_id, track_name)
 
     async def set_session_track_names(self, user_id: int, track_name: str) -> None:
         """
@@ -144,8 +209,10 @@ class UserService:
         :param user_id: ID пользователя.
         :param track_name: Название трека.
         """
-        key = self.user_session_track_name.format(user_id=user_id)
-        await self.user_cache_repository.set(key, track_name, 180)
+        await self.user_cache_repository.set_session_fields(
+            user_id,
+            {self.session_track_name_field: track_name},
+        )
 
     async def get_session_track_name(self, user_id: int) -> str:
         """
@@ -154,8 +221,10 @@ class UserService:
         :param user_id: ID пользователя.
         :return: Название трека или пустая строка, если ключ не найден.
         """
-        key = self.user_session_track_name.format(user_id=user_id)
-        session_track_name = await self.user_cache_repository.get(key)
+        session_track_name = await self.user_cache_repository.get_session_field(
+            user_id,
+            self.session_track_name_field,
+        )
 
         if not session_track_name:
             logger.warning("Session track does not exist")
@@ -164,14 +233,16 @@ class UserService:
 
     async def del_session_track_name(self, user_id: int) -> None:
         """
-        Удаляет ключ сессии с названием трека.
+        Удаляет из сессии поле с названием трека.
 
         :param user_id: ID пользователя.
         """
-        key = self.user_session_track_name.format(user_id=user_id)
-        session_track_name = await self.user_cache_repository.delete(key)
+        deleted = await self.user_cache_repository.del_session_fields(
+            user_id,
+            self.session_track_name_field,
+        )
 
-        if not session_track_name:
+        if not deleted:
             logger.warning("Session track does not exist")
 
     async def set_session_query_text(self, user_id: int, query_text: str) -> None:
@@ -181,8 +252,10 @@ class UserService:
         :param user_id: ID пользователя.
         :param query_text: Текст запроса.
         """
-        key = self.user_session_query_text.format(user_id=user_id)
-        await self.user_cache_repository.set(key, query_text, ttl=180)
+        await self.user_cache_repository.set_session_fields(
+            user_id,
+            {self.session_query_text_field: query_text},
+        )
 
     async def get_session_query_text(self, user_id: int) -> str:
         """
@@ -191,8 +264,10 @@ class UserService:
         :param user_id: ID пользователя.
         :return: Текст запроса или пустая строка, если ключ не найден.
         """
-        key = self.user_session_query_text.format(user_id=user_id)
-        session_user_query = await self.user_cache_repository.get(key)
+        session_user_query = await self.user_cache_repository.get_session_field(
+            user_id,
+            self.session_query_text_field,
+        )
 
         if not session_user_query:
             logger.warning("Session query text does not exist")
@@ -201,23 +276,31 @@ class UserService:
 
     async def del_session_query_text(self, user_id: int) -> None:
         """
-        Удаляет ключ сессии с текстом запроса.
+        Удаляет из сессии поле с текстом запроса.
 
         :param user_id: ID пользователя.
         """
-        key = self.user_session_query_text.format(user_id=user_id)
-        session_user_query = await self.user_cache_repository.delete(key)
+        deleted = await self.user_cache_repository.del_session_fields(
+            user_id,
+            self.session_query_text_field,
+        )
 
-        if not session_user_query:
+        if not deleted:
             logger.warning("Session query text does not exist")
 
     async def get_and_del_session_query_text(self, user_id: int) -> str:
         """
-        Получает текст запроса пользователя и удаляет ключ сессии.
+        Получает текст запроса пользователя и удаляет его из сессии.
 
         :param user_id: ID пользователя.
         :return: Текст запроса или пустая строка.
         """
-        session_query_text = await self.get_session_query_text(user_id)
-        await self.del_session_query_text(user_id)
+        session_query_text = await self.user_cache_repository.pop_session_field(
+            user_id,
+            self.session_query_text_field,
+        )
+
+        if not session_query_text:
+            logger.warning("Session query text does not exist")
+
         return session_query_text
@@ -3,18 +3,33 @@
 
 Мидлвари используются для:
 - ограничения частоты запросов (rate limiting);
-- логгирования событий и обработки ошибок.
+- ограничения частоты массовых исходящих запросов к Bot API (outbound rate budget);
+- логгирования событий и обработки ошибок;
+- сбора метрик времени выполнения обработчиков;
+- создания корневого спана трассировки для каждого апдейта.
 """
 
 import asyncio
 import logging
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import DeleteMessages, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
 from aiogram.types import TelegramObject
 
+from src.service.loop_monitor import ACTIVE_HANDLERS
+from src.service.metrics import HANDLER_ERRORS, HANDLER_LATENCY
+from src.service.profiler import STACK_SAMPLER
+from src.service.tracing import set_span_attributes, span
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
 logger = logging.getLogger(__name__)
 
 
@@ -126,3 +141,149 @@ class LoggingMiddleware(BaseMiddleware):
         logger.debug(f"Обработка {summary} события заняла {duration:.3f} сек")
 
         return result
+
+
+class TracingMiddleware(BaseMiddleware):
+    """
+    Мидлварь, открывающая корневой спан трассировки на время обработки апдейта.
+
+    Все спаны, созданные при обработке (мидлвари, сервисы, источники, Redis, БД),
+    становятся вложенными в него.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict,
+    ):
+        """
+        Обработка события внутри корневого спана.
+
+        :param handler: Функция-обработчик события.
+        :param event: Событие от пользователя (сообщение, callback_query и т.д.).
+        :param data: Дополнительные данные.
+        """
+        with span(f"update {event.event_type}", update_id=event.update_id):
+            return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внутренняя мидлварь для сбора метрик времени выполнения обработчиков.
+
+    Регистрируется на наблюдателях сообщений и callback'ов диспетчера и вызывается уже после
+    фильтров, когда известны роутер и обработчик события. Метки метрик — имя роутера
+    и имя функции-обработчика; они же добавляются в спан апдейта и запоминаются
+    для монитора задержки цикла событий и профилировщика.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict,
+    ):
+        """
+        Вызывает обработчик и записывает время его выполнения.
+
+        :param handler: Функция-обработчик события.
+        :param event: Событие от пользователя (сообщение, callback_query и т.д.).
+        :param data: Дополнительные данные.
+        """
+        router = data.get("event_router")
+        handler_object = data.get("handler")
+        labels = (
+            router.name if router else "unknown",
+            getattr(handler_object.callback, "__name__", "unknown") if handler_object else "unknown",
+        )
+        set_span_attributes(router=labels[0], handler=labels[1])
+        task = asyncio.current_task()
+        if task is not None:
+            ACTIVE_HANDLERS[task] = ".".join(labels)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.labels(*labels).inc()
+            raise
+        finally:
+            HANDLER_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+            if task is not None:
+                ACTIVE_HANDLERS.pop(task, None)
+            STACK_SAMPLER.record_update()
+
+
+class OutboundRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Мидлварь сессии бота, ограничивающая частоту массовых исходящих запросов к Bot API.
+
+    Через общий скользящий бюджет (не более `limit` запросов за `per_seconds`) проходят только
+    методы из `methods` — по умолчанию пакетное удаление сообщений очисткой. Запросы сверх бюджета
+    ожидают в порядке очереди, а не получают `429 Too Many Requests` от Telegram.
+
+    Остальные вызовы (ответы, правки индикатора загрузки, ответы на callback) выполняются без
+    ожидания: единая очередь на все вызовы заставила бы ответы в одних чатах ждать, пока
+    индикаторы поиска в других чатах расходуют бюджет.
+
+    :ivar queue_depth: Количество запросов, ожидающих бюджета в данный момент.
+    """
+
+    def __init__(
+        self,
+        limit: int = 30,
+        per_seconds: float = 1.0,
+        methods: tuple[type[TelegramMethod], ...] = (DeleteMessages,),
+    ):
+        """
+        Инициализация мидлвари.
+
+        :param limit: Максимальное количество ограничиваемых запросов в указанное время.
+        :param per_seconds: Временное окно в секундах.
+        :param methods: Методы Bot API, которые проходят через бюджет.
+        """
+        self.limit = limit
+        self.per_seconds = per_seconds
+        self.methods = methods
+        self.queue_depth = 0
+        self._timestamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Ожидает, пока в текущем окне не освободится место под запрос, и занимает его."""
+        self.queue_depth += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    # Удаляем временные метки, которые вышли за пределы временного окна
+                    while self._timestamps and self._timestamps[0] <= now - self.per_seconds:
+                        self._timestamps.popleft()
+
+                    if len(self._timestamps) < self.limit:
+                        self._timestamps.append(now)
+                        return
+
+                    wait_time = self._timestamps[0] + self.per_seconds - now
+                    logger.debug(f"Outbound rate budget exhausted. Waiting {wait_time:.2f} seconds.")
+                    await asyncio.sleep(wait_time)
+        finally:
+            self.queue_depth -= 1
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Выполняет запрос к Bot API; ограничиваемые методы — после получения места в бюджете.
+
+        :param make_request: Следующий обработчик запроса в цепочке.
+        :param bot: Экземпляр бота.
+        :param method: Вызываемый метод Bot API.
+        :return: Ответ Bot API.
+        """
+        if isinstance(method, self.methods):
+            await self.acquire()
+        return await make_request(bot, method)
@@ -3,14 +3,108 @@
 
 Реализует интерфейс `RedisBase`, предоставляя методы для хранения, извлечения и удаления данных в Redis.
 Также добавлены методы для работы со списками, что позволяет использовать Redis как структурированное хранилище.
+
+Каждая операция выполняется одной атомарной командой Redis (`SET ... EX`, `HSET` и т.д.).
+В режиме автопайплайнинга команды, выданные в одной итерации цикла событий,
+ отправляются в Redis одним пайплайном — за один сетевой round trip. Очередь команд общая
+ для всех репозиториев, использующих один клиент Redis.
 """
 
-from dataclasses import dataclass
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from weakref import WeakKeyDictionary
 
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
 
 from src.service.cache.abc import RedisBase
 
+logger = logging.getLogger(__name__)
+
+# Забирает список ID сообщений, только если пользователь всё ещё числится неактивным с `older_than`.
+# KEYS[1] — список сообщений, KEYS[2] — индекс активности; ARGV[1] — user_id, ARGV[2] — older_than.
+POP_STALE_MESSAGES_SCRIPT = """
+local last_added = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if not last_added or tonumber(last_added) > tonumber(ARGV[2]) then
+    return false
+end
+local items = redis.call('LRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return items
+"""
+
+
+@dataclass
+class _AutoPipeline:
+    """
+    Очередь автопайплайна одного клиента Redis.
+
+    Общая для всех репозиториев, работающих с этим клиентом, поэтому в один пайплайн попадают
+    конкурентные команды разных репозиториев.
+
+    :ivar pending: Накопленные команды: имя метода, аргументы и future для ответа.
+    :ivar flush_tasks: Запущенные задачи отправки; ссылки держатся до их завершения.
+    """
+
+    pending: list[tuple[str, tuple, dict, asyncio.Future]] = field(default_factory=list)
+    flush_tasks: set[asyncio.Task] = field(default_factory=set)
+
+    def submit(self, redis_client: Redis, command: str, args: tuple, kwargs: dict) -> asyncio.Future:
+        """
+        Ставит команду в очередь и при необходимости планирует отправку пайплайна.
+
+        :param redis_client: Клиент Redis, которому принадлежит очередь.
+        :param command: Имя метода клиента Redis.
+        :param args: Позиционные аргументы команды.
+        :param kwargs: Именованные аргументы команды.
+        :return: Future с ответом Redis на команду.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((command, args, kwargs, future))
+        if len(self.pending) == 1:
+            # Задача стартует на следующей итерации цикла и заберёт все накопленные к тому моменту команды
+            task = loop.create_task(self.flush(redis_client))
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+        return future
+
+    async def flush(self, redis_client: Redis) -> None:
+        """
+        Отправляет накопленные команды одним нетранзакционным пайплайном и раздаёт ответы.
+
+        :param redis_client: Клиент Redis, которому принадлежит очередь.
+        """
+        batch, self.pending = self.pending, []
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for command, args, kwargs, _ in batch:
+                    getattr(pipe, command)(*args, **kwargs)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as error:  # noqa: BLE001
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        logger.debug(f"Автопайплайн: {len(batch)} команд за один round trip")
+        for (*_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Клиент Redis -> его очередь автопайплайна
+_AUTO_PIPELINES: WeakKeyDictionary[Redis, _AutoPipeline] = WeakKeyDictionary()
+
 
 class RedisClientWrapper(RedisBase):
     """
@@ -20,32 +114,65 @@ class RedisClientWrapper(RedisBase):
     - установка значений с TTL;
     - получение значений;
     - удаление ключей;
-    - работа со списками (lists).
+    - работа со списками (lists) и хэшами (hashes).
+
+    При `auto_pipeline=True` одиночные команды не отправляются сразу, а копятся до конца
+    текущей итерации цикла событий и уходят в Redis одним пайплайном. Очередь общая
+    для всех обёрток над одним клиентом.
     """
 
-    def __init__(self, redis_client: Redis):
+    def __init__(self, redis_client: Redis, *, auto_pipeline: bool = False):
         """
         Инициализация экземпляра.
 
         :param redis_client: Асинхронный клиент Redis.
+        :param auto_pipeline: Объединять ли конкурентные команды в один пайплайн.
         """
         self.redis_client = redis_client
+        self.auto_pipeline = auto_pipeline
+
+    async def _execute(self, command: str, *args, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Выполняет команду Redis напрямую или через автопайплайн.
+
+        :param command: Имя метода клиента Redis (например, `"get"`).
+        :return: Ответ Redis на команду.
+        """
+        if not self.auto_pipeline:
+            return await getattr(self.redis_client, command)(*args, **kwargs)
+
+        auto_pipeline = _AUTO_PIPELINES.get(self.redis_client)
+        if auto_pipeline is None:
+            auto_pipeline = _AUTO_PIPELINES[self.redis_client] = _AutoPipeline()
+        return await auto_pipeline.submit(self.redis_client, command, args, kwargs)
+
+    def pipeline(self, *, transaction: bool = True) -> Pipeline:
+        """
+        Возвращает пайплайн для явной группировки команд.
+
+        По умолчанию команды выполняются атомарно внутри `MULTI`/`EXEC`.
+
+        :param transaction: Оборачивать ли команды в транзакцию.
+        :return: Пайплайн клиента Redis.
+        """
+        return self.redis_client.pipeline(transaction=transaction)
+
+    @staticmethod
+    def _decode(item: bytes | None) -> str | None:
+        """Декодирует ответ Redis в строку."""
+        return item.decode("utf-8") if item is not None else None
 
     async def set(self, key: str, value: str, ttl: int) -> None:
         """
         Устанавливает значение по указанному ключу с заданным сроком жизни (TTL).
 
-        Если ключ уже существует, он будет удалён перед установкой нового значения.
+        Выполняется одной командой `SET key value EX ttl`: существующее значение и его TTL перезаписываются.
 
         :param key: Ключ, по которому будет храниться значение.
         :param value: Значение, которое нужно сохранить.
         :param ttl: Время жизни ключа в секундах.
         """
-        exists = await self.redis_client.exists(key)
-        if exists:
-            await self.redis_client.delete(key)
-
-        await self.redis_client.setex(name=key, time=ttl, value=value)
+        await self._execute("set", key, value, ex=ttl)
 
     async def get(self, key: str) -> str | None:
         """
@@ -54,8 +181,7 @@ class RedisClientWrapper(RedisBase):
         :param key: Ключ, по которому нужно получить значение.
         :return: Найденное значение или `None`, если ключ не существует.
         """
-        data = await self.redis_client.get(key)
-        return data.decode("utf-8") if data else None
+        return self._decode(await self._execute("get", key))
 
     async def delete(self, key: str) -> None:
         """
@@ -63,7 +189,7 @@ class RedisClientWrapper(RedisBase):
 
         :param key: Ключ, который нужно удалить.
         """
-        await self.redis_client.delete(key)
+        await self._execute("delete", key)
 
     async def expire(self, key: str, ttl: int) -> None:
         """
@@ -72,26 +198,26 @@ class RedisClientWrapper(RedisBase):
         :param key: Ключ, для которого устанавливается TTL.
         :param ttl: Время жизни ключа в секундах.
         """
-        await self.redis_client.expire(key, ttl)
+        await self._execute("expire", key, ttl)
 
     # 🔹 Работа со списками (lists)
 
     async def rpush(self, key: str, *values: str) -> int:
         """Добавляет элементы в конец списка."""
-        return await self.redis_client.rpush(key, *values)
+        return await self._execute("rpush", key, *values)
 
     async def lpush(self, key: str, *values: str) -> int:
         """Добавляет элементы в начало списка."""
-        return await self.redis_client.lpush(key, *values)
+        return await self._execute("lpush", key, *values)
 
     async def lrange(self, key: str, start: int, end: int) -> list[str]:
         """Возвращает диапазон элементов из списка."""
-        raw_items = await self.redis_client.lrange(key, start, end)
+        raw_items = await self._execute("lrange", key, start, end)
         return [item.decode("utf-8") for item in raw_items]
 
     async def llen(self, key: str) -> int:
         """Возвращает длину списка."""
-        return await self.redis_client.llen(key)
+        return await self._execute("llen", key)
 
     async def lpop(self, key: str) -> str | None:
         """
@@ -100,8 +226,7 @@ class RedisClientWrapper(RedisBase):
         :param key: Ключ Redis.
         :return: Декодированное значение или None, если список пуст.
         """
-        item: bytes | None = await self.redis_client.lpop(key)
-        return item.decode("utf-8") if item else None
+        return self._decode(await self._execute("lpop", key))
 
     async def rpop(self, key: str) -> str | None:
         """
@@ -110,20 +235,40 @@ class RedisClientWrapper(RedisBase):
         :param key: Ключ Redis.
         :return: Декодированное значение или None, если список пуст.
         """
-        item: bytes | None = await self.redis_client.rpop(key)
-        return item.decode("utf-8") if item else None
+        return self._decode(await self._execute("rpop", key))
 
     async def lrem(self, key: str, count: int, value: str) -> int:
         """Удаляет элементы из списка по значению."""
-        return await self.redis_client.lrem(key, count, value)
+        return await self._execute("lrem", key, count, value)
 
     async def lset(self, key: str, index: int, value: str) -> str:
         """Заменяет значение элемента списка по индексу."""
-        return await self.redis_client.lset(key, index, value)
+        return await self._execute("lset", key, index, value)
 
     async def ltrim(self, key: str, start: int, stop: int) -> str:
         """Оставляет только указанный диапазон элементов списка."""
-        return await self.redis_client.ltrim(key, start, stop)
+        return await self._execute("ltrim", key, start, stop)
+
+    # 🔹 Работа с хэшами (hashes)
+
+    async def hset(self, key: str, mapping: dict[str, str]) -> int:
+        """Устанавливает несколько полей хэша одной командой."""
+        return await self._execute("hset", key, mapping=mapping)
+
+    async def hget(self, key: str, field: str) -> str | None:
+        """Возвращает значение поля хэша или `None`, если поля нет."""
+        return self._decode(await self._execute("hget", key, field))
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        """Удаляет поля хэша и возвращает количество удалённых полей."""
+        return await self._execute("hdel", key, *fields)
+
+    # 🔹 Работа с упорядоченными множествами (sorted sets)
+
+    async def zrangebyscore(self, key: str, min_score: float | str, max_score: float | str, limit: int) -> list[str]:
+        """Возвращает до `limit` элементов множества со score в диапазоне `[min_score, max_score]`."""
+        raw_items = await self._execute("zrangebyscore", key, min_score, max_score, start=0, num=limit)
+        return [item.decode("utf-8") for item in raw_items]
 
 
 @dataclass
@@ -132,18 +277,30 @@ class BaseMsgCleanerRepository(RedisClientWrapper):
     Реализация репозитория для хранения ID сообщений, которые необходимо удалить позже.
 
     Использует Redis для временного хранения и управления списком ID сообщений.
+    Список каждого пользователя ограничен `max_messages` последними ID и живёт `messages_ttl` секунд
+    с момента последнего добавления. Время последнего добавления хранится в индексе
+    (sorted set `messages_index_key`), по которому фоновая задача находит брошенные списки.
     """
 
     redis_client: Redis
+    auto_pipeline: bool = False
+    max_messages: int = 100
+    messages_ttl: int = 48 * 60 * 60
 
     @property
     def messages_key(self) -> str:
         """Формат ключа для хранения ID сообщений."""
         return "messages_to_delete:{user_id}"
 
+    @property
+    def messages_index_key(self) -> str:
+        """Ключ индекса: user_id -> время последнего добавления сообщения."""
+        return self.messages_key.format(user_id="index")
+
     def __post_init__(self):
         """Вызывается после инициализации для настройки родительского класса."""
-        super().__init__(self.redis_client)
+        super().__init__(self.redis_client, auto_pipeline=self.auto_pipeline)
+        self._pop_stale_script = self.redis_client.register_script(POP_STALE_MESSAGES_SCRIPT)
 
     async def get_messages_to_delete(self, user_id: int) -> list[int]:
         """
@@ -160,11 +317,64 @@ class BaseMsgCleanerRepository(RedisClientWrapper):
         """
         Добавляет ID сообщения в список для удаления.
 
+        В одной транзакции список обрезается до `max_messages` последних ID,
+        продлевается его TTL и обновляется время активности в индексе.
+
         :param user_id: ID пользователя.
         :param message_id: ID сообщения, которое нужно удалить.
         """
         key = self.messages_key.format(user_id=user_id)
-        await self.rpush(key, str(message_id))
+        async with self.pipeline() as pipe:
+            pipe.rpush(key, str(message_id))
+            pipe.ltrim(key, -self.max_messages, -1)
+            pipe.expire(key, self.messages_ttl)
+            pipe.zadd(self.messages_index_key, {str(user_id): time.time()})
+            await pipe.execute()
+
+    async def pop_messages_to_delete(self, user_id: int) -> list[int]:
+        """
+        Атомарно забирает список ID сообщений и очищает его (`LRANGE` + `DEL` в одном `MULTI`).
+
+        ID, добавленные конкурентно после выполнения транзакции, попадут в новый список и не будут потеряны.
+
+        :param user_id: ID пользователя.
+        :return: Список ID сообщений.
+        """
+        key = self.messages_key.format(user_id=user_id)
+        async with self.pipeline() as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            pipe.zrem(self.messages_index_key, str(user_id))
+            raw_items, *_ = await pipe.execute()
+        return [int(item) for item in raw_items]
+
+    async def pop_stale_messages_to_delete(self, user_id: int, older_than: float) -> list[int] | None:
+        """
+        Атомарно забирает список ID сообщений, если в него давно ничего не добавлялось.
+
+        Проверка времени активности и очистка списка выполняются одним Lua-скриптом, поэтому ID,
+        добавленные пользователем после `get_stale_users`, не будут удалены вместе с брошенным списком.
+
+        :param user_id: ID пользователя.
+        :param older_than: Unix-время: списки, обновлённые позже, не трогаются.
+        :return: Список ID сообщений или `None`, если пользователь снова активен.
+        """
+        key = self.messages_key.format(user_id=user_id)
+        raw_items = await self._pop_stale_script(keys=[key, self.messages_index_key], args=[user_id, older_than])
+        if raw_items is None:
+            return None
+        return [int(item) for item in raw_items]
+
+    async def get_stale_users(self, older_than: float, limit: int = 500) -> list[int]:
+        """
+        Возвращает пользователей, в чей список давно ничего не добавлялось.
+
+        :param older_than: Unix-время: списки, обновлённые раньше, считаются брошенными.
+        :param limit: Максимальное количество пользователей за один вызов.
+        :return: Список ID пользователей.
+        """
+        raw_items = await self.zrangebyscore(self.messages_index_key, "-inf", older_than, limit)
+        return [int(user_id) for user_id in raw_items]
 
     async def delete_messages_to_delete(self, user_id: int) -> None:
         """
@@ -173,4 +383,7 @@ class BaseMsgCleanerRepository(RedisClientWrapper):
         :param user_id: ID пользователя.
         """
         key = self.messages_key.format(user_id=user_id)
-        await self.delete(key)
+        async with self.pipeline() as pipe:
+            pipe.delete(key)
+            pipe.zrem(self.messages_index_key, str(user_id))
+            await pipe.execute()
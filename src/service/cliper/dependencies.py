@@ -16,7 +16,7 @@ class CliperProvider(Provider):
     Обеспечивает автоматическую инъекцию репозитория в нужные части приложения через DI-контейнер.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_repo(self) -> TrackCliperRepo:
         """
         Возвращает экземпляр репозитория для работы с аудио.
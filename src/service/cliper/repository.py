@@ -2,6 +2,7 @@
 Модуль для работы с аудиофайлами: вырезка фрагментов и конкатенация треков.
 
 Использует библиотеку `pydub` для выполнения операций с аудио.
+Импорт `pydub` выполняется лениво в рабочем потоке, чтобы не замедлять старт бота.
 Реализует паттерн Репозиторий для инкапсуляции логики работы с аудио.
 """
 
@@ -10,13 +11,14 @@ import contextlib
 import logging
 import os
 import tempfile
+import time
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
 
-from pydub import AudioSegment
-
 from src.service.cliper.schemas import ClipRequestSchema, FadeConfig
+from src.service.metrics import CLIP_BYTES, CLIP_LATENCY
+from src.service.tracing import span
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -75,13 +77,20 @@ class TrackCliperRepo:
 
         with TemporaryFileManager.create_temp_file(suffix=f".{config.output_format}") as output_path:
 
-            def _cut() -> None:
+            def _cut() -> int:
+                from pydub import AudioSegment  # noqa: PLC0415
+
                 logger.debug(f"Cutting from {config.start_sec} to {config.finish_sec}")
                 audio = AudioSegment.from_file(full_track_path)
                 fragment = audio[config.start_sec:config.finish_sec]
                 fragment.export(output_path, format=config.output_format)
+                return output_path.stat().st_size
 
-            await asyncio.to_thread(_cut)
+            started = time.perf_counter()
+            with span("audio.cut", output_format=config.output_format):
+                output_size = await asyncio.to_thread(_cut)
+            CLIP_LATENCY.labels("cut").observe(time.perf_counter() - started)
+            CLIP_BYTES.labels("cut").observe(output_size)
             logger.info(f"Successfully cut audio fragment: {output_path}")
             return output_path
 
@@ -103,7 +112,9 @@ class TrackCliperRepo:
 
         with TemporaryFileManager.create_temp_file(suffix=".mp3") as output_path:
 
-            def _concat() -> None:
+            def _concat() -> int:
+                from pydub import AudioSegment  # noqa: PLC0415
+
                 beep = AudioSegment.from_file(self.beep_path)
                 music = AudioSegment.from_file(music_path)
 
@@ -114,8 +125,13 @@ class TrackCliperRepo:
 
                 combined = beep + music
                 combined.export(output_path, format="mp3")
+                return output_path.stat().st_size
 
-            await asyncio.to_thread(_concat)
+            started = time.perf_counter()
+            with span("audio.concat", fade_type=fade_config.fade_type):
+                output_size = await asyncio.to_thread(_concat)
+            CLIP_LATENCY.labels("concat").observe(time.perf_counter() - started)
+            CLIP_BYTES.labels("concat").observe(output_size)
             logger.info(f"Successfully concatenated audio files: {output_path}")
             return output_path
 
@@ -0,0 +1,163 @@
+"""
+Модуль `pagination.py` содержит утилиты keyset-пагинации по ключу `(updated_at, id)`.
+
+Вместо `OFFSET` каждая страница выбирается условием «строго после/до ключа крайней строки
+предыдущей страницы», поэтому стоимость запроса не растёт с глубиной истории.
+Из БД всегда запрашивается на одну строку больше размера страницы — по ней определяется,
+есть ли следующая страница.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from enum import StrEnum
+from typing import Any, ClassVar
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+PageKey = tuple[datetime, int]
+
+
+class PageDirection(StrEnum):
+    """Направление перехода относительно ключа курсора."""
+
+    NEXT = "n"
+    PREV = "p"
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Курсор страницы: направление и ключ `(updated_at, id)` крайней строки соседней страницы.
+
+    Упаковывается в короткую строку для callback_data (ограничение Telegram — 64 байта).
+    """
+
+    TS_FORMAT: ClassVar[str] = "%Y%m%d%H%M%S%f"
+
+    direction: PageDirection
+    updated_at: datetime
+    id: int
+
+    def pack(self) -> str:
+        """Упаковывает курсор в строку вида `n:<updated_at>:<id>`."""
+        return f"{self.direction}:{self.updated_at.strftime(self.TS_FORMAT)}:{self.id}"
+
+    @classmethod
+    def unpack(cls, value: str) -> "PageCursor | None":
+        """
+        Распаковывает курсор из строки.
+
+        :param value: Строка, полученная из `pack`, или `1` для первой страницы.
+        :return: Курсор или `None`, если нужна первая страница.
+        """
+        try:
+            direction, updated_at, id_ = value.split(":")
+            return cls(PageDirection(direction), datetime.strptime(updated_at, cls.TS_FORMAT), int(id_))  # noqa: DTZ007
+        except ValueError:
+            return None
+
+
+@dataclass
+class KeysetPage[T]:
+    """
+    Страница элементов с флагами наличия соседних страниц.
+
+    :ivar items: Элементы страницы.
+    :ivar has_next: Есть ли следующая (более старая) страница.
+    :ivar has_prev: Есть ли предыдущая (более новая) страница.
+    :ivar first_key: Ключ первого элемента страницы.
+    :ivar last_key: Ключ последнего элемента страницы.
+    """
+
+    items: list[T]
+    has_next: bool = False
+    has_prev: bool = False
+    first_key: PageKey | None = None
+    last_key: PageKey | None = None
+
+    def map[U](self, func: Callable[[T], U]) -> "KeysetPage[U]":
+        """
+        Преобразует элементы страницы, сохраняя флаги и ключи.
+
+        :param func: Функция преобразования элемента (например, строки БД в схему).
+        :return: Новая страница.
+        """
+        return replace(self, items=[func(x) for x in self.items])
+
+    @property
+    def next_cursor(self) -> PageCursor | None:
+        """Курсор следующей страницы или `None`, если её нет."""
+        if not self.has_next or self.last_key is None:
+            return None
+        return PageCursor(PageDirection.NEXT, *self.last_key)
+
+    @property
+    def prev_cursor(self) -> PageCursor | None:
+        """Курсор предыдущей страницы или `None`, если её нет."""
+        if not self.has_prev or self.first_key is None:
+            return None
+        return PageCursor(PageDirection.PREV, *self.first_key)
+
+
+def apply_keyset(
+    stmt: Select,
+    updated_at: InstrumentedAttribute,
+    id_: InstrumentedAttribute,
+    cursor: PageCursor | None,
+    page_size: int,
+) -> Select:
+    """
+    Добавляет к запросу условие и сортировку keyset-пагинации.
+
+    Страницы упорядочены от новых к старым. Для перехода назад строки выбираются
+    в обратном порядке и разворачиваются в `build_page`.
+
+    :param stmt: Исходный запрос с фильтрами.
+    :param updated_at: Колонка даты обновления.
+    :param id_: Колонка первичного ключа.
+    :param cursor: Курсор страницы или `None` для первой страницы.
+    :param page_size: Размер страницы.
+    :return: Запрос, выбирающий `page_size + 1` строк.
+    """
+    key = tuple_(updated_at, id_)
+    if cursor is None:
+        stmt = stmt.order_by(updated_at.desc(), id_.desc())
+    elif cursor.direction == PageDirection.NEXT:
+        stmt = stmt.where(key < (cursor.updated_at, cursor.id)).order_by(updated_at.desc(), id_.desc())
+    else:
+        stmt = stmt.where(key > (cursor.updated_at, cursor.id)).order_by(updated_at.asc(), id_.asc())
+    return stmt.limit(page_size + 1)
+
+
+def build_page(rows: list[Any], cursor: PageCursor | None, page_size: int) -> KeysetPage[Any]:
+    """
+    Собирает страницу из строк, выбранных запросом из `apply_keyset`.
+
+    Строки должны содержать атрибуты `updated_at` и `id`.
+
+    :param rows: Строки результата (до `page_size + 1`).
+    :param cursor: Курсор, с которым выполнялся запрос.
+    :param page_size: Размер страницы.
+    :return: Страница с флагами соседних страниц.
+    """
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if cursor is not None and cursor.direction == PageDirection.PREV:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    if not rows:
+        return KeysetPage(items=[])
+
+    return KeysetPage(
+        items=rows,
+        has_next=has_next,
+        has_prev=has_prev,
+        first_key=(rows[0].updated_at, rows[0].id),
+        last_key=(rows[-1].updated_at, rows[-1].id),
+    )
@@ -1,10 +1,17 @@
-"""Модуль с провайдерами сервисных зависимостей."""
+"""
+Модуль с провайдерами сервисных зависимостей.
+
+Движок БД, фабрика сессий и клиент Redis живут в скоупе `Scope.APP`: пулы соединений
+создаются один раз на всё время работы бота и закрываются при остановке контейнера.
+"""
+
+from collections.abc import AsyncIterable
 
 from dishka import FromDishka, Provider, Scope, provide
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
-from src.service.settings.config import Settings
+from src.service.settings.config import Settings, get_settings
 
 
 class ConfigProvider(Provider):
@@ -12,8 +19,8 @@ class ConfigProvider(Provider):
 
     @provide(scope=Scope.APP)
     async def get_config(self) -> Settings:
-        """Возвращает экземпляр объекта настроек приложения."""
-        return Settings()
+        """Возвращает общий (мемоизированный) экземпляр настроек приложения."""
+        return get_settings()
 
 
 class DatabaseProvider(Provider):
@@ -23,27 +30,29 @@ class DatabaseProvider(Provider):
     Отвечает за создание асинхронного движка и фабрики сессий.
     """
 
-    @provide(scope=Scope.REQUEST)
-    def get_async_engine(
+    @provide(scope=Scope.APP)
+    async def get_async_engine(
         self,
         settings: FromDishka[Settings],
-    ) -> AsyncEngine:
+    ) -> AsyncIterable[AsyncEngine]:
         """
-        Создаёт и возвращает асинхронный движок SQLAlchemy.
+        Создаёт асинхронный движок SQLAlchemy и освобождает его пул при закрытии контейнера.
 
         :param settings: Объект настроек, из которого берётся DSN для подключения к БД.
         :return: Экземпляр AsyncEngine.
         """
         from sqlalchemy.ext.asyncio import create_async_engine  # noqa: PLC0415
 
-        return create_async_engine(
+        engine = create_async_engine(
             url=settings.postgres.async_database_dsn,
             echo=settings.debug,
             pool_size=5,
             max_overflow=10,
         )
+        yield engine
+        await engine.dispose()
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     def get_async_session_factory(self, engine: AsyncEngine) -> async_sessionmaker:
         """
         Возвращает фабрику асинхронных сессий SQLAlchemy.
@@ -61,20 +70,22 @@ class RedisProvider(Provider):
     Отвечает за создание клиентского соединения с Redis.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_redis_client(
         self,
         settings: FromDishka[Settings],
-    ) -> Redis:
+    ) -> AsyncIterable[Redis]:
         """
-        Создаёт и возвращает клиент Redis.
+        Создаёт клиент Redis и закрывает его пул соединений при закрытии контейнера.
 
         :param settings: Объект настроек, из которого берутся параметры подключения к Redis.
         :return: Экземпляр клиента Redis.
         """
-        return Redis(
+        redis_client = Redis(
             host=settings.redis.host,
             port=settings.redis.port,
             db=settings.redis.db,
             password=settings.redis.password.get_secret_value(),
         )
+        yield redis_client
+        await redis_client.aclose()
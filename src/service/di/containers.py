@@ -3,10 +3,15 @@
 
 С помощью библиотеки `dishka` создаётся асинхронный контейнер, в который регистрируются провайдеры,
 обеспечивающие внедрение зависимостей для всех модулей приложения.
+
+Сервисы и репозитории не хранят состояния конкретного апдейта, поэтому регистрируются
+в скоупе `Scope.APP` и создаются один раз: на каждый апдейт приходится только поиск
+готовых объектов в кэше контейнера.
 """
 
 from dishka import AsyncContainer, make_async_container
 
+from src.domains.common.dependencies import CommonProvider
 from src.domains.tracks.dependencies import TrackProvider
 from src.domains.tracks.track_cliper.dependencies import TrackCliperProvider
 from src.domains.tracks.track_name.dependencies import TrackNameProvider
@@ -38,6 +43,7 @@ def create_container() -> AsyncContainer:
         TrackSearchProvider(),
         TrackCliperProvider(),
         TrackNameProvider(),
+        CommonProvider(),
     ]
 
     return make_async_container(*containers)
@@ -22,6 +22,9 @@ class DownloaderAbstractRepo(ABC):
      все абстрактные методы этого класса.
     """
 
+    # Источники только для загрузки (например, Telegram) не попадают в план поиска
+    searchable: bool = True
+
     @property
     @abstractmethod
     def alias(self) -> str:
@@ -60,7 +63,7 @@ class DownloaderAbstractRepo(ABC):
         Синхронный метод для поиска треков по ключевой фразе.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата, используется для кэширования ссылок.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :param max_results: Максимальное количество результатов.
         :return: Список найденных треков в виде словарей.
         """
@@ -71,8 +74,11 @@ class DownloaderAbstractRepo(ABC):
         """
         Асинхронная обёртка над `_search_track`.
 
+        В поле `webpage_url` возвращается исходная ссылка на трек: короткие идентификаторы
+        для callback_data выдаёт `DownloaderService` после чтения из кэша результатов.
+
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата, используется для кэширования ссылок.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :return: Список найденных треков.
         """
         raise NotImplementedError
@@ -3,9 +3,11 @@
  для временного хранения ссылок на музыкальные треки.
 
 Используется Redis для хранения ссылок, что позволяет сократить объём данных,
- передаваемых в callback_data inline-кнопок бота.
+ передаваемых в callback_data inline-кнопок бота, а также для кэширования
+ результатов поиска по нормализованному тексту запроса.
 """
 
+import json
 import secrets
 from dataclasses import dataclass
 from enum import IntEnum
@@ -28,9 +30,20 @@ class DownloaderCacheRepo:
     Класс для работы с кэшированием ссылок на музыкальные треки.
 
     Использует Redis для хранения временных ссылок, чтобы обойти ограничение длины callback_data в Telegram API.
+    Результаты поиска кэшируются общими для всех пользователей: ссылки в них — исходные,
+    короткие идентификаторы для конкретного чата выдаются уже после чтения из кэша.
     """
 
     redis_client: Redis
+    search_results_key: str = "search_results:{repo_alias}:{query_key}"
+    search_hits: int = 0
+    search_misses: int = 0
+
+    @property
+    def search_hit_rate(self) -> float:
+        """Доля поисков, обслуженных из кэша результатов."""
+        total = self.search_hits + self.search_misses
+        return self.search_hits / total if total else 0.0
 
     async def get_track_url(self, track_url_id: str, chat_id: int) -> str:
         """
@@ -64,3 +77,50 @@ class DownloaderCacheRepo:
             track_url,
         )
         return track_url_id
+
+    async def set_track_urls(self, track_urls: list[str], chat_id: int) -> list[str]:
+        """
+        Сохраняет несколько ссылок на треки одним пайплайном.
+
+        :param track_urls: Оригинальные ссылки на треки.
+        :param chat_id: ID чата, используется как префикс ключа для изоляции данных разных пользователей.
+        :return: Сгенерированные идентификаторы ссылок в том же порядке.
+        """
+        track_url_ids = [secrets.token_hex(8) for _ in track_urls]
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for track_url_id, track_url in zip(track_url_ids, track_urls, strict=True):
+                pipe.setex(f"{chat_id}_track_url:{track_url_id}", CacheTTL.TWO_MINUTES.value, track_url)
+            await pipe.execute()
+        return track_url_ids
+
+    async def get_search_results(self, repo_alias: str, query_key: str) -> list[dict] | None:
+        """
+        Получает закэшированные результаты поиска в источнике.
+
+        :param repo_alias: Алиас источника.
+        :param query_key: Нормализованный текст запроса.
+        :return: Список треков в виде словарей (может быть пустым) или `None`, если в кэше ничего нет.
+        """
+        data = await self.redis_client.get(self.search_results_key.format(repo_alias=repo_alias, query_key=query_key))
+        if data is None:
+            self.search_misses += 1
+            return None
+        self.search_hits += 1
+        return json.loads(data)
+
+    async def set_search_results(self, repo_alias: str, query_key: str, tracks: list[dict], ttl: int) -> None:
+        """
+        Кэширует результаты поиска в источнике.
+
+        Пустой результат тоже кэшируется, чтобы не повторять заведомо безуспешный поиск.
+
+        :param repo_alias: Алиас источника.
+        :param query_key: Нормализованный текст запроса.
+        :param tracks: Список треков в виде словарей с исходными ссылками.
+        :param ttl: Время жизни записи в секундах.
+        """
+        await self.redis_client.setex(
+            self.search_results_key.format(repo_alias=repo_alias, query_key=query_key),
+            ttl,
+            json.dumps(tracks, ensure_ascii=False),
+        )
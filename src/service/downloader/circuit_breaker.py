@@ -0,0 +1,164 @@
+"""
+Модуль `circuit_breaker.py` содержит автоматические выключатели (circuit breakers) источников треков.
+
+Состояния выключателя:
+- `closed` — источник опрашивается как обычно;
+- `open` — после `failure_threshold` ошибок подряд источник пропускается без ожидания таймаутов;
+- `half_open` — по истечении `open_seconds` фоновая задача отправляет в источник пробный запрос:
+  успех закрывает выключатель, ошибка снова открывает его.
+
+Пользовательские поиски опрашивают только источники с закрытым выключателем, поэтому
+проверка недоступного источника никогда не задерживает пользователя. Если разомкнуты все
+выключатели, поиск опрашивает источник, разомкнутый раньше остальных.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from src.service.downloader.abstraction import DownloaderAbstractRepo
+from src.service.downloader.source_router import SearchOutcome
+from src.service.settings.config import CircuitBreakerSettings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    """Состояние выключателя источника."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Выключатель одного источника.
+
+    :ivar failure_threshold: Количество ошибок подряд, после которого выключатель размыкается.
+    :ivar open_seconds: Время в разомкнутом состоянии до пробного запроса.
+    """
+
+    failure_threshold: int
+    open_seconds: float
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+
+    @property
+    def probe_due(self) -> bool:
+        """Пора ли отправить пробный запрос в разомкнутый источник."""
+        return (
+            self.state == CircuitState.OPEN
+            and self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self.open_seconds
+        )
+
+    def record_success(self) -> None:
+        """Замыкает выключатель после успешного ответа источника."""
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку источника и при необходимости размыкает выключатель."""
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class CircuitBreakerRegistry:
+    """
+    Выключатели всех источников и фоновая проверка разомкнутых.
+
+    :ivar repositories: Источники треков.
+    :ivar settings: Настройки выключателей.
+    """
+
+    repositories: list[DownloaderAbstractRepo]
+    settings: CircuitBreakerSettings
+    breakers: dict[str, CircuitBreaker] = field(default_factory=dict)
+
+    def get(self, alias: str) -> CircuitBreaker:
+        """
+        Возвращает выключатель источника.
+
+        :param alias: Алиас источника.
+        :return: Экземпляр `CircuitBreaker`.
+        """
+        if alias not in self.breakers:
+            self.breakers[alias] = CircuitBreaker(
+                failure_threshold=self.settings.failure_threshold,
+                open_seconds=self.settings.open_seconds,
+            )
+        return self.breakers[alias]
+
+    def is_available(self, alias: str) -> bool:
+        """
+        Проверяет, можно ли опрашивать источник в пользовательском поиске.
+
+        :param alias: Алиас источника.
+        :return: `True`, если выключатель замкнут.
+        """
+        return self.get(alias).state == CircuitState.CLOSED
+
+    def least_recently_opened(self, repositories: list[DownloaderAbstractRepo]) -> DownloaderAbstractRepo | None:
+        """
+        Возвращает источник, выключатель которого разомкнут раньше остальных.
+
+        Такой источник дольше всех не опрашивался и ближе всех к пробному запросу. Если он снова
+        не ответит, выключатель разомкнётся заново, и следующим будет выбран другой источник.
+
+        :param repositories: Источники с разомкнутыми выключателями.
+        :return: Источник или `None`, если список пуст.
+        """
+        return min(repositories, key=lambda x: self.get(x.alias).opened_at or 0.0, default=None)
+
+    def record(self, alias: str, outcome: SearchOutcome) -> None:
+        """
+        Учитывает исход поиска в источнике.
+
+        Пустой результат — нормальный ответ источника и ошибкой не считается. Отменённый поиск
+        ничего не говорит о доступности источника и не учитывается.
+
+        :param alias: Алиас источника.
+        :param outcome: Исход поиска.
+        """
+        if outcome == SearchOutcome.CANCELLED:
+            return
+        breaker = self.get(alias)
+        previous_state = breaker.state
+        if outcome == SearchOutcome.ERROR:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if breaker.state != previous_state:
+            logger.warning(f"Источник {alias}: выключатель {previous_state} -> {breaker.state}")
+
+    async def probe(self, repo: DownloaderAbstractRepo) -> None:
+        """
+        Отправляет пробный запрос в источник с разомкнутым выключателем.
+
+        :param repo: Источник треков.
+        """
+        self.get(repo.alias).state = CircuitState.HALF_OPEN
+        try:
+            async with asyncio.timeout(self.settings.probe_timeout):
+                result = await repo.find_tracks_on_phrase(self.settings.probe_query, 0)
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"Пробный запрос в {repo.alias} не удался: {e}")
+            result = None
+        self.record(repo.alias, SearchOutcome.ERROR if result is None else SearchOutcome.FOUND)
+
+    async def run(self) -> None:
+        """Периодически проверяет источники, для которых пришло время пробного запроса."""
+        while True:
+            await asyncio.sleep(self.settings.probe_interval)
+            due = [x for x in self.repositories if self.get(x.alias).probe_due]
+            if due:
+                await asyncio.gather(*(self.probe(x) for x in due))
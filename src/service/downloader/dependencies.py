@@ -3,6 +3,8 @@
 
 Создаёт провайдер (Dependency Provider) на основе библиотеки `dishka`, который регистрирует:
     - репозитории для поиска и загрузки музыки;
+    - упреждающую загрузку результатов поиска;
+    - автоматические выключатели источников;
     - сервис для обработки запросов;
     - зависимости между ними (Redis, конфигурация);
 
@@ -10,10 +12,15 @@
  для автоматического управления жизненным циклом объектов.
 """
 
+from collections.abc import AsyncIterable
+
 from dishka import FromDishka, Provider, Scope, provide
 from redis.asyncio import Redis
 
+from src.domains.tracks.query_normalizer import QueryNormalizer
 from src.service.downloader.cache_repository import DownloaderCacheRepo
+from src.service.downloader.circuit_breaker import CircuitBreakerRegistry
+from src.service.downloader.prefetcher import TrackPrefetcher
 from src.service.downloader.repository import (
     DownloaderRepoHitmo,
     DownloaderRepoPinkamuz,
@@ -21,6 +28,7 @@ from src.service.downloader.repository import (
     TelegramDownloaderRepo,
 )
 from src.service.downloader.service import DownloaderService
+from src.service.downloader.source_router import HedgeBudget
 from src.service.settings.config import Settings
 
 
@@ -31,7 +39,7 @@ class DownloaderProvider(Provider):
     Отвечает за создание экземпляров репозиториев и сервиса, а также их внедрение в нужные места приложения.
     """
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_cache_repository(
         self,
         redis_client: FromDishka[Redis],
@@ -44,52 +52,63 @@ class DownloaderProvider(Provider):
         """
         return DownloaderCacheRepo(redis_client=redis_client)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
+    async def get_prefetcher(
+        self,
+        settings: FromDishka[Settings],
+    ) -> AsyncIterable[TrackPrefetcher]:
+        """
+        Создаёт упреждающую загрузку результатов поиска.
+
+        При закрытии контейнера незавершённые загрузки отменяются, а временные файлы удаляются.
+
+        :param settings: Объект настроек.
+        :return: Экземпляр TrackPrefetcher.
+        """
+        prefetcher = TrackPrefetcher(settings=settings.prefetch)
+        yield prefetcher
+        await prefetcher.close()
+
+    @provide(scope=Scope.APP)
     async def get_repository_yt(
         self,
         settings: FromDishka[Settings],
-        cache_repository: FromDishka[DownloaderCacheRepo],
     ) -> DownloaderRepoYT:
         """
         Создаёт и возвращает репозиторий для работы с YouTube.
 
         :param settings: Объект настроек.
-        :param cache_repository: Кэширующий репозиторий.
         :return: Экземпляр DownloaderRepoYT.
         """
-        return DownloaderRepoYT(settings, cache_repository)
+        return DownloaderRepoYT(settings)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_repository_pinkamuz(
         self,
         settings: FromDishka[Settings],
-        cache_repository: FromDishka[DownloaderCacheRepo],
     ) -> DownloaderRepoPinkamuz:
         """
         Создаёт и возвращает репозиторий для работы с сайтом Pinkamuz.
 
         :param settings: Объект настроек.
-        :param cache_repository: Кэширующий репозиторий.
         :return: Экземпляр DownloaderRepoPinkamuz.
         """
-        return DownloaderRepoPinkamuz(settings, cache_repository)
+        return DownloaderRepoPinkamuz(settings)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_repository_hitmo(
         self,
         settings: FromDishka[Settings],
-        cache_repository: FromDishka[DownloaderCacheRepo],
     ) -> DownloaderRepoHitmo:
         """
         Создаёт и возвращает репозиторий для работы с Hitmotop.
 
         :param settings: Объект настроек.
-        :param cache_repository: Кэширующий репозиторий.
         :return: Экземпляр DownloaderRepoHitmo.
         """
-        return DownloaderRepoHitmo(settings, cache_repository)
+        return DownloaderRepoHitmo(settings)
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
     async def get_repository_telegram(
         self,
     ) -> TelegramDownloaderRepo:
@@ -100,7 +119,31 @@ class DownloaderProvider(Provider):
         """
         return TelegramDownloaderRepo()
 
-    @provide(scope=Scope.REQUEST)
+    @provide(scope=Scope.APP)
+    async def get_circuit_breakers(
+        self,
+        repository_yt: FromDishka[DownloaderRepoYT],
+        repository_pinkamuz: FromDishka[DownloaderRepoPinkamuz],
+        repository_hitmo: FromDishka[DownloaderRepoHitmo],
+        settings: FromDishka[Settings],
+    ) -> CircuitBreakerRegistry:
+        """
+        Создаёт и возвращает выключатели внешних источников треков.
+
+        Telegram не выходит во внешнюю сеть и выключателем не проверяется.
+
+        :param repository_yt: Репозиторий для YouTube.
+        :param repository_pinkamuz: Репозиторий для Pinkamuz.
+        :param repository_hitmo: Репозиторий для Hitmotop.
+        :param settings: Объект настроек.
+        :return: Экземпляр CircuitBreakerRegistry.
+        """
+        return CircuitBreakerRegistry(
+            repositories=[repository_pinkamuz, repository_yt, repository_hitmo],
+            settings=settings.circuit_breaker,
+        )
+
+    @provide(scope=Scope.APP)
     async def get_service(  # noqa: PLR0913
         self,
         repository_yt: FromDishka[DownloaderRepoYT],
@@ -109,6 +152,9 @@ class DownloaderProvider(Provider):
         repository_hitmo: FromDishka[DownloaderRepoHitmo],
         settings: FromDishka[Settings],
         cache_repository: FromDishka[DownloaderCacheRepo],
+        normalizer: FromDishka[QueryNormalizer],
+        prefetcher: FromDishka[TrackPrefetcher],
+        circuit_breakers: FromDishka[CircuitBreakerRegistry],
     ) -> DownloaderService:
         """
         Создаёт и возвращает сервис для поиска и загрузки треков.
@@ -121,6 +167,9 @@ class DownloaderProvider(Provider):
         :param repository_hitmo: Репозиторий для Hitmotop.
         :param settings: Объект настроек.
         :param cache_repository: Кэширующий репозиторий.
+        :param normalizer: Нормализатор поисковых запросов для ключей кэша.
+        :param prefetcher: Упреждающая загрузка результатов поиска.
+        :param circuit_breakers: Выключатели внешних источников.
         :return: Экземпляр DownloaderService.
         """
         return DownloaderService(
@@ -132,4 +181,8 @@ class DownloaderProvider(Provider):
             ],
             cache_repository=cache_repository,
             settings=settings,
+            normalizer=normalizer,
+            prefetcher=prefetcher,
+            circuit_breakers=circuit_breakers,
+            hedge_budget=HedgeBudget(ratio=settings.search.hedge_ratio),
         )
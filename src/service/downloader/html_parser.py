@@ -0,0 +1,229 @@
+"""
+Модуль `html_parser.py` содержит абстракцию над HTML-парсерами для скраперов источников.
+
+Поддерживаемые движки:
+- `selectolax` (lexbor) — самый быстрый, устанавливается как дополнительная зависимость `fast-html`;
+- `lxml` с предкомпилированными CSS-селекторами (`cssselect`) — дополнительная зависимость `fast-html`;
+- `bs4` со встроенным `html.parser` — всегда доступен и используется как запасной вариант.
+
+Все движки импортируются лениво, чтобы не замедлять холодный старт бота. Узлы документа
+оборачиваются в общий интерфейс `HtmlNode`, поэтому функции разбора страниц не зависят от движка.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import Callable
+from enum import StrEnum
+from functools import cache
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Страницы больше этого размера (в символах) разбираются в пуле потоков, чтобы не блокировать цикл событий
+THREAD_PARSE_THRESHOLD = 32 * 1024
+
+
+class HtmlParserEngine(StrEnum):
+    """Движок разбора HTML."""
+
+    AUTO = "auto"
+    SELECTOLAX = "selectolax"
+    LXML = "lxml"
+    BS4 = "bs4"
+
+
+# Модули движков для фонового прогрева импорта после старта бота
+ENGINE_MODULES = {
+    HtmlParserEngine.SELECTOLAX: "selectolax.lexbor",
+    HtmlParserEngine.LXML: "lxml.html",
+    HtmlParserEngine.BS4: "bs4",
+}
+
+
+class HtmlNode(Protocol):
+    """Узел HTML-документа, не зависящий от движка разбора."""
+
+    def select(self, css: str, limit: int | None = None) -> list["HtmlNode"]:
+        """
+        Возвращает узлы, подходящие под CSS-селектор.
+
+        :param css: CSS-селектор.
+        :param limit: (Опционально) Максимальное количество узлов.
+        :return: Список узлов в порядке документа.
+        """
+        ...
+
+    def select_one(self, css: str) -> "HtmlNode | None":
+        """
+        Возвращает первый узел, подходящий под CSS-селектор.
+
+        :param css: CSS-селектор.
+        :return: Узел или `None`.
+        """
+        ...
+
+    def text(self) -> str:
+        """Возвращает текст узла без пробелов по краям."""
+        ...
+
+    def attr(self, name: str) -> str | None:
+        """
+        Возвращает значение атрибута узла.
+
+        :param name: Имя атрибута.
+        :return: Значение атрибута или `None`.
+        """
+        ...
+
+
+class _SelectolaxNode:
+    """Обёртка над узлом `selectolax`."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any) -> None:  # noqa: ANN401
+        self._node = node
+
+    def select(self, css: str, limit: int | None = None) -> list[HtmlNode]:
+        return [_SelectolaxNode(x) for x in self._node.css(css)[:limit]]
+
+    def select_one(self, css: str) -> HtmlNode | None:
+        node = self._node.css_first(css)
+        return _SelectolaxNode(node) if node is not None else None
+
+    def text(self) -> str:
+        return self._node.text(strip=True)
+
+    def attr(self, name: str) -> str | None:
+        return self._node.attributes.get(name)
+
+
+@cache
+def _lxml_selector(css: str) -> Callable[[Any], list]:
+    """
+    Компилирует CSS-селектор в XPath один раз на всё время работы процесса.
+
+    :param css: CSS-селектор.
+    :return: Скомпилированный селектор `lxml.cssselect.CSSSelector`.
+    """
+    from lxml.cssselect import CSSSelector  # noqa: PLC0415
+
+    return CSSSelector(css)
+
+
+class _LxmlNode:
+    """Обёртка над элементом `lxml`."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any) -> None:  # noqa: ANN401
+        self._node = node
+
+    def select(self, css: str, limit: int | None = None) -> list[HtmlNode]:
+        return [_LxmlNode(x) for x in _lxml_selector(css)(self._node)[:limit]]
+
+    def select_one(self, css: str) -> HtmlNode | None:
+        nodes = _lxml_selector(css)(self._node)
+        return _LxmlNode(nodes[0]) if nodes else None
+
+    def text(self) -> str:
+        return self._node.text_content().strip()
+
+    def attr(self, name: str) -> str | None:
+        return self._node.get(name)
+
+
+class _SoupNode:
+    """Обёртка над тегом `BeautifulSoup`."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any) -> None:  # noqa: ANN401
+        self._node = node
+
+    def select(self, css: str, limit: int | None = None) -> list[HtmlNode]:
+        # bs4 прекращает обход дерева, как только набрано `limit` узлов
+        return [_SoupNode(x) for x in self._node.select(css, limit=limit)]
+
+    def select_one(self, css: str) -> HtmlNode | None:
+        node = self._node.select_one(css)
+        return _SoupNode(node) if node is not None else None
+
+    def text(self) -> str:
+        return self._node.get_text(strip=True)
+
+    def attr(self, name: str) -> str | None:
+        return self._node.get(name)
+
+
+@cache
+def resolve_engine(engine: HtmlParserEngine = HtmlParserEngine.AUTO) -> HtmlParserEngine:
+    """
+    Определяет движок, который будет использоваться для разбора.
+
+    Для `AUTO` выбирается самый быстрый из установленных. Если явно указанный движок
+    не установлен, используется `bs4`.
+
+    :param engine: Запрошенный движок.
+    :return: Доступный движок.
+    """
+    available = {
+        HtmlParserEngine.SELECTOLAX: importlib.util.find_spec("selectolax") is not None,
+        HtmlParserEngine.LXML: all(importlib.util.find_spec(x) is not None for x in ("lxml", "cssselect")),
+        HtmlParserEngine.BS4: True,
+    }
+    if engine == HtmlParserEngine.AUTO:
+        return next(x for x, is_available in available.items() if is_available)
+    if not available[engine]:
+        logger.warning(f"HTML-парсер {engine} не установлен, используется {HtmlParserEngine.BS4}")
+        return HtmlParserEngine.BS4
+    return engine
+
+
+def parse_document(html: str, engine: HtmlParserEngine = HtmlParserEngine.AUTO) -> HtmlNode:
+    """
+    Разбирает HTML-документ выбранным движком.
+
+    :param html: Текст HTML-страницы.
+    :param engine: Движок разбора.
+    :return: Корневой узел документа.
+    """
+    match resolve_engine(engine):
+        case HtmlParserEngine.SELECTOLAX:
+            from selectolax.lexbor import LexborHTMLParser  # noqa: PLC0415
+
+            return _SelectolaxNode(LexborHTMLParser(html).root)
+        case HtmlParserEngine.LXML:
+            import lxml.html  # noqa: PLC0415
+
+            return _LxmlNode(lxml.html.document_fromstring(html))
+        case _:
+            from bs4 import BeautifulSoup  # noqa: PLC0415
+
+            return _SoupNode(BeautifulSoup(html, "html.parser"))
+
+
+async def parse_page[T](
+    parse_fn: Callable[[HtmlNode], T],
+    html: str,
+    engine: HtmlParserEngine = HtmlParserEngine.AUTO,
+) -> T:
+    """
+    Разбирает страницу и извлекает из неё данные.
+
+    Большие страницы разбираются в пуле потоков: построение дерева и CSS-запросы —
+    синхронная работа CPU, которая иначе блокирует цикл событий.
+
+    :param parse_fn: Чистая функция, извлекающая данные из корневого узла.
+    :param html: Текст HTML-страницы.
+    :param engine: Движок разбора.
+    :return: Результат `parse_fn`.
+    """
+
+    def _parse() -> T:
+        return parse_fn(parse_document(html, engine))
+
+    if len(html) > THREAD_PARSE_THRESHOLD:
+        return await asyncio.to_thread(_parse)
+    return _parse()
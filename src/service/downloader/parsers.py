@@ -0,0 +1,110 @@
+"""
+Модуль `parsers.py` содержит функции разбора страниц поиска источников.
+
+Функции чистые: принимают корневой узел документа (`HtmlNode`) и не выполняют ввод-вывод,
+поэтому одинаково работают с любым движком разбора и могут выполняться в пуле потоков.
+Обрабатываются только первые `max_results` блоков треков.
+"""
+
+from urllib.parse import urljoin
+
+from src.service.downloader.html_parser import HtmlNode
+
+PINKAMUZ_DOWNLOAD_BASE_URL = "https://track.pinkamuz.pro"
+
+
+def _parse_duration(text: str) -> int:
+    """
+    Переводит длительность вида `мм:сс` в секунды.
+
+    :param text: Длительность в виде строки.
+    :return: Длительность в секундах.
+    :raises ValueError: Если строка не в формате `мм:сс`.
+    """
+    mins, secs = map(int, text.split(":"))
+    return mins * 60 + secs
+
+
+def parse_pinkamuz_tracks(document: HtmlNode, max_results: int = 3) -> list[dict]:
+    """
+    Извлекает треки со страницы поиска Pinkamuz.
+
+    Блоки без названия, длительности или ссылки на mp3 пропускаются.
+
+    :param document: Корневой узел страницы поиска.
+    :param max_results: Максимальное количество обрабатываемых блоков.
+    :return: Список треков в виде словарей с исходными ссылками.
+    """
+    results = []
+    for block in document.select("div.track", limit=max_results):
+        # Название и артист
+        name_block = block.select_one("div.name-text")
+        if not name_block:
+            continue
+
+        artist_tag = name_block.select_one("span.artist")
+        title_tag = name_block.select_one("span.title")
+        if not artist_tag or not title_tag:
+            continue
+
+        # Длительность
+        time_tag = block.select_one("div.name-time")
+        if not time_tag:
+            continue
+
+        try:
+            duration = _parse_duration(time_tag.text())
+        except ValueError:
+            continue
+
+        # Ссылка на mp3
+        download_tag = block.select_one("a.link[href*='/download/']")
+        if not download_tag:
+            continue
+
+        results.append(
+            {
+                "title": f"{artist_tag.text()} - {title_tag.text()}",
+                "webpage_url": urljoin(PINKAMUZ_DOWNLOAD_BASE_URL, download_tag.attr("href")),
+                "duration": duration,
+            },
+        )
+    return results
+
+
+def parse_hitmo_tracks(document: HtmlNode, base_url: str, max_results: int = 3) -> list[dict]:
+    """
+    Извлекает треки со страницы поиска Hitmotop.
+
+    Блоки без названия, исполнителя, длительности или кнопки скачивания пропускаются.
+    Нераспознанная длительность считается нулевой.
+
+    :param document: Корневой узел страницы поиска.
+    :param base_url: Базовый URL сайта для относительных ссылок.
+    :param max_results: Максимальное количество обрабатываемых блоков.
+    :return: Список треков в виде словарей с исходными ссылками.
+    """
+    results = []
+    for track in document.select("li.tracks__item", limit=max_results):
+        title_tag = track.select_one("div.track__title")
+        artist_tag = track.select_one("div.track__desc")
+        length_tag = track.select_one("div.track__fulltime")
+        download_tag = track.select_one("a.track__download-btn")
+
+        if not (title_tag and artist_tag and length_tag and download_tag and download_tag.attr("href")):
+            continue
+
+        # конвертируем длительность в секунды
+        try:
+            duration = _parse_duration(length_tag.text())
+        except ValueError:
+            duration = 0
+
+        results.append(
+            {
+                "title": f"{artist_tag.text()} - {title_tag.text()}",
+                "webpage_url": urljoin(base_url, download_tag.attr("href")),
+                "duration": duration,
+            },
+        )
+    return results
@@ -0,0 +1,261 @@
+"""
+Модуль `prefetcher.py` содержит упреждающую фоновую загрузку треков из результатов поиска.
+
+Пока пользователь читает список найденных треков, первые `top_k` из них скачиваются во временные
+файлы. Если пользователь выбирает один из них, `DownloaderService.download_track` забирает уже
+скачанный (или докачивающийся) файл вместо новой загрузки.
+
+Ограничения:
+- количество одновременных упреждающих загрузок (общее для всех пользователей);
+- суммарный размер скачанных, но ещё не востребованных файлов: перед загрузкой резервируется
+  оценка размера трека, после — фактический размер, поэтому параллельные загрузки не превышают бюджет;
+- время жизни файла: невостребованные загрузки отменяются и удаляются.
+
+Загрузки пользователя отменяются, когда он выбирает трек или начинает новый поиск. Уже начатая
+загрузка не прерывается: отмена задачи не останавливает поток пула (yt-dlp), который продолжил бы
+писать файл. Такая загрузка держит слот и резерв бюджета до завершения, после чего её файл удаляется.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import gettempdir
+
+from aiogram import Bot
+
+from src.service.downloader.abstraction import DownloaderAbstractRepo
+from src.service.settings.config import PrefetchSettings
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_DIR = Path(gettempdir()) / "acrobeat_prefetch"
+
+
+PrefetchKey = tuple[int, str, str]
+
+
+@dataclass
+class PrefetchEntry:
+    """
+    Упреждающая загрузка одного трека.
+
+    :ivar path: Путь к временному файлу.
+    :ivar chat_id: ID чата, для которого запущена загрузка.
+    :ivar reserved: Байты бюджета, учтённые за загрузкой (резерв до её завершения, затем размер файла).
+    :ivar discarded: Загрузка больше не нужна; файл удаляется, как только она завершится.
+    :ivar task: Задача загрузки; возвращает путь к файлу или `None`, если загрузка не удалась.
+    """
+
+    path: Path
+    chat_id: int
+    reserved: int = 0
+    discarded: bool = False
+    task: asyncio.Task = field(init=False)
+
+
+@dataclass
+class TrackPrefetcher:
+    """
+    Упреждающая загрузка первых результатов поиска.
+
+    :ivar settings: Настройки упреждающей загрузки.
+    :ivar claims: Количество загрузок треков, выбранных пользователями.
+    :ivar hits: Количество загрузок, обслуженных упреждающей загрузкой.
+    :ivar wasted: Количество упреждающих загрузок, которые никто не забрал.
+    """
+
+    settings: PrefetchSettings
+    claims: int = 0
+    hits: int = 0
+    wasted: int = 0
+    _entries: dict[PrefetchKey, PrefetchEntry] = field(default_factory=dict, init=False)
+    _chat_keys: dict[int, set[PrefetchKey]] = field(default_factory=dict, init=False)
+    _disk_usage: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        """Создаёт семафор, ограничивающий количество одновременных загрузок."""
+        self._semaphore = asyncio.Semaphore(self.settings.max_concurrent)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля выбранных треков, которые уже были скачаны заранее."""
+        return self.hits / self.claims if self.claims else 0.0
+
+    @property
+    def disk_budget(self) -> int:
+        """Бюджет на размер невостребованных файлов в байтах."""
+        return self.settings.disk_budget_mb * 1024 * 1024
+
+    @property
+    def reserve_size(self) -> int:
+        """Оценка размера трека в байтах, резервируемая в бюджете до начала загрузки."""
+        return self.settings.reserve_mb * 1024 * 1024
+
+    def schedule(self, chat_id: int, repo: DownloaderAbstractRepo, bot: Bot, track_urls: list[str]) -> None:
+        """
+        Запускает упреждающую загрузку первых треков из результатов поиска.
+
+        Незавершённые загрузки этого чата по предыдущему поиску отменяются.
+
+        :param chat_id: ID чата, которому показаны результаты.
+        :param repo: Источник, в котором найдены треки.
+        :param bot: Экземпляр бота Aiogram.
+        :param track_urls: Исходные ссылки на треки в порядке показа.
+        """
+        if not self.settings.enabled:
+            return
+
+        self.cancel_chat(chat_id)
+        loop = asyncio.get_running_loop()
+        for track_url in track_urls[: self.settings.top_k]:
+            key = (chat_id, repo.alias, track_url)
+            if key in self._entries:
+                continue
+            entry = PrefetchEntry(path=PREFETCH_DIR / f"{uuid.uuid4()}.mp3", chat_id=chat_id)
+            entry.task = asyncio.create_task(self._prefetch(repo, bot, track_url, entry))
+            self._entries[key] = entry
+            self._chat_keys.setdefault(chat_id, set()).add(key)
+            loop.call_later(self.settings.ttl, self._expire, key, entry)
+
+    async def claim(self, chat_id: int, repo_alias: str, track_url: str) -> Path | None:
+        """
+        Забирает заранее скачанный трек, выбранный пользователем.
+
+        Если загрузка ещё идёт, дожидается её. Загрузка, которая ещё ждёт слота за упреждающими
+        загрузками других чатов, отменяется: прямая загрузка выбранного трека будет быстрее.
+        Остальные загрузки чата отменяются.
+
+        :param chat_id: ID чата, в котором выбран трек.
+        :param repo_alias: Алиас источника.
+        :param track_url: Исходная ссылка на трек.
+        :return: Путь к скачанному файлу (переходит во владение вызывающего) или `None`.
+        """
+        if not self.settings.enabled:
+            return None
+
+        key = (chat_id, repo_alias, track_url)
+        entry = self._entries.pop(key, None)
+        self._chat_keys.get(chat_id, set()).discard(key)
+        self.cancel_chat(chat_id)
+        self.claims += 1
+        if entry is not None and not entry.task.done() and not entry.reserved:
+            entry.task.cancel()
+            entry = None
+
+        path = None
+        if entry is not None:
+            try:
+                path = await entry.task
+            except Exception:  # noqa: BLE001
+                path = None
+        if path is not None:
+            # Файл переходит во владение вызывающего и больше не занимает бюджет
+            self._release(entry)
+            self.hits += 1
+
+        logger.info(
+            f"Prefetch {'hit' if path else 'miss'} for {repo_alias} in chat {chat_id}, hit ratio {self.hit_ratio:.0%}",
+        )
+        return path
+
+    def cancel_chat(self, chat_id: int) -> None:
+        """
+        Отменяет все упреждающие загрузки чата и удаляет их файлы.
+
+        :param chat_id: ID чата.
+        """
+        for key in self._chat_keys.pop(chat_id, set()):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._discard(entry)
+
+    async def close(self) -> None:
+        """Отменяет все упреждающие загрузки, дожидается начатых и удаляет их файлы."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        self._chat_keys.clear()
+        for entry in entries:
+            self._discard(entry)
+        await asyncio.gather(*(x.task for x in entries), return_exceptions=True)
+
+    async def _prefetch(
+        self,
+        repo: DownloaderAbstractRepo,
+        bot: Bot,
+        track_url: str,
+        entry: PrefetchEntry,
+    ) -> Path | None:
+        """
+        Скачивает трек во временный файл с учётом ограничений.
+
+        Слот семафора и резерв бюджета занимаются до начала загрузки и освобождаются только после
+        её завершения. Если за это время загрузка стала не нужна, файл удаляется здесь же.
+
+        :param repo: Источник трека.
+        :param bot: Экземпляр бота Aiogram.
+        :param track_url: Исходная ссылка на трек.
+        :param entry: Загрузка.
+        :return: Путь к файлу или `None`, если бюджет исчерпан, загрузка не удалась или больше не нужна.
+        """
+        async with self._semaphore:
+            if self._disk_usage + self.reserve_size > self.disk_budget:
+                logger.debug(f"Prefetch skipped for {repo.alias}: disk budget exhausted")
+                return None
+            entry.reserved = self.reserve_size
+            self._disk_usage += entry.reserved
+            entry.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                await repo.download_track(bot, track_url, entry.path)
+            except Exception as e:  # noqa: BLE001
+                logger.debug(f"Prefetch failed for {repo.alias}: {e}")
+
+            size = entry.path.stat().st_size if entry.path.exists() else 0
+            if entry.discarded or not size or self._disk_usage - entry.reserved + size > self.disk_budget:
+                self._release(entry)
+                entry.path.unlink(missing_ok=True)
+                return None
+            self._disk_usage += size - entry.reserved
+            entry.reserved = size
+            return entry.path
+
+    def _expire(self, key: PrefetchKey, entry: PrefetchEntry) -> None:
+        """
+        Удаляет невостребованную загрузку по истечении времени жизни.
+
+        :param key: Ключ загрузки (ID чата, алиас источника, ссылка).
+        :param entry: Загрузка, для которой был запланирован таймер.
+        """
+        if self._entries.get(key) is not entry:
+            return
+        del self._entries[key]
+        self._chat_keys.get(entry.chat_id, set()).discard(key)
+        self._discard(entry)
+
+    def _release(self, entry: PrefetchEntry) -> None:
+        """
+        Возвращает в бюджет байты, учтённые за загрузкой.
+
+        :param entry: Загрузка.
+        """
+        self._disk_usage -= entry.reserved
+        entry.reserved = 0
+
+    def _discard(self, entry: PrefetchEntry) -> None:
+        """
+        Отменяет загрузку и удаляет её файл.
+
+        Загрузка, ещё ждущая слота, отменяется сразу. Начатая загрузка доводится до конца
+        и удаляет файл сама (см. `_prefetch`).
+
+        :param entry: Загрузка.
+        """
+        self.wasted += 1
+        entry.discarded = True
+        if not entry.task.done():
+            if not entry.reserved:
+                entry.task.cancel()
+            return
+        self._release(entry)
+        entry.path.unlink(missing_ok=True)
@@ -10,24 +10,27 @@
 
 Каждый репозиторий реализует интерфейс `DownloaderAbstractRepo`,
  предоставляя методы `find_tracks_on_phrase` и `download_track`.
+
+Тяжёлые библиотеки `yt_dlp` и HTML-парсеры импортируются лениво внутри методов,
+ чтобы не замедлять холодный старт бота. Разбор страниц поиска вынесен в `parsers.py`.
 """
 
 import asyncio
 import logging
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from urllib.parse import quote, urljoin
+from urllib.parse import quote
 
 import aiofiles
 import httpx
 from aiogram import Bot
-from bs4 import BeautifulSoup
-from yt_dlp import YoutubeDL
-from yt_dlp.utils import DownloadError  # Исправленный импорт исключения
 
 from src.service.downloader.abstraction import DownloaderAbstractRepo
-from src.service.downloader.cache_repository import DownloaderCacheRepo
+from src.service.downloader.html_parser import parse_page
+from src.service.downloader.parsers import parse_hitmo_tracks, parse_pinkamuz_tracks
 from src.service.settings.config import Settings
+from src.service.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +44,6 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
     """
 
     settings: Settings
-    cache_repository: DownloaderCacheRepo
     priority: int = 11
 
     @property
@@ -57,6 +59,9 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
         :param output_path: Путь к выходному файлу (без расширения).
         :raises DownloadError: Если произошла ошибка загрузки.
         """
+        from yt_dlp import YoutubeDL  # noqa: PLC0415
+        from yt_dlp.utils import DownloadError  # noqa: PLC0415
+
         ydl_opts = {
             "format": "bestaudio/best",
             "outtmpl": output_path.with_suffix("").as_posix(),
@@ -92,12 +97,15 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
         :param output_path: Путь к выходному файлу.
         :return: `None` при успешной загрузке, или `None` при ошибке.
         """
+        from yt_dlp.utils import DownloadError  # noqa: PLC0415
+
         loop = asyncio.get_event_loop()
         try:
-            await asyncio.wait_for(
-                loop.run_in_executor(None, self._download, url, output_path),
-                timeout=30,
-            )
+            with span("yt_dlp.download"):
+                await asyncio.wait_for(
+                    loop.run_in_executor(None, self._download, url, output_path),
+                    timeout=30,
+                )
         except asyncio.TimeoutError:  # noqa: UP041
             logger.exception("⏱️ Превышено время ожидания")
         except DownloadError:
@@ -116,6 +124,8 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
         :param max_results: Максимальное количество результатов.
         :return: Список найденных треков в виде словарей.
         """
+        from yt_dlp import YoutubeDL  # noqa: PLC0415
+
         ydl_opts = {
             "quiet": True,
             "extract_flat": "in_playlist",  # не скачиваем, только метаданные
@@ -136,16 +146,19 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
         Асинхронный поиск треков по ключевой фразе.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата для кэширования ссылки.
-        :return: Список найденных треков или `None` при ошибке.
+        :param chat_id: ID чата, из которого пришёл запрос.
+        :return: Список найденных треков (пустой, если ничего не найдено) или `None` при ошибке.
         """
+        from yt_dlp.utils import DownloadError  # noqa: PLC0415
+
         loop = asyncio.get_event_loop()
 
         try:
-            results = await asyncio.wait_for(
-                loop.run_in_executor(None, self._search_track, query, chat_id, 3),
-                timeout=30,
-            )
+            with span("yt_dlp.extract_info"):
+                results = await asyncio.wait_for(
+                    loop.run_in_executor(None, self._search_track, query, chat_id, 3),
+                    timeout=30,
+                )
         except TimeoutError:
             logger.exception("⏱️ Превышено время ожидания")
             return None
@@ -153,14 +166,10 @@ class DownloaderRepoYT(DownloaderAbstractRepo):
             logger.exception("⚠️ Ошибка загрузки")
             return None
 
-        if not results:
-            return None
-
+        # Пустая выдача — нормальный ответ источника, а не ошибка: выключатель от неё не размыкается
+        results = results or []
         for item in results:
-            item["webpage_url"] = await self.cache_repository.set_track_url(
-                item["url"],
-                chat_id,
-            )
+            item["webpage_url"] = item["url"]
 
         return results
 
@@ -174,7 +183,6 @@ class DownloaderRepoPinkamuz(DownloaderAbstractRepo):
     """
 
     settings: Settings
-    cache_repository: DownloaderCacheRepo
     base_url: str = "https://pinkamuz.pro"
     priority: int = 10
 
@@ -191,81 +199,48 @@ class DownloaderRepoPinkamuz(DownloaderAbstractRepo):
             "Referer": self.base_url,
         }
 
+    def search_url(self, query: str) -> str:
+        """
+        Формирует адрес страницы поиска.
+
+        :param query: Ключевая фраза для поиска.
+        :return: URL страницы поиска.
+        """
+        return f"{self.base_url}/search/{quote(query)}"
+
     async def _search_track(
         self,
         query: str,
-        chat_id: int,
+        chat_id: int,  # noqa: ARG002
         max_results: int = 3,
     ) -> list[dict]:
         """
         Поиск треков на сайте Pinkamuz по ключевой фразе.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата для кэширования ссылки.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :param max_results: Максимальное количество результатов.
         :return: Список найденных треков в виде словарей.
         """
-        search_url = f"{self.base_url}/search/{quote(query)}"
+        search_url = self.search_url(query)
 
         async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
             response = await client.get(search_url, headers=self.headers)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            track_blocks = soup.select("div.track")[:max_results]
-
-            results = []
-            for block in track_blocks:
-                # Название и артист
-                name_block = block.select_one("div.name-text")
-                if not name_block:
-                    continue
-
-                artist_tag = name_block.select_one("span.artist")
-                title_tag = name_block.select_one("span.title")
-                if not artist_tag or not title_tag:
-                    continue
-
-                title = f"{artist_tag.get_text(strip=True)} - {title_tag.get_text(strip=True)}"
-
-                # Длительность
-                time_tag = block.select_one("div.name-time")
-                if not time_tag:
-                    continue
-
-                try:
-                    mins, secs = map(int, time_tag.get_text(strip=True).split(":"))
-                    duration = mins * 60 + secs
-                except ValueError:
-                    continue
-
-                # Ссылка на mp3
-                download_tag = block.select_one("a.link[href*='/download/']")
-                if not download_tag:
-                    continue
-
-                href = download_tag.get("href")
-                full_url = urljoin("https://track.pinkamuz.pro", href)
-                url_cache_id = await self.cache_repository.set_track_url(
-                    full_url,
-                    chat_id,
-                )
-                results.append(
-                    {
-                        "title": title,
-                        "webpage_url": url_cache_id,
-                        "duration": duration,
-                    },
-                )
-
-            return results
+        with span("html.parse", source=self.alias, size=len(response.text)):
+            return await parse_page(
+                partial(parse_pinkamuz_tracks, max_results=max_results),
+                response.text,
+                self.settings.search.html_parser,
+            )
 
     async def find_tracks_on_phrase(self, query: str, chat_id: int) -> list[dict]:
         """
         Асинхронный поиск треков на сайте Pinkamuz.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата для кэширования ссылки.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :return: Список найденных треков.
         """
         return await self._search_track(query=query, chat_id=chat_id)
@@ -304,6 +279,7 @@ class TelegramDownloaderRepo(DownloaderAbstractRepo):
     """
 
     priority = -100
+    searchable = False
 
     @property
     def alias(self) -> str:
@@ -336,8 +312,9 @@ class TelegramDownloaderRepo(DownloaderAbstractRepo):
         :raises RuntimeError: При ошибке загрузки.
         """
         try:
-            file = await bot.get_file(file_id)
-            await bot.download_file(file.file_path, destination=output_path)
+            with span("telegram.download_file"):
+                file = await bot.get_file(file_id)
+                await bot.download_file(file.file_path, destination=output_path)
         except Exception as e:  # noqa: BLE001
             msg = f"Ошибка при загрузке файла из Telegram: {e}"
             raise RuntimeError(msg)
@@ -352,7 +329,6 @@ class DownloaderRepoHitmo(DownloaderAbstractRepo):
     """
 
     settings: Settings
-    cache_repository: DownloaderCacheRepo
     base_url: str = "https://rus.hitmotop.com"
     priority: int = 5
 
@@ -377,72 +353,48 @@ class DownloaderRepoHitmo(DownloaderAbstractRepo):
             "Upgrade-Insecure-Requests": "1",
         }
 
+    def search_url(self, query: str) -> str:
+        """
+        Формирует адрес страницы поиска.
+
+        :param query: Ключевая фраза для поиска.
+        :return: URL страницы поиска.
+        """
+        return f"{self.base_url}/search?q={quote(query)}"
+
     async def _search_track(
         self,
         query: str,
-        chat_id: int,
+        chat_id: int,  # noqa: ARG002
         max_results: int = 3,
     ) -> list[dict]:
         """
         Поиск треков на сайте Hitmotop по ключевой фразе.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата для кэширования ссылки.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :param max_results: Максимальное количество результатов.
         :return: Список найденных треков в виде словарей.
         """
-        search_url = f"{self.base_url}/search?q={quote(query)}"
+        search_url = self.search_url(query)
 
         async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
             response = await client.get(search_url, headers=self.headers)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            tracks = soup.select("li.tracks__item")[:max_results]
-
-            results = []
-            for track in tracks:
-                title_tag = track.select_one("div.track__title")
-                artist_tag = track.select_one("div.track__desc")
-                length_tag = track.select_one("div.track__fulltime")
-                download_tag = track.select_one("a.track__download-btn")
-
-                if not (title_tag and artist_tag and length_tag and download_tag):
-                    continue
-
-                title = title_tag.get_text(strip=True)
-                artist = artist_tag.get_text(strip=True)
-                length_str = length_tag.get_text(strip=True)
-
-                # конвертируем длительность в секунды
-                try:
-                    mins, secs = map(int, length_str.split(":"))
-                    duration = mins * 60 + secs
-                except ValueError:
-                    duration = 0
-
-                download_url = urljoin(self.base_url, download_tag["href"])
-                url_cache_id = await self.cache_repository.set_track_url(
-                    download_url,
-                    chat_id,
-                )
-
-                results.append(
-                    {
-                        "title": f"{artist} - {title}",
-                        "webpage_url": url_cache_id,
-                        "duration": duration,
-                    },
-                )
-
-            return results
+        with span("html.parse", source=self.alias, size=len(response.text)):
+            return await parse_page(
+                partial(parse_hitmo_tracks, base_url=self.base_url, max_results=max_results),
+                response.text,
+                self.settings.search.html_parser,
+            )
 
     async def find_tracks_on_phrase(self, query: str, chat_id: int) -> list[dict]:
         """
         Асинхронный поиск треков на сайте Hitmotop.
 
         :param query: Ключевая фраза для поиска.
-        :param chat_id: ID чата для кэширования ссылки.
+        :param chat_id: ID чата, из которого пришёл запрос.
         :return: Список найденных треков.
         """
         return await self._search_track(query=query, chat_id=chat_id)
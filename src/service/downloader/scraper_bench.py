@@ -0,0 +1,270 @@
+"""
+Модуль `scraper_bench.py` — офлайн-замер и регрессионная проверка скраперов Pinkamuz и Hitmotop.
+
+Корпус фикстур лежит в `fixtures/scrapers/<алиас>/`: страница поиска `<запрос>.html` и рядом
+ожидаемый результат разбора `<запрос>.json`. Ожидаемый результат записывается эталонным движком
+(`bs4`) при сохранении страницы и проверяется глазами перед коммитом.
+
+Команды:
+- `record <запрос> [<запрос> ...]` — сохраняет живые страницы поиска и ожидаемые результаты в корпус;
+- `run [--rounds N]` — для каждой фикстуры:
+  - сравнивает результаты разбора всеми установленными движками с ожидаемыми (расхождение — ошибка);
+  - замеряет время разбора (медиана и p95) и пик выделенной памяти (`tracemalloc`) по движкам;
+  - замеряет полную задержку `find_tracks_on_phrase` против локального HTTP-сервера,
+    отдающего фикстуры вместо сайтов.
+
+Пустой корпус — ошибка. Те же проверки и замеры в виде набора `pytest-benchmark` лежат
+в `tests/scrapers/` и запускаются через `make test` и `make scrapers-bench`.
+
+Запуск: `make scrapers-record <запрос>` или `python -m src.service.downloader.scraper_bench ...`.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import httpx
+
+from src.service.downloader.html_parser import HtmlNode, HtmlParserEngine, parse_document, resolve_engine
+from src.service.downloader.parsers import parse_hitmo_tracks, parse_pinkamuz_tracks
+from src.service.downloader.repository import DownloaderRepoHitmo, DownloaderRepoPinkamuz
+from src.service.settings.config import Settings, get_settings
+from src.service.settings.logger.logger_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parents[3] / "fixtures" / "scrapers"
+# Движок, которым записываются ожидаемые результаты разбора
+REFERENCE_ENGINE = HtmlParserEngine.BS4
+
+SourceRepo = DownloaderRepoPinkamuz | DownloaderRepoHitmo
+
+
+def create_repos(settings: Settings, base_url: str | None = None) -> list[SourceRepo]:
+    """
+    Создаёт репозитории источников.
+
+    :param settings: Настройки приложения (движок разбора HTML).
+    :param base_url: (Опционально) Адрес локального сервера; к нему добавляется алиас источника.
+    :return: Репозитории Pinkamuz и Hitmotop.
+    """
+    repos: list[SourceRepo] = [DownloaderRepoPinkamuz(settings), DownloaderRepoHitmo(settings)]
+    if base_url:
+        for repo in repos:
+            repo.base_url = f"{base_url}/{repo.alias}"
+    return repos
+
+
+def source_parse_fn(repo: SourceRepo) -> Callable[[HtmlNode], list[dict]]:
+    """
+    Возвращает функцию разбора страницы поиска источника.
+
+    :param repo: Репозиторий источника.
+    :return: Чистая функция разбора.
+    """
+    if isinstance(repo, DownloaderRepoHitmo):
+        return partial(parse_hitmo_tracks, base_url=repo.base_url)
+    return parse_pinkamuz_tracks
+
+
+def _fixture_path(alias: str, query: str) -> Path:
+    """
+    Возвращает путь к фикстуре страницы поиска.
+
+    :param alias: Алиас источника.
+    :param query: Текст запроса.
+    :return: Путь к HTML-файлу.
+    """
+    return FIXTURES_DIR / alias / f"{quote(query, safe='')}.html"
+
+
+def iter_fixtures(alias: str) -> Iterator[tuple[str, str, list[dict]]]:
+    """
+    Перебирает фикстуры источника.
+
+    :param alias: Алиас источника.
+    :return: Итератор троек (текст запроса, HTML-страница, ожидаемый результат разбора).
+    """
+    for path in sorted((FIXTURES_DIR / alias).glob("*.html")):
+        expected = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        yield unquote(path.stem), path.read_text(encoding="utf-8"), expected
+
+
+def save_fixture(repo: SourceRepo, query: str, html: str) -> Path:
+    """
+    Сохраняет страницу поиска и её результат разбора эталонным движком в корпус фикстур.
+
+    :param repo: Репозиторий источника.
+    :param query: Текст запроса.
+    :param html: HTML-страница.
+    :return: Путь к HTML-файлу.
+    """
+    path = _fixture_path(repo.alias, query)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding="utf-8")
+    expected = source_parse_fn(repo)(parse_document(html, REFERENCE_ENGINE))
+    path.with_suffix(".json").write_text(json.dumps(expected, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+async def record(queries: list[str]) -> None:
+    """
+    Сохраняет живые страницы поиска в корпус фикстур.
+
+    :param queries: Тексты запросов.
+    """
+    async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
+        for repo in create_repos(get_settings()):
+            for query in queries:
+                response = await client.get(repo.search_url(query), headers=repo.headers)
+                response.raise_for_status()
+                path = save_fixture(repo, query, response.text)
+                logger.info(f"Сохранена фикстура {path} ({len(response.text)} символов)")
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Отдаёт фикстуры по адресам `/<алиас>/search/<запрос>` и `/<алиас>/search?q=<запрос>`."""
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        alias, _, rest = url.path.lstrip("/").partition("/")
+        query = parse_qs(url.query).get("q", [""])[0] or unquote(rest.removeprefix("search/"))
+        path = _fixture_path(alias, query)
+        if not path.exists():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        """Отключает журнал запросов `http.server`."""
+
+
+@contextmanager
+def fixture_server() -> Iterator[str]:
+    """
+    Запускает локальный HTTP-сервер с фикстурами в отдельном потоке.
+
+    :return: Базовый адрес сервера.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _timings(samples: list[float]) -> str:
+    """
+    Форматирует замеры времени.
+
+    :param samples: Замеры в секундах.
+    :return: Строка с медианой и p95 в миллисекундах.
+    """
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+    return f"медиана {statistics.median(samples) * 1000:.2f} мс, p95 {p95 * 1000:.2f} мс"
+
+
+def bench_parsing(rounds: int) -> bool:
+    """
+    Замеряет разбор фикстур всеми установленными движками и сверяет результаты с ожидаемыми.
+
+    :param rounds: Количество повторов разбора.
+    :return: `True`, если корпус не пуст и все движки дали ожидаемый результат.
+    """
+    engines = {resolve_engine(x) for x in HtmlParserEngine if x != HtmlParserEngine.AUTO}
+    consistent = True
+    fixtures_count = 0
+    for repo in create_repos(get_settings()):
+        parse_fn = source_parse_fn(repo)
+        for query, html, expected in iter_fixtures(repo.alias):
+            fixtures_count += 1
+            for engine in sorted(engines):
+                result = parse_fn(parse_document(html, engine))
+                if result != expected:
+                    consistent = False
+                    logger.error(f"[{repo.alias}] '{query}': {engine} разошёлся с ожидаемым результатом")
+
+                samples = []
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    parse_fn(parse_document(html, engine))
+                    samples.append(time.perf_counter() - started)
+
+                tracemalloc.start()
+                parse_fn(parse_document(html, engine))
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                logger.info(
+                    f"[{repo.alias}] '{query}' {engine}: {len(result)} треков, "
+                    f"{_timings(samples)}, пик памяти {peak / 1024:.0f} КиБ",
+                )
+    if not fixtures_count:
+        logger.error(f"Корпус фикстур {FIXTURES_DIR} пуст: нечего проверять")
+        return False
+    return consistent
+
+
+async def bench_end_to_end(rounds: int) -> None:
+    """
+    Замеряет полную задержку поиска против локального сервера с фикстурами.
+
+    :param rounds: Количество повторов поиска.
+    """
+    with fixture_server() as base_url:
+        for repo in create_repos(get_settings(), base_url):
+            for query, *_ in iter_fixtures(repo.alias):
+                samples = []
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    await repo.find_tracks_on_phrase(query, chat_id=0)
+                    samples.append(time.perf_counter() - started)
+                logger.info(f"[{repo.alias}] '{query}' find_tracks_on_phrase: {_timings(samples)}")
+
+
+def main() -> int:
+    """
+    Разбирает аргументы командной строки и выполняет команду.
+
+    :return: Код завершения процесса.
+    """
+    parser = argparse.ArgumentParser(description="Офлайн-замер скраперов источников")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Сохранить живые страницы поиска в фикстуры")
+    record_parser.add_argument("queries", nargs="+")
+    run_parser = commands.add_parser("run", help="Замерить разбор и поиск по фикстурам")
+    run_parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.queries))
+        return 0
+
+    consistent = bench_parsing(args.rounds)
+    asyncio.run(bench_end_to_end(max(args.rounds // 10, 1)))
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    configure_logging()
+    sys.exit(main())
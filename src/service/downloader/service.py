@@ -3,26 +3,40 @@
 
 Сервис использует репозитории, реализующие интерфейс `DownloaderAbstractRepo`, для выполнения
 поиска треков по ключевым фразам и их загрузки. Также используется кэширующий репозиторий,
-который позволяет избегать повторного обработки уже загруженных треков.
+который позволяет избегать повторного обработки уже загруженных треков и повторного поиска
+по запросам, совпадающим после нормализации.
 """
 
+import asyncio
 import logging
+import time
 import uuid
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass, field
 from pathlib import Path
 from tempfile import gettempdir
 
 from aiogram import Bot
-from yt_dlp.utils import DownloadError
 
 from src.domains.common.message_processing import processing_msg
+from src.domains.tracks.query_normalizer import QueryNormalizer
 from src.domains.tracks.schemas import DownloadTrackParams, RepoTracks, Track
 from src.service.downloader.abstraction import DownloaderAbstractRepo
 from src.service.downloader.cache_repository import DownloaderCacheRepo
+from src.service.downloader.circuit_breaker import CircuitBreakerRegistry
+from src.service.downloader.prefetcher import TrackPrefetcher
+from src.service.downloader.source_router import HedgeBudget, SearchOutcome, SourceRouter
+from src.service.metrics import SOURCE_LATENCY
 from src.service.settings.config import Settings
+from src.service.tracing import set_span_attributes, span, traced
 
 logger = logging.getLogger(__name__)
 
+SEARCH_SPINNER_MSG = """
+                🔎 Ищу трек…{spinner_item}\n(это может занять несколько секунд ⏳)
+                """
+
 
 @dataclass
 class DownloaderService:
@@ -31,6 +45,11 @@ class DownloaderService:
     external_repository: list[DownloaderAbstractRepo]
     cache_repository: DownloaderCacheRepo
     settings: Settings
+    normalizer: QueryNormalizer = field(default_factory=QueryNormalizer)
+    prefetcher: TrackPrefetcher | None = None
+    source_router: SourceRouter = field(default_factory=SourceRouter)
+    hedge_budget: HedgeBudget = field(default_factory=HedgeBudget)
+    circuit_breakers: CircuitBreakerRegistry | None = None
 
     def _get_repo(self, repo_alias: str) -> DownloaderAbstractRepo:
         """
@@ -42,58 +61,233 @@ class DownloaderService:
         """
         return next(x for x in self.external_repository if x.alias == repo_alias)
 
+    @property
+    def search_repositories(self) -> list[DownloaderAbstractRepo]:
+        """Источники, в которых выполняется поиск, — без источников только для загрузки."""
+        return [x for x in self.external_repository if x.searchable]
+
+    @traced("downloader.find_tracks_on_phrase")
     async def find_tracks_on_phrase(
         self,
         phrase: str,
         bot: Bot,
         chat_id: int,
-        skip_repo_alias: str | None = None,
+        skip_repo_aliases: Collection[str] = (),
     ) -> RepoTracks | None:
         """
         Ищет треки по заданной фразе в доступных репозиториях.
 
-        При поиске отображается индикатор загрузки. Если репозиторий был указан как `skip_repo_alias`,
-        он будет пропущен при поиске.
+        При поиске отображается индикатор загрузки. Порядок опроса источников строится
+        маршрутизатором по их скользящей статистике; источники из `skip_repo_aliases`, источники
+        только для загрузки и источники с разомкнутым выключателем пропускаются. Если разомкнуты
+        выключатели всех оставшихся источников, опрашивается разомкнутый раньше остальных, а не
+        возвращается «ничего не найдено» без единого запроса. Медленный ответ источника дублируется запросом
+        в следующий источник (см. `_hedged_search`).
+        Результаты каждого источника кэшируются по нормализованному тексту запроса,
+        а в сам источник передаётся исходная фраза. Если включена упреждающая загрузка,
+        первые найденные треки начинают скачиваться сразу.
 
         :param phrase: Фраза для поиска треков.
         :param bot: Экземпляр бота Aiogram для отправки сообщений.
         :param chat_id: ID чата, в котором будет отображаться индикатор.
-        :param skip_repo_alias: (Опционально) Алиас репозитория, который нужно пропустить.
+        :param skip_repo_aliases: (Опционально) Алиасы репозиториев, которые нужно пропустить.
         :return: Найденные треки в формате `RepoTracks` или `None`, если ничего не найдено.
         """
         logger.debug(f"Searching for tracks on phrase '{phrase}'")
+        query_key = self.normalizer.normalize(phrase)
 
-        # Сортируем репозитории по приоритету
-        self.external_repository.sort(key=lambda x: x.priority)
+        # План строится на каждый запрос: сервис общий для всех апдейтов
+        # и не должен хранить состояние конкретного поиска.
+        planned = self.source_router.plan(self.search_repositories, skip_repo_aliases)
+        repositories = [
+            x for x in planned if self.circuit_breakers is None or self.circuit_breakers.is_available(x.alias)
+        ]
+        if planned and not repositories:
+            fallback = self.circuit_breakers.least_recently_opened(planned)
+            logger.warning(f"Выключатели всех источников разомкнуты, поиск в {fallback.alias}")
+            repositories = [fallback]
+        skipped = list(skip_repo_aliases)
+        pending = deque(repositories)
 
-        if skip_repo_alias:
-            skip_repo = self._get_repo(skip_repo_alias)
-            skip_index_repo = self.external_repository.index(skip_repo) + 1
-            self.external_repository = self.external_repository[skip_index_repo:]
-
-        for _idx, repo in enumerate(self.external_repository):
-            logger.debug(f"Поиск в источнике {repo.alias}, {phrase=}")
+        while pending:
+            repo = pending.popleft()
+            logger.debug(f"Поиск в источнике {repo.alias}, {phrase=}, {query_key=}")
             try:
-                spinner_msg = """
-                🔎 Ищу трек…{spinner_item}\n(это может занять несколько секунд ⏳)
-                """
-                founded_tracks = await processing_msg(
-                    repo.find_tracks_on_phrase,
-                    (phrase, chat_id),
-                    bot=bot,
-                    chat_id=chat_id,
-                    spinner_msg=spinner_msg,
-                )
-                if founded_tracks:
-                    return RepoTracks(
-                        tracks=[Track.model_validate(x) for x in founded_tracks],
-                        repo_alias=repo.alias,
+                cached_tracks = await self.cache_repository.get_search_results(repo.alias, query_key)
+                if cached_tracks is not None:
+                    results = [(repo, cached_tracks)]
+                else:
+                    results = await processing_msg(
+                        self._hedged_search,
+                        (repo, pending[0] if pending else None, phrase, query_key, chat_id),
+                        bot=bot,
+                        chat_id=chat_id,
+                        spinner_msg=SEARCH_SPINNER_MSG,
                     )
+                for searched_repo, founded_tracks in results:
+                    if searched_repo in pending:
+                        pending.remove(searched_repo)
+                    if founded_tracks:
+                        if self.prefetcher is not None:
+                            track_urls = [x["webpage_url"] for x in founded_tracks]
+                            self.prefetcher.schedule(chat_id, searched_repo, bot, track_urls)
+                        return RepoTracks(
+                            tracks=await self._link_tracks(founded_tracks, chat_id),
+                            repo_alias=searched_repo.alias,
+                            skipped=skipped,
+                        )
+                    skipped.append(searched_repo.alias)
             except Exception as error:
                 logger.exception(f"Ошибка в {repo.alias}: {error}")  # noqa: TRY401
-                continue
+                skipped.append(repo.alias)
         return None
 
+    async def _hedged_search(
+        self,
+        repo: DownloaderAbstractRepo,
+        hedge_repo: DownloaderAbstractRepo | None,
+        phrase: str,
+        query_key: str,
+        chat_id: int,
+    ) -> list[tuple[DownloaderAbstractRepo, list[dict] | None]]:
+        """
+        Выполняет поиск в источнике, при медленном ответе дублируя запрос в следующий источник.
+
+        Если источник не ответил за свой скользящий перцентиль задержки и бюджет дублирования
+        не исчерпан, параллельно запускается поиск в `hedge_repo`. Возвращается первый ответ
+        с треками, оставшийся поиск отменяется.
+
+        :param repo: Основной источник.
+        :param hedge_repo: Следующий источник по плану или `None`, если дублировать некуда.
+        :param phrase: Исходная фраза для поиска.
+        :param query_key: Нормализованный текст запроса для ключа кэша.
+        :param chat_id: ID чата, из которого пришёл запрос.
+        :return: Завершившиеся поиски в порядке ответа: пары (источник, треки или `None`).
+            Последняя пара содержит треки, если они найдены.
+        """
+        tasks = {asyncio.create_task(self._search_in_repo(repo, phrase, query_key, chat_id)): repo}
+        results = []
+        try:
+            if hedge_repo is not None and self.hedge_budget.ratio > 0:
+                self.hedge_budget.record_search()
+                hedge_delay = self.source_router.hedge_delay(repo.alias, self.settings.search.hedge_percentile)
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done and self.hedge_budget.try_acquire():
+                    set_span_attributes(hedged_source=hedge_repo.alias)
+                    logger.info(
+                        f"Источник {repo.alias} не ответил за {hedge_delay:.2f}s, дублируем поиск в {hedge_repo.alias}",
+                    )
+                    hedge_task = asyncio.create_task(self._search_in_repo(hedge_repo, phrase, query_key, chat_id))
+                    tasks[hedge_task] = hedge_repo
+
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                # При одновременном ответе предпочитаем основной источник
+                for task in [x for x in tasks if x in done]:
+                    searched_repo = tasks.pop(task)
+                    results.append((searched_repo, task.result()))
+                    if results[-1][1]:
+                        return results
+            return results
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _search_in_repo(
+        self,
+        repo: DownloaderAbstractRepo,
+        phrase: str,
+        query_key: str,
+        chat_id: int,
+    ) -> list[dict] | None:
+        """
+        Выполняет поиск в источнике и кэширует результат.
+
+        Ошибки источника логгируются и не выбрасываются.
+
+        :param repo: Источник треков.
+        :param phrase: Исходная фраза для поиска.
+        :param query_key: Нормализованный текст запроса для ключа кэша.
+        :param chat_id: ID чата, из которого пришёл запрос.
+        :return: Найденные треки с исходными ссылками или `None`, если источник не ответил.
+        """
+        try:
+            with span("source.search", source=repo.alias):
+                founded_tracks = await self._timed_search(repo, phrase, chat_id)
+            if founded_tracks is None:
+                return None
+            founded_tracks = [
+                Track.model_validate(x).model_dump(include={"title", "duration", "webpage_url"}) for x in founded_tracks
+            ]
+            await self.cache_repository.set_search_results(
+                repo.alias,
+                query_key,
+                founded_tracks,
+                ttl=self.settings.search.results_cache_ttl,
+            )
+        except Exception as error:
+            logger.exception(f"Ошибка в {repo.alias}: {error}")  # noqa: TRY401
+            return None
+        return founded_tracks
+
+    async def _timed_search(self, repo: DownloaderAbstractRepo, phrase: str, chat_id: int) -> list[dict] | None:
+        """
+        Выполняет поиск в источнике и передаёт задержку и исход маршрутизатору и выключателю.
+
+        Если поиск отменён (проиграл дублированному), записывается цензурированный замер: прошедшее
+        время как нижняя оценка задержки. Иначе медленные ответы выпадали бы из окна статистики,
+        и перцентиль, по которому запросы дублируются, оказывался бы заниженным.
+
+        :param repo: Источник треков.
+        :param phrase: Исходная фраза для поиска.
+        :param chat_id: ID чата, из которого пришёл запрос.
+        :return: Результат `find_tracks_on_phrase` источника.
+        """
+        started = time.perf_counter()
+        try:
+            founded_tracks = await repo.find_tracks_on_phrase(phrase, chat_id)
+        except asyncio.CancelledError:
+            self._record_outcome(repo.alias, time.perf_counter() - started, SearchOutcome.CANCELLED)
+            raise
+        except Exception:
+            self._record_outcome(repo.alias, time.perf_counter() - started, SearchOutcome.ERROR)
+            raise
+        if founded_tracks:
+            outcome = SearchOutcome.FOUND
+        else:
+            outcome = SearchOutcome.ERROR if founded_tracks is None else SearchOutcome.EMPTY
+        self._record_outcome(repo.alias, time.perf_counter() - started, outcome)
+        return founded_tracks
+
+    def _record_outcome(self, alias: str, latency: float, outcome: SearchOutcome) -> None:
+        """
+        Передаёт исход поиска маршрутизатору, выключателю источника и в метрики.
+
+        :param alias: Алиас источника.
+        :param latency: Задержка в секундах.
+        :param outcome: Исход поиска.
+        """
+        self.source_router.record(alias, latency, outcome)
+        SOURCE_LATENCY.labels(alias, "search", outcome).observe(latency)
+        if self.circuit_breakers is not None:
+            self.circuit_breakers.record(alias, outcome)
+
+    async def _link_tracks(self, founded_tracks: list[dict], chat_id: int) -> list[Track]:
+        """
+        Заменяет исходные ссылки на треки короткими идентификаторами для конкретного чата.
+
+        :param founded_tracks: Треки в виде словарей с исходными ссылками.
+        :param chat_id: ID чата, которому будут показаны треки.
+        :return: Список объектов `Track` со ссылками-идентификаторами.
+        """
+        tracks = [Track.model_validate(x) for x in founded_tracks]
+        track_url_ids = await self.cache_repository.set_track_urls([x.webpage_url for x in tracks], chat_id)
+        return [
+            track.model_copy(update={"webpage_url": track_url_id})
+            for track, track_url_id in zip(tracks, track_url_ids, strict=True)
+        ]
+
+    @traced("downloader.download_track")
     async def download_track(
         self,
         download_params: DownloadTrackParams,
@@ -104,14 +298,14 @@ class DownloaderService:
         Загружает трек на сервер.
 
         Генерируется уникальное имя файла, после чего происходит загрузка через указанный репозиторий.
+        Если трек уже скачан упреждающей загрузкой, возвращается путь к этому файлу.
         Если возникает ошибка, она логгируется и выбрасывается исключение.
 
         :param download_params: Параметры загрузки трека.
         :param bot: Экземпляр бота Aiogram для отправки сообщений.
         :param chat_id: ID чата, в котором будет отображаться индикатор.
         :return: Путь к загруженному файлу.
-        :raises DownloadError: Если произошла ошибка загрузки.
-        :raises Exception: Если произошла другая ошибка.
+        :raises Exception: Если произошла ошибка загрузки.
         """
         logger.debug(
             f"Downloading track '{download_params.url}', repo: '{download_params.repo_alias}'",
@@ -126,18 +320,46 @@ class DownloaderService:
         )
 
         try:
-            await processing_msg(
-                repo.download_track,
-                (bot, url_track, track_path),
+            return await processing_msg(
+                self._download,
+                (repo, bot, url_track, track_path, chat_id),
                 bot=bot,
                 chat_id=chat_id,
                 spinner_msg="🛬 Загружаем трек на сервер…{spinner_item}",
             )
-        except DownloadError:
-            logger.exception("YouTrack не смог скачать аудио-дорожку")
-            raise
         except Exception as error:
             logger.exception(error)  # noqa: TRY401
             raise
-        else:
-            return track_path
+
+    async def _download(
+        self,
+        repo: DownloaderAbstractRepo,
+        bot: Bot,
+        url_track: str,
+        track_path: Path,
+        chat_id: int,
+    ) -> Path:
+        """
+        Загружает трек, используя заранее скачанный файл, если он есть.
+
+        :param repo: Источник трека.
+        :param bot: Экземпляр бота Aiogram.
+        :param url_track: Исходная ссылка на трек.
+        :param track_path: Путь к файлу для обычной загрузки.
+        :param chat_id: ID чата, в котором выбран трек.
+        :return: Путь к загруженному файлу.
+        """
+        if self.prefetcher is not None:
+            prefetched_path = await self.prefetcher.claim(chat_id, repo.alias, url_track)
+            set_span_attributes(prefetched=prefetched_path is not None)
+            if prefetched_path is not None:
+                return prefetched_path
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span("source.download", source=repo.alias):
+                await repo.download_track(bot, url_track, track_path)
+            outcome = "ok"
+        finally:
+            SOURCE_LATENCY.labels(repo.alias, "download", outcome).observe(time.perf_counter() - started)
+        return track_path
@@ -0,0 +1,242 @@
+"""
+Модуль `source_router.py` содержит адаптивную маршрутизацию поиска по источникам треков.
+
+Для каждого источника хранится скользящее окно последних поисков: задержка и исход
+(найдены треки, пустой результат, ошибка, отмена). Для отменённого поиска — проигравшего
+дублированного — записывается прошедшее время: фактическая задержка не меньше него. Замеры
+старше `max_sample_age` выбывают из окна: источник, который после серии ошибок оказался в конце
+плана и почти не опрашивается, со временем возвращается к априорной оценке и снова пробуется.
+По окну оценивается ожидаемое время до полезного ответа — средняя задержка, делённая на долю
+полезных ответов, — и источники опрашиваются в порядке возрастания этой оценки. Статический
+`priority` источника используется при равенстве оценок, в том числе пока статистики ещё нет.
+
+План опроса строится заново на каждый запрос и не изменяет общий список источников.
+
+По той же статистике определяется момент дублирования (hedging) запроса: если источник не ответил
+за свой скользящий перцентиль задержки, параллельно опрашивается следующий. Доля дублированных
+поисков ограничивается бюджетом `HedgeBudget`.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from src.service.downloader.abstraction import DownloaderAbstractRepo
+
+
+class SearchOutcome(StrEnum):
+    """Исход поиска в источнике."""
+
+    FOUND = "found"
+    EMPTY = "empty"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class SourceStats:
+    """
+    Скользящая статистика поисков в одном источнике.
+
+    :ivar window: Количество последних поисков, по которым считается статистика.
+    :ivar max_age: Время (сек), после которого замер выбывает из окна.
+    """
+
+    window: int = 100
+    max_age: float = 15 * 60
+    _samples: deque[tuple[float, SearchOutcome]] = field(init=False)
+    _recorded_at: deque[float] = field(init=False)
+
+    def __post_init__(self):
+        """Создаёт окно замеров."""
+        self._samples = deque(maxlen=self.window)
+        self._recorded_at = deque(maxlen=self.window)
+
+    def __len__(self) -> int:
+        """Возвращает количество замеров в окне."""
+        self._expire()
+        return len(self._samples)
+
+    def _expire(self) -> None:
+        """Удаляет из окна замеры старше `max_age`."""
+        deadline = time.monotonic() - self.max_age
+        while self._recorded_at and self._recorded_at[0] < deadline:
+            self._recorded_at.popleft()
+            self._samples.popleft()
+
+    def record(self, latency: float, outcome: SearchOutcome) -> None:
+        """
+        Добавляет замер поиска.
+
+        :param latency: Задержка в секундах.
+        :param outcome: Исход поиска.
+        """
+        self._samples.append((latency, outcome))
+        self._recorded_at.append(time.monotonic())
+
+    def rate(self, outcome: SearchOutcome) -> float:
+        """
+        Возвращает долю поисков с указанным исходом.
+
+        :param outcome: Исход поиска.
+        :return: Доля от 0 до 1 (0, если замеров нет).
+        """
+        self._expire()
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, x in self._samples if x == outcome) / len(self._samples)
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """
+        Возвращает перцентиль задержки.
+
+        :param percentile: Перцентиль от 0 до 100.
+        :return: Задержка в секундах или `None`, если замеров нет.
+        """
+        self._expire()
+        if not self._samples:
+            return None
+        latencies = sorted(x for x, _ in self._samples)
+        index = max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)
+        return latencies[index]
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Средняя задержка в секундах или `None`, если замеров нет."""
+        self._expire()
+        if not self._samples:
+            return None
+        return sum(x for x, _ in self._samples) / len(self._samples)
+
+
+@dataclass
+class SourceRouter:
+    """
+    Маршрутизатор поиска по источникам.
+
+    Пока замеров меньше `min_samples`, для источника используются априорные значения
+    (`prior_latency`, `prior_found_rate`) — это не даёт одному неудачному поиску
+    надолго отправить источник в конец очереди.
+
+    :ivar window: Размер скользящего окна замеров для каждого источника.
+    :ivar max_sample_age: Время (сек), после которого замер выбывает из окна.
+    :ivar min_samples: Количество замеров, после которого оценка строится только по ним.
+    :ivar prior_latency: Априорная задержка источника в секундах.
+    :ivar prior_found_rate: Априорная доля поисков, в которых найдены треки.
+    """
+
+    window: int = 100
+    max_sample_age: float = 15 * 60
+    min_samples: int = 5
+    prior_latency: float = 3.0
+    prior_found_rate: float = 0.5
+    stats: dict[str, SourceStats] = field(default_factory=dict)
+
+    def record(self, alias: str, latency: float, outcome: SearchOutcome) -> None:
+        """
+        Добавляет замер поиска в источнике.
+
+        :param alias: Алиас источника.
+        :param latency: Задержка в секундах.
+        :param outcome: Исход поиска.
+        """
+        source_stats = self.stats.setdefault(alias, SourceStats(window=self.window, max_age=self.max_sample_age))
+        source_stats.record(latency, outcome)
+
+    def expected_time(self, alias: str) -> float:
+        """
+        Оценивает ожидаемое время до полезного ответа источника.
+
+        Замеры смешиваются с априорными значениями с весом `min_samples`.
+
+        :param alias: Алиас источника.
+        :return: Оценка в секундах.
+        """
+        source_stats = self.stats.get(alias)
+        samples = len(source_stats) if source_stats else 0
+        if not samples:
+            return self.prior_latency / self.prior_found_rate
+
+        prior_weight = max(self.min_samples - samples, 0)
+        total = samples + prior_weight
+        latency = (source_stats.mean_latency * samples + self.prior_latency * prior_weight) / total
+        found_rate = (source_stats.rate(SearchOutcome.FOUND) * samples + self.prior_found_rate * prior_weight) / total
+        # Источник, который давно ничего не находит, уходит в конец, но не исключается
+        return latency / max(found_rate, 0.01)
+
+    def hedge_delay(self, alias: str, percentile: float = 90) -> float:
+        """
+        Возвращает время ожидания ответа источника, после которого запрос дублируется в следующий.
+
+        :param alias: Алиас источника.
+        :param percentile: Перцентиль задержки источника.
+        :return: Задержка в секундах; пока замеров меньше `min_samples` — априорная задержка.
+        """
+        source_stats = self.stats.get(alias)
+        if not source_stats or len(source_stats) < self.min_samples:
+            return self.prior_latency
+        return source_stats.latency_percentile(percentile)
+
+    def plan(
+        self,
+        repositories: Iterable[DownloaderAbstractRepo],
+        skip_aliases: Collection[str] = (),
+    ) -> list[DownloaderAbstractRepo]:
+        """
+        Строит порядок опроса источников для одного запроса.
+
+        :param repositories: Все источники.
+        :param skip_aliases: Алиасы источников, которые уже были опрошены по этому запросу.
+        :return: Новый список источников от наиболее к наименее перспективному.
+        """
+        return sorted(
+            (x for x in repositories if x.alias not in skip_aliases),
+            key=lambda x: (self.expected_time(x.alias), x.priority),
+        )
+
+
+@dataclass
+class HedgeBudget:
+    """
+    Бюджет дублированных запросов.
+
+    Каждый поиск, который можно продублировать, пополняет бюджет на `ratio`, каждое дублирование
+    расходует единицу. Бюджет изначально пуст, поэтому дублированных запросов никогда не больше
+    `ratio` от количества поисков; `burst` ограничивает накопление при долгом отсутствии медленных ответов.
+
+    :ivar ratio: Максимальная доля дублированных поисков (0 — дублирование выключено).
+    :ivar burst: Максимальное количество дублирований, которое можно накопить.
+    :ivar searches: Количество поисков, которые можно было продублировать.
+    :ivar hedges: Количество дублированных поисков.
+    """
+
+    ratio: float = 0.1
+    burst: float = 3.0
+    searches: int = 0
+    hedges: int = 0
+    _tokens: float = field(default=0.0, init=False)
+
+    @property
+    def hedge_rate(self) -> float:
+        """Фактическая доля дублированных поисков."""
+        return self.hedges / self.searches if self.searches else 0.0
+
+    def record_search(self) -> None:
+        """Учитывает поиск и пополняет бюджет."""
+        self.searches += 1
+        self._tokens = min(self._tokens + self.ratio, self.burst)
+
+    def try_acquire(self) -> bool:
+        """
+        Расходует бюджет на одно дублирование.
+
+        :return: `True`, если бюджета хватило и запрос можно дублировать.
+        """
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.hedges += 1
+        return True
@@ -0,0 +1,97 @@
+"""
+Модуль `loop_monitor.py` содержит монитор задержки (lag) цикла событий.
+
+Синхронная работа в обработчике (разбор HTML, валидация больших списков, файловые операции)
+блокирует цикл событий и задерживает апдейты всех остальных чатов. Монитор состоит из двух частей:
+- задача в цикле событий каждые `interval` секунд засыпает и измеряет, насколько позже
+  запланированного она проснулась; задержка пишется в гистограмму `acrobeat_event_loop_lag_seconds`;
+- сторожевой поток проверяет, когда задача последний раз просыпалась. Если цикл не отвечает
+  дольше `threshold`, поток снимает текущий стек потока цикла (`sys._current_frames`),
+  пока блокировка ещё длится, и логгирует его вместе с именем активного обработчика.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from weakref import WeakKeyDictionary
+
+from src.service.metrics import LOOP_LAG, LOOP_STALLS
+from src.service.settings.config import LoopMonitorSettings
+
+logger = logging.getLogger(__name__)
+
+# Задача апдейта -> выполняемый в ней обработчик (`роутер.обработчик`)
+ACTIVE_HANDLERS: WeakKeyDictionary[asyncio.Task, str] = WeakKeyDictionary()
+
+
+@dataclass
+class LoopLagMonitor:
+    """
+    Монитор задержки цикла событий со сторожевым потоком.
+
+    :ivar settings: Настройки монитора.
+    """
+
+    settings: LoopMonitorSettings
+    _heartbeat: float = field(default_factory=time.monotonic, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+
+    async def run(self) -> None:
+        """Измеряет задержку цикла событий, пока задача не будет отменена."""
+        loop = asyncio.get_running_loop()
+        watchdog = threading.Thread(
+            target=self._watch,
+            args=(loop, threading.get_ident()),
+            name="loop-lag-watchdog",
+            daemon=True,
+        )
+        self._stop.clear()
+        watchdog.start()
+        try:
+            while True:
+                self._heartbeat = time.monotonic()
+                await asyncio.sleep(self.settings.interval)
+                lag = time.monotonic() - self._heartbeat - self.settings.interval
+                LOOP_LAG.observe(max(lag, 0.0))
+        finally:
+            self._stop.set()
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        """
+        Сторожевой поток: снимает стек цикла событий при блокировке дольше порога.
+
+        О каждой блокировке сообщается один раз.
+
+        :param loop: Отслеживаемый цикл событий.
+        :param loop_thread_id: Идентификатор потока цикла событий.
+        """
+        reported_heartbeat = None
+        while not self._stop.wait(self.settings.interval):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.settings.interval
+            if stalled < self.settings.threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            self._report(loop, loop_thread_id, stalled)
+
+    @staticmethod
+    def _report(loop: asyncio.AbstractEventLoop, loop_thread_id: int, stalled: float) -> None:
+        """
+        Логгирует стек заблокированного цикла событий и активный обработчик.
+
+        :param loop: Заблокированный цикл событий.
+        :param loop_thread_id: Идентификатор потока цикла событий.
+        :param stalled: Сколько секунд цикл уже не отвечает.
+        """
+        frame = sys._current_frames().get(loop_thread_id)  # noqa: SLF001
+        task = asyncio.current_task(loop)
+        handler = ACTIVE_HANDLERS.get(task) if task is not None else None
+        # Имена прочих задач не ограничены, поэтому в метку метрики не попадают
+        LOOP_STALLS.labels(handler or "unknown").inc()
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "стек недоступен\n"
+        location = f"обработчик {handler}" if handler else f"задача {task.get_name() if task else '—'}"
+        logger.warning(f"Цикл событий заблокирован уже {stalled:.3f}s, {location}:\n{stack}")
@@ -0,0 +1,207 @@
+"""
+Модуль `metrics.py` содержит метрики Prometheus и HTTP-сервер для их выдачи.
+
+Метрики двух видов:
+- гистограммы и счётчики, которые обновляются в месте измерения: обработчики апдейтов,
+  поиск и загрузка в источниках, обработка аудио, задержка цикла событий;
+- показатели состояния (кэши, пулы соединений, очередь исходящих запросов, выключатели источников),
+  которые не дублируются в отдельных метриках, а считываются из компонентов коллектором
+  `RuntimeCollector` только в момент запроса `/metrics`.
+
+Наблюдение в гистограмму — это поиск корзины и инкремент счётчика, поэтому метрики
+не требуют выключения в продакшене.
+"""
+
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from wsgiref.simple_server import WSGIServer
+
+from prometheus_client import REGISTRY, Counter, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from src.service.settings.config import MetricsSettings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from src.domains.users.cache_repository import UserCacheRepository
+    from src.domains.users.known_users import KnownUsersCache
+    from src.middleware.middleware import OutboundRateLimitMiddleware
+    from src.service.downloader.service import DownloaderService
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+SIZE_BUCKETS = tuple(2**x * 1024 for x in range(6, 16, 2))  # 64 КиБ … 16 МиБ
+
+HANDLER_LATENCY = Histogram(
+    "acrobeat_handler_duration_seconds",
+    "Время выполнения обработчиков апдейтов",
+    ["router", "handler"],
+    buckets=LATENCY_BUCKETS,
+)
+HANDLER_ERRORS = Counter(
+    "acrobeat_handler_errors_total",
+    "Количество обработчиков, завершившихся исключением",
+    ["router", "handler"],
+)
+SOURCE_LATENCY = Histogram(
+    "acrobeat_source_duration_seconds",
+    "Время поиска и загрузки треков в источниках",
+    ["source", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+CLIP_LATENCY = Histogram(
+    "acrobeat_clip_duration_seconds",
+    "Время обработки аудио",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+CLIP_BYTES = Histogram(
+    "acrobeat_clip_output_bytes",
+    "Размер файлов после обработки аудио",
+    ["operation"],
+    buckets=SIZE_BUCKETS,
+)
+
+LOOP_LAG = Histogram(
+    "acrobeat_event_loop_lag_seconds",
+    "Задержка пробуждения задач цикла событий относительно запланированного времени",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+LOOP_STALLS = Counter(
+    "acrobeat_event_loop_stalls_total",
+    "Количество блокировок цикла событий дольше порога по обработчикам",
+    ["handler"],
+)
+
+
+@dataclass(eq=False)
+class RuntimeCollector(Collector):
+    """
+    Коллектор показателей состояния компонентов бота.
+
+    Значения считываются из уже существующих счётчиков и пулов в момент запроса `/metrics`,
+    поэтому на обработку апдейтов коллектор не влияет. Сравнение по полям отключено: реестр
+    Prometheus хранит коллекторы в словаре, поэтому коллектор должен хешироваться по идентичности.
+
+    :ivar downloader_service: Сервис поиска и загрузки треков (кэш поиска, упреждающая загрузка,
+        выключатели и дублирование запросов).
+    :ivar user_cache: Кэширующий репозиторий пользователей.
+    :ivar known_users: Кэш известных пользователей.
+    :ivar outbound_rate_limit: Мидлварь исходящих запросов к Bot API.
+    :ivar engine: Асинхронный движок SQLAlchemy.
+    :ivar redis_client: Клиент Redis.
+    """
+
+    downloader_service: "DownloaderService"
+    user_cache: "UserCacheRepository"
+    known_users: "KnownUsersCache"
+    outbound_rate_limit: "OutboundRateLimitMiddleware"
+    engine: "AsyncEngine"
+    redis_client: "Redis"
+
+    def collect(self) -> Iterator[Metric]:
+        """
+        Формирует метрики состояния.
+
+        :return: Итератор семейств метрик.
+        """
+        yield from self._collect_caches()
+        yield from self._collect_pools()
+        yield from self._collect_sources()
+
+        outbound_queue = GaugeMetricFamily(
+            "acrobeat_outbound_queue_depth",
+            "Количество исходящих запросов к Bot API, ожидающих бюджета",
+        )
+        outbound_queue.add_metric([], self.outbound_rate_limit.queue_depth)
+        yield outbound_queue
+
+    def _collect_caches(self) -> Iterator[Metric]:
+        """Формирует счётчики попаданий и промахов кэшей."""
+        cache_repository = self.downloader_service.cache_repository
+        prefetcher = self.downloader_service.prefetcher
+        lookups = {
+            "search_results": (cache_repository.search_hits, cache_repository.search_misses),
+            "track_names": (self.user_cache.track_names_hits, self.user_cache.track_names_misses),
+            "known_users": (self.known_users.hits, self.known_users.misses),
+        }
+        if prefetcher is not None:
+            lookups["prefetch"] = (prefetcher.hits, prefetcher.claims - prefetcher.hits)
+
+        lookups_total = CounterMetricFamily(
+            "acrobeat_cache_lookups",
+            "Количество обращений к кэшам по результату",
+            labels=["cache", "result"],
+        )
+        for cache, (hits, misses) in lookups.items():
+            lookups_total.add_metric([cache, "hit"], hits)
+            lookups_total.add_metric([cache, "miss"], misses)
+        yield lookups_total
+
+    def _collect_pools(self) -> Iterator[Metric]:
+        """Формирует показатели пулов соединений БД и Redis."""
+        db_pool = self.engine.sync_engine.pool
+        db_connections = GaugeMetricFamily(
+            "acrobeat_db_pool_connections",
+            "Соединения пула БД по состоянию",
+            labels=["state"],
+        )
+        db_connections.add_metric(["checked_out"], db_pool.checkedout())
+        db_connections.add_metric(["checked_in"], db_pool.checkedin())
+        db_connections.add_metric(["overflow"], max(db_pool.overflow(), 0))
+        yield db_connections
+
+        redis_pool = self.redis_client.connection_pool
+        redis_connections = GaugeMetricFamily(
+            "acrobeat_redis_pool_connections",
+            "Соединения пула Redis по состоянию",
+            labels=["state"],
+        )
+        # Публичного API для размера пула у redis-py нет
+        redis_connections.add_metric(["in_use"], len(redis_pool._in_use_connections))  # noqa: SLF001
+        redis_connections.add_metric(["available"], len(redis_pool._available_connections))  # noqa: SLF001
+        yield redis_connections
+
+    def _collect_sources(self) -> Iterator[Metric]:
+        """Формирует показатели выключателей источников и дублирования запросов."""
+        circuit_breakers = self.downloader_service.circuit_breakers
+        if circuit_breakers is not None:
+            circuit_open = GaugeMetricFamily(
+                "acrobeat_source_circuit_open",
+                "Разомкнут ли выключатель источника (полуоткрытый считается разомкнутым)",
+                labels=["source"],
+            )
+            for repo in circuit_breakers.repositories:
+                circuit_open.add_metric([repo.alias], 0 if circuit_breakers.is_available(repo.alias) else 1)
+            yield circuit_open
+
+        hedge_budget = self.downloader_service.hedge_budget
+        searches = CounterMetricFamily(
+            "acrobeat_hedgeable_searches",
+            "Количество поисков, которые можно было продублировать в следующий источник",
+        )
+        searches.add_metric([], hedge_budget.searches)
+        yield searches
+        hedges = CounterMetricFamily("acrobeat_hedged_searches", "Количество дублированных поисков")
+        hedges.add_metric([], hedge_budget.hedges)
+        yield hedges
+
+
+def start_metrics_server(settings: MetricsSettings, collector: RuntimeCollector) -> WSGIServer:
+    """
+    Регистрирует коллектор состояния и запускает HTTP-сервер `/metrics` в фоновом потоке.
+
+    :param settings: Настройки метрик.
+    :param collector: Коллектор показателей состояния.
+    :return: Сервер, который нужно остановить при завершении работы.
+    """
+    REGISTRY.register(collector)
+    server, _ = start_http_server(settings.port, addr=settings.host)
+    logger.info(f"Метрики доступны на http://{settings.host}:{settings.port}/metrics")
+    return server
@@ -0,0 +1,179 @@
+"""
+Модуль `profiler.py` содержит сэмплирующий профилировщик, включаемый во время работы бота.
+
+Профилировщик запускается командой администратора `/profile` или сигналом `SIGUSR1` на заданное
+время или на заданное количество апдейтов. Пока он работает, фоновый поток каждые `interval`
+секунд снимает стек потока цикла событий (`sys._current_frames`) и относит снимок к обработчику,
+который выполняется в текущей задаче (см. `loop_monitor.ACTIVE_HANDLERS`).
+
+По окончании для каждого обработчика в `logs/profiles/` записывается файл в формате folded stacks
+(`функция;функция;... количество`), который принимают flamegraph.pl и speedscope.
+
+Пока профилировщик выключен, потока нет, а `record_update` в мидлвари сводится к одной проверке.
+"""
+
+import asyncio
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+
+from src.service.loop_monitor import ACTIVE_HANDLERS
+from src.service.settings.logger.logger_setup import LOG_DIR
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = LOG_DIR / "profiles"
+MAX_STACK_DEPTH = 128
+# Снимки без активного обработчика: фоновые задачи и ожидание событий
+NO_HANDLER = "event_loop"
+
+
+@dataclass
+class ProfilingSession:
+    """
+    Один запуск профилировщика.
+
+    :ivar interval: Период снятия стека в секундах.
+    :ivar deadline: Момент (`time.monotonic`), после которого профилирование завершается.
+    :ivar max_updates: Количество апдейтов, после которого профилирование завершается.
+    :ivar updates: Количество обработанных апдейтов.
+    :ivar samples: Количество снимков по обработчикам и свёрнутым стекам.
+    :ivar stop_event: Событие досрочного завершения.
+    """
+
+    interval: float
+    deadline: float
+    max_updates: int
+    updates: int = 0
+    samples: dict[str, Counter[str]] = field(default_factory=dict)
+    stop_event: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass
+class StackSampler:
+    """Сэмплирующий профилировщик потока цикла событий."""
+
+    _session: ProfilingSession | None = field(default=None, init=False)
+
+    @property
+    def active(self) -> bool:
+        """Идёт ли профилирование."""
+        return self._session is not None
+
+    def start(self, duration: float, max_updates: int, interval: float) -> bool:
+        """
+        Запускает профилирование. Вызывается из потока цикла событий.
+
+        :param duration: Максимальная длительность в секундах.
+        :param max_updates: Максимальное количество апдейтов.
+        :param interval: Период снятия стека в секундах.
+        :return: `False`, если профилирование уже идёт.
+        """
+        if self._session is not None:
+            return False
+        session = ProfilingSession(
+            interval=interval,
+            deadline=time.monotonic() + duration,
+            max_updates=max_updates,
+        )
+        self._session = session
+        threading.Thread(
+            target=self._sample,
+            args=(session, asyncio.get_running_loop(), threading.get_ident()),
+            name="stack-sampler",
+            daemon=True,
+        ).start()
+        logger.info(f"Профилирование запущено: до {duration:.0f}s или {max_updates} апдейтов")
+        return True
+
+    def stop(self) -> bool:
+        """
+        Досрочно завершает профилирование; результаты записываются фоновым потоком.
+
+        :return: `False`, если профилирование не шло.
+        """
+        session = self._session
+        if session is None:
+            return False
+        session.stop_event.set()
+        return True
+
+    def record_update(self) -> None:
+        """Учитывает обработанный апдейт и завершает профилирование по достижении лимита."""
+        session = self._session
+        if session is None:
+            return
+        session.updates += 1
+        if session.updates >= session.max_updates:
+            session.stop_event.set()
+
+    def _sample(self, session: ProfilingSession, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        """
+        Фоновый поток: снимает стеки до завершения сессии и записывает результаты.
+
+        :param session: Текущая сессия.
+        :param loop: Профилируемый цикл событий.
+        :param loop_thread_id: Идентификатор потока цикла событий.
+        """
+        while not session.stop_event.wait(session.interval) and time.monotonic() < session.deadline:
+            frame = sys._current_frames().get(loop_thread_id)  # noqa: SLF001
+            if frame is None:
+                break
+            task = asyncio.current_task(loop)
+            handler = (ACTIVE_HANDLERS.get(task) if task is not None else None) or NO_HANDLER
+            session.samples.setdefault(handler, Counter())[self._fold(frame)] += 1
+
+        self._session = None
+        try:
+            paths = self._write(session)
+        except OSError:
+            logger.exception("Не удалось записать результаты профилирования")
+            return
+        logger.info(
+            f"Профилирование завершено: {session.updates} апдейтов, "
+            f"{sum(x.total() for x in session.samples.values())} снимков, файлы: {', '.join(map(str, paths))}",
+        )
+
+    @staticmethod
+    def _fold(frame: FrameType) -> str:
+        """
+        Сворачивает стек в строку `внешняя;...;внутренняя` функция.
+
+        :param frame: Верхний кадр стека.
+        :return: Свёрнутый стек.
+        """
+        names = []
+        current: FrameType | None = frame
+        while current is not None and len(names) < MAX_STACK_DEPTH:
+            code = current.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            current = current.f_back
+        return ";".join(reversed(names))
+
+    @staticmethod
+    def _write(session: ProfilingSession) -> list[Path]:
+        """
+        Записывает свёрнутые стеки сессии: по файлу на обработчик.
+
+        :param session: Завершённая сессия.
+        :return: Пути к записанным файлам.
+        """
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S")
+        paths = []
+        for handler, stacks in session.samples.items():
+            file_name = re.sub(r"[^\w.-]", "_", handler)
+            path = PROFILES_DIR / f"{timestamp}-{file_name}.folded"
+            path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.items()), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+
+STACK_SAMPLER = StackSampler()
@@ -4,12 +4,16 @@
 Использует Pydantic для валидации и автоматического получения значений из переменных окружения.
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 from load_dotenv import load_dotenv
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings
 
+from src.service.downloader.html_parser import HtmlParserEngine
+from src.service.tracing import TracingExporter
+
 # Путь к файлу .env, который будет использоваться для загрузки переменных окружения
 dotenv_path = Path(__file__).parent.parent.parent.parent.absolute() / ".env"
 load_dotenv(dotenv_path.as_posix())
@@ -48,6 +52,7 @@ class RedisSettings(BaseSettings):
     port: int = Field(validation_alias="REDIS_PORT")
     db: int = Field(validation_alias="REDIS_DB")
     password: SecretStr = Field(validation_alias="REDIS_PASSWORD")
+    auto_pipeline: bool = Field(validation_alias="REDIS_AUTO_PIPELINE", default=False)
 
     class Config:
         """Настройки Pydantic для класса RedisSettings."""
@@ -55,10 +60,148 @@ class RedisSettings(BaseSettings):
         env_prefix = "REDIS_"
 
 
+class CleanerSettings(BaseSettings):
+    """Класс для хранения настроек очистки временных сообщений."""
+
+    max_messages: int = Field(validation_alias="CLEANER_MAX_MESSAGES", default=100)
+    # Telegram позволяет боту удалять сообщения не старше 48 часов
+    messages_ttl: int = Field(validation_alias="CLEANER_MESSAGES_TTL", default=48 * 60 * 60)
+    sweep_interval: int = Field(validation_alias="CLEANER_SWEEP_INTERVAL", default=10 * 60)
+    stale_after: int = Field(validation_alias="CLEANER_STALE_AFTER", default=60 * 60)
+    delete_stale_messages: bool = Field(validation_alias="CLEANER_DELETE_STALE_MESSAGES", default=True)
+
+    class Config:
+        """Настройки Pydantic для класса CleanerSettings."""
+
+        env_prefix = "CLEANER_"
+
+
+class RetentionSettings(BaseSettings):
+    """Класс для хранения настроек переноса старых поисковых запросов в архив."""
+
+    track_requests_days: int = Field(validation_alias="RETENTION_TRACK_REQUESTS_DAYS", default=180)
+    batch_size: int = Field(validation_alias="RETENTION_BATCH_SIZE", default=1000)
+    interval: int = Field(validation_alias="RETENTION_INTERVAL", default=60 * 60)
+
+    class Config:
+        """Настройки Pydantic для класса RetentionSettings."""
+
+        env_prefix = "RETENTION_"
+
+
+class SearchSettings(BaseSettings):
+    """Класс для хранения настроек поиска треков."""
+
+    transliterate_queries: bool = Field(validation_alias="SEARCH_TRANSLITERATE_QUERIES", default=False)
+    # Ссылки на скачивание у источников живут недолго, поэтому кэш результатов короткий
+    results_cache_ttl: int = Field(validation_alias="SEARCH_RESULTS_CACHE_TTL", default=10 * 60)
+    html_parser: HtmlParserEngine = Field(validation_alias="SEARCH_HTML_PARSER", default=HtmlParserEngine.AUTO)
+    # Доля поисков, которые можно продублировать в следующий источник (0 — не дублировать)
+    hedge_ratio: float = Field(validation_alias="SEARCH_HEDGE_RATIO", default=0.1)
+    # Перцентиль задержки источника, после которого запрос дублируется
+    hedge_percentile: float = Field(validation_alias="SEARCH_HEDGE_PERCENTILE", default=90)
+
+    class Config:
+        """Настройки Pydantic для класса SearchSettings."""
+
+        env_prefix = "SEARCH_"
+
+
+class PrefetchSettings(BaseSettings):
+    """Класс для хранения настроек упреждающей загрузки результатов поиска."""
+
+    enabled: bool = Field(validation_alias="PREFETCH_ENABLED", default=False)
+    top_k: int = Field(validation_alias="PREFETCH_TOP_K", default=2)
+    max_concurrent: int = Field(validation_alias="PREFETCH_MAX_CONCURRENT", default=2)
+    disk_budget_mb: int = Field(validation_alias="PREFETCH_DISK_BUDGET_MB", default=200)
+    reserve_mb: int = Field(validation_alias="PREFETCH_RESERVE_MB", default=10)
+    ttl: int = Field(validation_alias="PREFETCH_TTL", default=5 * 60)
+
+    class Config:
+        """Настройки Pydantic для класса PrefetchSettings."""
+
+        env_prefix = "PREFETCH_"
+
+
+class CircuitBreakerSettings(BaseSettings):
+    """Класс для хранения настроек автоматических выключателей источников треков."""
+
+    failure_threshold: int = Field(validation_alias="CIRCUIT_FAILURE_THRESHOLD", default=3)
+    open_seconds: int = Field(validation_alias="CIRCUIT_OPEN_SECONDS", default=60)
+    probe_interval: int = Field(validation_alias="CIRCUIT_PROBE_INTERVAL", default=15)
+    probe_timeout: int = Field(validation_alias="CIRCUIT_PROBE_TIMEOUT", default=15)
+    probe_query: str = Field(validation_alias="CIRCUIT_PROBE_QUERY", default="Queen")
+
+    class Config:
+        """Настройки Pydantic для класса CircuitBreakerSettings."""
+
+        env_prefix = "CIRCUIT_"
+
+
+class MetricsSettings(BaseSettings):
+    """Класс для хранения настроек метрик Prometheus."""
+
+    enabled: bool = Field(validation_alias="METRICS_ENABLED", default=True)
+    host: str = Field(validation_alias="METRICS_HOST", default="127.0.0.1")
+    port: int = Field(validation_alias="METRICS_PORT", default=9108)
+
+    class Config:
+        """Настройки Pydantic для класса MetricsSettings."""
+
+        env_prefix = "METRICS_"
+
+
+class TracingSettings(BaseSettings):
+    """Класс для хранения настроек трассировки (OpenTelemetry)."""
+
+    enabled: bool = Field(validation_alias="TRACING_ENABLED", default=False)
+    exporter: TracingExporter = Field(validation_alias="TRACING_EXPORTER", default=TracingExporter.FILE)
+    otlp_endpoint: str = Field(validation_alias="TRACING_OTLP_ENDPOINT", default="http://127.0.0.1:4318/v1/traces")
+    # Доля апдейтов, для которых записывается трасса
+    sample_ratio: float = Field(validation_alias="TRACING_SAMPLE_RATIO", default=0.05)
+    service_name: str = Field(validation_alias="TRACING_SERVICE_NAME", default="acrobeat-bot")
+
+    class Config:
+        """Настройки Pydantic для класса TracingSettings."""
+
+        env_prefix = "TRACING_"
+
+
+class LoopMonitorSettings(BaseSettings):
+    """Класс для хранения настроек монитора задержки цикла событий."""
+
+    enabled: bool = Field(validation_alias="LOOP_MONITOR_ENABLED", default=True)
+    # Период замеров (сек)
+    interval: float = Field(validation_alias="LOOP_MONITOR_INTERVAL", default=0.1)
+    # Блокировка дольше порога (сек) логгируется со стеком цикла событий
+    threshold: float = Field(validation_alias="LOOP_MONITOR_THRESHOLD", default=0.25)
+
+    class Config:
+        """Настройки Pydantic для класса LoopMonitorSettings."""
+
+        env_prefix = "LOOP_MONITOR_"
+
+
+class ProfilerSettings(BaseSettings):
+    """Класс для хранения настроек профилировщика, включаемого по команде."""
+
+    # Профилирование завершается по истечении времени (сек) или после указанного числа апдейтов
+    duration: int = Field(validation_alias="PROFILER_DURATION", default=30)
+    max_updates: int = Field(validation_alias="PROFILER_MAX_UPDATES", default=200)
+    interval: float = Field(validation_alias="PROFILER_INTERVAL", default=0.005)
+
+    class Config:
+        """Настройки Pydantic для класса ProfilerSettings."""
+
+        env_prefix = "PROFILER_"
+
+
 class BotSettings(BaseSettings):
     """Класс для хранения настроек телеграм-бота."""
 
     token: SecretStr = Field(validation_alias="BOT_TOKEN")
+    # Пользователи с доступом к служебным командам, JSON-список: [123, 456]
+    admin_ids: list[int] = Field(validation_alias="BOT_ADMIN_IDS", default_factory=list)
 
     class Config:
         """Настройки Pydantic для класса BotSettings."""
@@ -72,6 +215,15 @@ class Settings(BaseSettings):
     postgres: PostgresSettings = Field(default_factory=PostgresSettings)
     bot: BotSettings = Field(default_factory=BotSettings)
     redis: RedisSettings = Field(default_factory=RedisSettings)
+    cleaner: CleanerSettings = Field(default_factory=CleanerSettings)
+    retention: RetentionSettings = Field(default_factory=RetentionSettings)
+    search: SearchSettings = Field(default_factory=SearchSettings)
+    prefetch: PrefetchSettings = Field(default_factory=PrefetchSettings)
+    circuit_breaker: CircuitBreakerSettings = Field(default_factory=CircuitBreakerSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
+    loop_monitor: LoopMonitorSettings = Field(default_factory=LoopMonitorSettings)
+    profiler: ProfilerSettings = Field(default_factory=ProfilerSettings)
     debug: bool = Field(validation_alias="DEBUG", default=False)
 
     model_config = {
@@ -80,9 +232,22 @@ class Settings(BaseSettings):
     }
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Возвращает единственный экземпляр настроек приложения.
+
+    Переменные окружения и `.env` читаются один раз при первом вызове,
+    все последующие вызовы получают тот же объект.
+
+    :return: Экземпляр `Settings`.
+    """
+    return Settings()
+
+
 if __name__ == "__main__":
     """
     Точка входа для тестирования модуля.
     При запуске файла как скрипта создаёт экземпляр Settings и выводит его содержимое.
     """
-    settings = Settings()
+    settings = get_settings()
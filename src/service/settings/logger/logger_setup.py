@@ -9,7 +9,7 @@ from pathlib import Path
 
 import yaml
 
-from src.service.settings.config import Settings
+from src.service.settings.config import get_settings
 
 # Путь к конфигурационному файлу логгирования
 CONFIG_PATH = Path(__file__).parent / "config.yaml"
@@ -18,10 +18,8 @@ CONFIG_PATH = Path(__file__).parent / "config.yaml"
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-settings = Settings()
 
-
-def configure_logging(*, debug: bool = settings.debug) -> None:
+def configure_logging(*, debug: bool | None = None) -> None:
     """
     Настраивает логгирование приложения на основе конфигурации из файла.
 
@@ -29,7 +27,11 @@ def configure_logging(*, debug: bool = settings.debug) -> None:
     и применяет его. Также может включать отладочное логгирование, если `debug=True`.
 
     :param debug: Если `True`, уровень логгирования устанавливается в DEBUG.
+        По умолчанию берётся значение `DEBUG` из настроек приложения.
     """
+    if debug is None:
+        debug = get_settings().debug
+
     # Загрузка базовой конфигурации из YAML
     with CONFIG_PATH.open(encoding="utf-8") as f:
         config = yaml.safe_load(f)
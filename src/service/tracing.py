@@ -0,0 +1,188 @@
+"""
+Модуль `tracing.py` содержит сквозную трассировку обработки апдейтов (OpenTelemetry).
+
+Спаны создаются в мидлвари для каждого апдейта и вложенно — в сервисах и репозиториях:
+поиск и загрузка в источниках, разбор страниц, обработка аудио, отправка файла.
+Запросы httpx, Redis и SQLAlchemy трассируются автоинструментированием, если установлены
+соответствующие пакеты (`uv sync --extra tracing`).
+
+Выборка головная (head-based): решение о записи трассы принимается один раз для корневого
+спана апдейта с вероятностью `TRACING_SAMPLE_RATIO` и наследуется всеми вложенными спанами.
+
+Если трассировка выключена или OpenTelemetry не установлен, `span` и `traced` сводятся
+к одной проверке и не импортируют OpenTelemetry.
+"""
+
+import importlib
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import wraps
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+    from opentelemetry.trace import Tracer
+
+    from src.service.settings.config import TracingSettings
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+TRACES_FILE_NAME = "traces.jsonl"
+
+# Автоинструментирование библиотек: модуль -> класс инструментатора
+INSTRUMENTORS = {
+    "opentelemetry.instrumentation.httpx": "HTTPXClientInstrumentor",
+    "opentelemetry.instrumentation.redis": "RedisInstrumentor",
+    "opentelemetry.instrumentation.sqlalchemy": "SQLAlchemyInstrumentor",
+}
+
+
+class TracingExporter(StrEnum):
+    """Куда отправляются завершённые спаны."""
+
+    CONSOLE = "console"
+    FILE = "file"
+    OTLP = "otlp"
+
+
+@dataclass
+class _TracingState:
+    """Настроенные провайдер и трассировщик; `None`, пока трассировка не включена."""
+
+    provider: "TracerProvider | None" = None
+    tracer: "Tracer | None" = None
+
+
+_state = _TracingState()
+
+
+def _create_exporter(settings: "TracingSettings") -> "SpanExporter":
+    """
+    Создаёт экспортёр спанов.
+
+    :param settings: Настройки трассировки.
+    :return: Экспортёр спанов.
+    """
+    if settings.exporter == TracingExporter.OTLP:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter  # noqa: PLC0415
+
+        return OTLPSpanExporter(endpoint=settings.otlp_endpoint)
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter  # noqa: PLC0415
+
+    if settings.exporter == TracingExporter.FILE:
+        from src.service.settings.logger.logger_setup import LOG_DIR  # noqa: PLC0415
+
+        # Файл держится открытым всё время работы и закрывается вместе с процессом
+        out = (LOG_DIR / TRACES_FILE_NAME).open("a", encoding="utf-8")
+        return ConsoleSpanExporter(out=out, formatter=lambda x: x.to_json(indent=None) + "\n")
+    return ConsoleSpanExporter()
+
+
+def _instrument_libraries() -> None:
+    """Подключает автоинструментирование httpx, Redis и SQLAlchemy, если пакеты установлены."""
+    for module_name, instrumentor_name in INSTRUMENTORS.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            logger.debug(f"Пакет {module_name} не установлен, автоинструментирование пропущено")
+            continue
+        getattr(module, instrumentor_name)().instrument()
+
+
+def configure_tracing(settings: "TracingSettings") -> None:
+    """
+    Настраивает трассировку: выборку, экспортёр и автоинструментирование библиотек.
+
+    Должна вызываться до создания движка БД и клиентов, чтобы они попали под инструментирование.
+
+    :param settings: Настройки трассировки.
+    """
+    if not settings.enabled:
+        return
+
+    try:
+        from opentelemetry import trace  # noqa: PLC0415
+        from opentelemetry.sdk.resources import Resource  # noqa: PLC0415
+        from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor  # noqa: PLC0415
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased  # noqa: PLC0415
+    except ImportError:
+        logger.warning("Трассировка включена, но OpenTelemetry не установлен: uv sync --extra tracing")
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter(settings)))
+    trace.set_tracer_provider(provider)
+    _instrument_libraries()
+
+    _state.provider = provider
+    _state.tracer = trace.get_tracer("acrobeat")
+    logger.info(f"Трассировка включена: {settings.exporter}, доля трасс {settings.sample_ratio:.0%}")
+
+
+def shutdown_tracing() -> None:
+    """Отправляет накопленные спаны и останавливает экспортёр."""
+    if _state.provider is not None:
+        _state.provider.shutdown()
+        _state.provider = None
+        _state.tracer = None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:  # noqa: ANN401
+    """
+    Открывает вложенный спан на время выполнения блока.
+
+    Исключения из блока записываются в спан и пробрасываются дальше.
+
+    :param name: Имя спана.
+    :param attributes: Атрибуты спана.
+    """
+    if _state.tracer is None:
+        yield
+        return
+    with _state.tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+def set_span_attributes(**attributes: Any) -> None:  # noqa: ANN401
+    """
+    Добавляет атрибуты в текущий спан.
+
+    :param attributes: Атрибуты спана.
+    """
+    if _state.tracer is None:
+        return
+    from opentelemetry import trace  # noqa: PLC0415
+
+    trace.get_current_span().set_attributes(attributes)
+
+
+def traced(name: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """
+    Декоратор, выполняющий корутину внутри спана.
+
+    :param name: Имя спана.
+    :return: Декоратор корутины.
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
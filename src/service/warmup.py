@@ -0,0 +1,46 @@
+"""
+Модуль `warmup.py` отвечает за фоновый прогрев тяжёлых зависимостей.
+
+Библиотеки `yt_dlp`, `pydub` и HTML-парсер импортируются лениво — внутри методов, которые их используют.
+Чтобы первый пользователь не ждал их загрузки, после старта поллинга они импортируются
+в отдельном потоке, не блокируя цикл событий.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+
+from src.service.downloader.html_parser import ENGINE_MODULES, HtmlParserEngine, resolve_engine
+
+logger = logging.getLogger(__name__)
+
+# Модули, импорт которых отложен до первого обращения
+HEAVY_MODULES = (
+    "yt_dlp",
+    "yt_dlp.utils",
+    "pydub",
+)
+
+
+async def warm_up_heavy_modules(
+    modules: tuple[str, ...] = HEAVY_MODULES,
+    html_parser: HtmlParserEngine = HtmlParserEngine.AUTO,
+) -> None:
+    """
+    Последовательно импортирует тяжёлые модули в пуле потоков.
+
+    Ошибка импорта одного модуля не прерывает прогрев остальных: модуль
+    будет импортирован повторно при первом реальном обращении.
+
+    :param modules: Имена модулей для импорта.
+    :param html_parser: Движок HTML-парсера, модуль которого тоже нужно прогреть.
+    """
+    for module_name in (*modules, ENGINE_MODULES[resolve_engine(html_parser)]):
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(importlib.import_module, module_name)
+        except Exception:
+            logger.exception(f"Не удалось прогреть модуль {module_name}")
+            continue
+        logger.debug(f"Модуль {module_name} прогрет за {time.perf_counter() - started:.3f} сек")
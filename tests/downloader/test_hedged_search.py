@@ -0,0 +1,141 @@
+"""Тесты поиска по источникам с дублированием медленных запросов."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.domains.tracks.schemas import RepoTracks
+from src.service.downloader.service import DownloaderService
+from src.service.downloader.source_router import HedgeBudget, SearchOutcome
+
+pytestmark = pytest.mark.asyncio
+
+TRACKS = [{"title": "Artist - Title", "duration": 180, "webpage_url": "https://example.com/track.mp3"}]
+
+
+class FakeRepo:
+    """Источник, отвечающий через заданное время."""
+
+    def __init__(self, alias: str, delay: float, tracks: list[dict] | None = None, *, searchable: bool = True):
+        """
+        Инициализация источника.
+
+        :param alias: Алиас источника.
+        :param delay: Время ответа в секундах.
+        :param tracks: Найденные треки (по умолчанию — один трек).
+        :param searchable: Участвует ли источник в поиске.
+        """
+        self.alias = alias
+        self.delay = delay
+        self.tracks = TRACKS if tracks is None else tracks
+        self.searchable = searchable
+        self.priority = 0
+        self.calls = 0
+
+    async def find_tracks_on_phrase(self, query: str, chat_id: int) -> list[dict]:  # noqa: ARG002
+        """Возвращает треки после задержки."""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.tracks
+
+
+def make_service(repos: list[FakeRepo], hedge_budget: HedgeBudget | None = None) -> DownloaderService:
+    """
+    Создаёт сервис поиска с заглушками кэша и настроек.
+
+    :param repos: Источники треков.
+    :param hedge_budget: (Опционально) Бюджет дублированных запросов.
+    :return: Экземпляр `DownloaderService`.
+    """
+    cache_repository = SimpleNamespace(
+        get_search_results=AsyncMock(return_value=None),
+        set_search_results=AsyncMock(),
+        set_track_urls=AsyncMock(side_effect=lambda urls, _: [f"id{i}" for i, _ in enumerate(urls)]),
+    )
+    settings = SimpleNamespace(search=SimpleNamespace(hedge_percentile=90, results_cache_ttl=60))
+    service = DownloaderService(
+        external_repository=repos,
+        cache_repository=cache_repository,
+        settings=settings,
+        hedge_budget=hedge_budget or HedgeBudget(ratio=1, burst=10),
+    )
+    service.source_router.prior_latency = 0.05
+    return service
+
+
+@pytest.fixture(autouse=True)
+def no_spinner(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Выполняет поиск без индикатора загрузки в чате."""
+
+    async def run(func: Callable[..., Awaitable], args: tuple, **_) -> object:
+        return await func(*args)
+
+    monkeypatch.setattr("src.service.downloader.service.processing_msg", run)
+
+
+async def test_fast_primary_is_not_hedged() -> None:
+    """Источник, ответивший до порога, не дублируется."""
+    primary, hedge = FakeRepo("primary", 0.01), FakeRepo("hedge", 0.01)
+    service = make_service([primary, hedge])
+
+    results = await service._hedged_search(primary, hedge, "q", "q", 1)
+
+    assert [(repo.alias, bool(tracks)) for repo, tracks in results] == [("primary", True)]
+    assert hedge.calls == 0
+    assert service.hedge_budget.hedges == 0
+
+
+async def test_slow_primary_is_hedged_and_loser_recorded_as_cancelled() -> None:
+    """Медленный источник дублируется, проигравший поиск отменяется и записывается как отменённый."""
+    primary, hedge = FakeRepo("primary", 1.0), FakeRepo("hedge", 0.01)
+    service = make_service([primary, hedge])
+    service.hedge_budget.record_search()
+
+    results = await service._hedged_search(primary, hedge, "q", "q", 1)
+    await asyncio.sleep(0)
+
+    assert [repo.alias for repo, _ in results] == ["hedge"]
+    assert service.hedge_budget.hedges == 1
+    assert service.source_router.stats["primary"].rate(SearchOutcome.CANCELLED) == 1.0
+    assert service.source_router.stats["hedge"].rate(SearchOutcome.FOUND) == 1.0
+
+
+async def test_slow_primary_is_not_hedged_without_budget() -> None:
+    """Без бюджета медленный источник дожидается ответа и не дублируется."""
+    primary, hedge = FakeRepo("primary", 0.1), FakeRepo("hedge", 0.01)
+    service = make_service([primary, hedge], HedgeBudget(ratio=0))
+
+    results = await service._hedged_search(primary, hedge, "q", "q", 1)
+
+    assert [repo.alias for repo, _ in results] == ["primary"]
+    assert hedge.calls == 0
+
+
+async def test_empty_primary_falls_through_to_hedge_result() -> None:
+    """Пустой ответ основного источника не прерывает ожидание дублированного."""
+    primary, hedge = FakeRepo("primary", 0.1, tracks=[]), FakeRepo("hedge", 0.1)
+    service = make_service([primary, hedge])
+    service.hedge_budget.record_search()
+
+    results = await service._hedged_search(primary, hedge, "q", "q", 1)
+
+    assert [(repo.alias, bool(tracks)) for repo, tracks in results] == [("primary", False), ("hedge", True)]
+
+
+async def test_download_only_source_is_not_searched_or_hedged() -> None:
+    """Источник только для загрузки не попадает в план и не расходует бюджет дублирования."""
+    telegram = FakeRepo("telegram", 0, tracks=[], searchable=False)
+    telegram.priority = -100
+    source = FakeRepo("source", 0.01)
+    service = make_service([telegram, source], HedgeBudget(ratio=0.25, burst=3))
+
+    for _ in range(20):
+        result = await service.find_tracks_on_phrase("q", bot=None, chat_id=1)
+        assert isinstance(result, RepoTracks)
+        assert result.repo_alias == "source"
+
+    assert telegram.calls == 0
+    assert service.hedge_budget.hedges == 0
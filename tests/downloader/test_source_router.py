@@ -0,0 +1,107 @@
+"""Тесты маршрутизации поиска по источникам и бюджета дублированных запросов."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.service.downloader.source_router import HedgeBudget, SearchOutcome, SourceRouter, SourceStats
+
+
+def make_repo(alias: str, priority: int = 0) -> SimpleNamespace:
+    """
+    Создаёт заглушку источника с полями, которые читает маршрутизатор.
+
+    :param alias: Алиас источника.
+    :param priority: Статический приоритет источника.
+    :return: Заглушка источника.
+    """
+    return SimpleNamespace(alias=alias, priority=priority)
+
+
+def test_stats_drop_samples_older_than_max_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Замеры старше `max_age` выбывают из окна."""
+    now = 1000.0
+    monkeypatch.setattr("src.service.downloader.source_router.time.monotonic", lambda: now)
+    stats = SourceStats(window=10, max_age=60)
+    stats.record(5.0, SearchOutcome.ERROR)
+    now += 30
+    stats.record(1.0, SearchOutcome.FOUND)
+    assert len(stats) == 2
+
+    now += 31
+    assert len(stats) == 1
+    assert stats.rate(SearchOutcome.FOUND) == 1.0
+    assert stats.mean_latency == 1.0
+
+
+def test_demoted_source_recovers_after_samples_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Источник после серии ошибок уходит в конец плана, а когда замеры устаревают — возвращается."""
+    now = 1000.0
+    monkeypatch.setattr("src.service.downloader.source_router.time.monotonic", lambda: now)
+    router = SourceRouter(max_sample_age=60)
+    flaky, stable = make_repo("flaky", priority=0), make_repo("stable", priority=1)
+    for _ in range(router.min_samples):
+        router.record("flaky", 5.0, SearchOutcome.ERROR)
+    assert [x.alias for x in router.plan([flaky, stable])] == ["stable", "flaky"]
+
+    now += 61
+    assert [x.alias for x in router.plan([flaky, stable])] == ["flaky", "stable"]
+
+
+def test_plan_orders_by_expected_time_and_skips_aliases() -> None:
+    """План опроса строится по ожидаемому времени и не содержит уже опрошенных источников."""
+    router = SourceRouter()
+    slow, fast, skipped = make_repo("slow"), make_repo("fast", priority=1), make_repo("skipped")
+    for _ in range(router.min_samples):
+        router.record("slow", 4.0, SearchOutcome.FOUND)
+        router.record("fast", 0.5, SearchOutcome.FOUND)
+
+    assert [x.alias for x in router.plan([slow, fast, skipped], skip_aliases=["skipped"])] == ["fast", "slow"]
+
+
+def test_plan_uses_priority_until_stats_are_collected() -> None:
+    """Пока замеров нет, порядок определяется статическим приоритетом."""
+    router = SourceRouter()
+    repos = [make_repo("b", priority=2), make_repo("a", priority=1)]
+
+    assert [x.alias for x in router.plan(repos)] == ["a", "b"]
+
+
+def test_hedge_delay_is_prior_until_min_samples_then_percentile() -> None:
+    """До `min_samples` замеров время дублирования — априорная задержка, затем — перцентиль."""
+    router = SourceRouter(prior_latency=3.0)
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        router.record("src", latency, SearchOutcome.FOUND)
+    assert router.hedge_delay("src", 90) == 3.0
+
+    router.record("src", 1.0, SearchOutcome.CANCELLED)
+    assert router.hedge_delay("src", 90) == 1.0
+
+
+def test_hedge_budget_limits_hedges_to_ratio() -> None:
+    """Дублированных запросов не больше `ratio` от количества поисков."""
+    budget = HedgeBudget(ratio=0.25, burst=3)
+    hedged = 0
+    for _ in range(100):
+        budget.record_search()
+        hedged += budget.try_acquire()
+
+    assert hedged == budget.hedges == 25
+    assert budget.hedge_rate == 0.25
+
+
+def test_hedge_budget_caps_accumulated_tokens_at_burst() -> None:
+    """Долгое отсутствие медленных ответов накапливает не больше `burst` дублирований."""
+    budget = HedgeBudget(ratio=0.5, burst=2)
+    for _ in range(100):
+        budget.record_search()
+
+    assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_hedge_budget_disabled_with_zero_ratio() -> None:
+    """При `ratio=0` запросы не дублируются."""
+    budget = HedgeBudget(ratio=0)
+    budget.record_search()
+
+    assert not budget.try_acquire()
@@ -0,0 +1,45 @@
+"""Общие фикстуры тестов скраперов: репозитории источников и корпус страниц поиска."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.service.downloader.html_parser import HtmlParserEngine, resolve_engine
+from src.service.downloader.scraper_bench import SourceRepo, create_repos, iter_fixtures
+
+# Движки, установленные в окружении (без `fast-html` остаётся только `bs4`)
+ENGINES = sorted({resolve_engine(x) for x in HtmlParserEngine if x != HtmlParserEngine.AUTO})
+
+
+def make_settings(engine: HtmlParserEngine = HtmlParserEngine.AUTO) -> SimpleNamespace:
+    """
+    Создаёт заглушку настроек с полями, которые читают скраперы.
+
+    :param engine: Движок разбора HTML.
+    :return: Заглушка настроек.
+    """
+    return SimpleNamespace(search=SimpleNamespace(html_parser=engine), debug=False)
+
+
+REPOS = {repo.alias: repo for repo in create_repos(make_settings())}
+FIXTURES = [
+    pytest.param(alias, query, html, expected, id=f"{alias}-{query}")
+    for alias in REPOS
+    for query, html, expected in iter_fixtures(alias)
+]
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request: pytest.FixtureRequest) -> HtmlParserEngine:
+    """Установленный движок разбора HTML."""
+    return request.param
+
+
+def get_repo(alias: str) -> SourceRepo:
+    """
+    Возвращает репозиторий источника по алиасу.
+
+    :param alias: Алиас источника.
+    :return: Репозиторий с адресом живого сайта.
+    """
+    return REPOS[alias]
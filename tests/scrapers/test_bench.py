@@ -0,0 +1,73 @@
+"""
+Замеры скраперов через `pytest-benchmark`.
+
+Запуск: `make scrapers-bench`. Пик памяти разбора (`tracemalloc`) записывается в `extra_info` замера.
+"""
+
+import asyncio
+import tracemalloc
+from collections.abc import Iterator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.service.downloader.html_parser import HtmlParserEngine, parse_document
+from src.service.downloader.scraper_bench import create_repos, fixture_server, source_parse_fn
+from tests.scrapers.conftest import FIXTURES, get_repo, make_settings
+
+
+@pytest.fixture(scope="module")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Один цикл событий на все замеры поиска, чтобы не мерить его создание."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def base_url() -> Iterator[str]:
+    """Адрес локального сервера, отдающего фикстуры вместо сайтов."""
+    with fixture_server() as url:
+        yield url
+
+
+@pytest.mark.benchmark(group="parse")
+@pytest.mark.parametrize(("alias", "query", "html", "expected"), FIXTURES)
+def test_parse(  # noqa: PLR0913
+    benchmark: BenchmarkFixture,
+    alias: str,
+    query: str,  # noqa: ARG001
+    html: str,
+    expected: list[dict],
+    engine: HtmlParserEngine,
+) -> None:
+    """Замеряет разбор страницы движком и проверяет его результат."""
+    parse_fn = source_parse_fn(get_repo(alias))
+
+    tracemalloc.start()
+    parse_fn(parse_document(html, engine))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info["peak_memory_kib"] = round(peak / 1024)
+
+    assert benchmark(lambda: parse_fn(parse_document(html, engine))) == expected
+
+
+@pytest.mark.benchmark(group="find_tracks_on_phrase")
+@pytest.mark.parametrize(("alias", "query", "html", "expected"), FIXTURES)
+def test_find_tracks_on_phrase(  # noqa: PLR0913
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    base_url: str,
+    alias: str,
+    query: str,
+    html: str,  # noqa: ARG001
+    expected: list[dict],
+) -> None:
+    """Замеряет полный поиск по источнику против локального сервера с фикстурами."""
+    repo = next(x for x in create_repos(make_settings(), base_url) if x.alias == alias)
+
+    result = benchmark(lambda: loop.run_until_complete(repo.find_tracks_on_phrase(query, chat_id=0)))
+
+    # Ссылки Hitmotop строятся от адреса сайта, поэтому сравниваются только названия и длительности
+    assert [(x["title"], x["duration"]) for x in result] == [(x["title"], x["duration"]) for x in expected]
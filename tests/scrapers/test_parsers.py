@@ -0,0 +1,25 @@
+"""Регрессионные тесты разбора страниц поиска: все движки дают ожидаемый результат на корпусе фикстур."""
+
+import pytest
+
+from src.service.downloader.html_parser import HtmlParserEngine, parse_document
+from src.service.downloader.scraper_bench import source_parse_fn
+from tests.scrapers.conftest import FIXTURES, REPOS, get_repo
+
+
+@pytest.mark.parametrize("alias", REPOS)
+def test_corpus_is_not_empty(alias: str) -> None:
+    """Для каждого источника в корпусе есть хотя бы одна страница: пустой корпус ничего не проверяет."""
+    assert any(x.values[0] == alias for x in FIXTURES), f"Нет фикстур для источника {alias}"
+
+
+@pytest.mark.parametrize(("alias", "query", "html", "expected"), FIXTURES)
+def test_engine_matches_expected(
+    alias: str,
+    query: str,  # noqa: ARG001
+    html: str,
+    expected: list[dict],
+    engine: HtmlParserEngine,
+) -> None:
+    """Каждый установленный движок разбирает страницу так же, как эталонный при записи фикстуры."""
+    assert source_parse_fn(get_repo(alias))(parse_document(html, engine)) == expected
@@ -0,0 +1,51 @@
+"""Тесты коллектора показателей состояния."""
+
+from types import SimpleNamespace
+
+from prometheus_client import CollectorRegistry
+
+from src.service.downloader.source_router import HedgeBudget
+from src.service.metrics import RuntimeCollector
+
+
+def make_collector() -> RuntimeCollector:
+    """
+    Создаёт коллектор с заглушками компонентов.
+
+    :return: Экземпляр `RuntimeCollector`.
+    """
+    downloader_service = SimpleNamespace(
+        cache_repository=SimpleNamespace(search_hits=3, search_misses=1),
+        prefetcher=SimpleNamespace(hits=2, claims=5),
+        circuit_breakers=SimpleNamespace(
+            repositories=[SimpleNamespace(alias="up"), SimpleNamespace(alias="down")],
+            is_available=lambda alias: alias == "up",
+        ),
+        hedge_budget=HedgeBudget(searches=10, hedges=1),
+    )
+    db_pool = SimpleNamespace(checkedout=lambda: 2, checkedin=lambda: 3, overflow=lambda: -1)
+    redis_pool = SimpleNamespace(_in_use_connections={object()}, _available_connections=[object(), object()])
+    return RuntimeCollector(
+        downloader_service=downloader_service,
+        user_cache=SimpleNamespace(track_names_hits=4, track_names_misses=0),
+        known_users=SimpleNamespace(hits=7, misses=2),
+        outbound_rate_limit=SimpleNamespace(queue_depth=6),
+        engine=SimpleNamespace(sync_engine=SimpleNamespace(pool=db_pool)),
+        redis_client=SimpleNamespace(connection_pool=redis_pool),
+    )
+
+
+def test_collector_registers_and_collects() -> None:
+    """Коллектор регистрируется в реестре и отдаёт показатели компонентов."""
+    registry = CollectorRegistry()
+    registry.register(make_collector())
+
+    get = registry.get_sample_value
+    assert get("acrobeat_cache_lookups_total", {"cache": "search_results", "result": "hit"}) == 3
+    assert get("acrobeat_cache_lookups_total", {"cache": "prefetch", "result": "miss"}) == 3
+    assert get("acrobeat_db_pool_connections", {"state": "overflow"}) == 0
+    assert get("acrobeat_redis_pool_connections", {"state": "available"}) == 2
+    assert get("acrobeat_source_circuit_open", {"source": "down"}) == 1
+    assert get("acrobeat_source_circuit_open", {"source": "up"}) == 0
+    assert get("acrobeat_hedged_searches_total") == 1
+    assert get("acrobeat_outbound_queue_depth") == 6